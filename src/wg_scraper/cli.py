@@ -6,14 +6,19 @@ und zur Verwaltung der Datenbank.
 """
 
 import logging
+import queue
 import sys
+import threading
+import operator
+from operator import itemgetter
 from pathlib import Path
 from time import sleep
-from typing import Any
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator
 
 import click
 
-from wg_scraper import __version__
+from wg_scraper import __version__, config
 from wg_scraper.scraper import WGScraper
 from wg_scraper.database import Database
 
@@ -23,6 +28,12 @@ __license__ = "MIT"
 
 _logger = logging.getLogger(__name__)
 
+# Anzahl der Anzeigen, die beim Scrapen pro Transaktion gespeichert werden
+SAVE_BATCH_SIZE = 500
+
+# Wie oft (in Sekunden) ein blockierter Producer prüft, ob der Consumer aufgehört hat
+_PRODUCER_POLL_INTERVAL = 0.5
+
 
 def setup_logging(loglevel):
     """Setup basic logging.
@@ -47,8 +58,14 @@ def setup_logging(loglevel):
     count=True,
     help="Erhöht die Ausgabe-Detailstufe (kann mehrfach angegeben werden).",
 )
+@click.option(
+    "--db-path",
+    type=click.Path(),
+    default="wg_data.db",
+    help="Pfad zur SQLite-Datenbank für alle Sub-Commands (Standard: wg_data.db).",
+)
 @click.pass_context
-def main(ctx, verbose):
+def main(ctx, verbose, db_path):
     """WG-Gesucht Scraper - Scrapt WG-Anzeigen und speichert sie in einer Datenbank."""
     # Logging-Level basierend auf Verbose-Count setzen
     loglevel = logging.WARNING
@@ -62,6 +79,370 @@ def main(ctx, verbose):
     # Context-Objekt für Sub-Commands
     ctx.ensure_object(dict)
     ctx.obj['verbose'] = verbose
+    ctx.obj['db_path'] = db_path
+
+
+def get_database(ctx, db_path=None, must_exist=False) -> Database:
+    """
+    Gibt die gemeinsame Datenbank-Instanz des aktuellen CLI-Aufrufs zurück.
+
+    Die Verbindung wird beim ersten Zugriff geöffnet, in ``ctx.obj['db']``
+    abgelegt und beim Beenden des Root-Kontexts geschlossen.
+
+    Args:
+        ctx: Click-Kontext des Sub-Commands
+        db_path: Pfad aus der Sub-Command-Option (überschreibt den Gruppen-Pfad)
+        must_exist: Wenn True, muss die Datenbankdatei bereits existieren
+
+    Returns:
+        Database-Instanz
+    """
+    obj = ctx.find_root().obj
+    path = db_path or obj.get('db_path', "wg_data.db")
+
+    db = obj.get('db')
+    if db is not None and db.db_path == Path(path):
+        return db
+
+    if must_exist and not Path(path).exists():
+        raise click.BadParameter(f"Datenbank nicht gefunden: {path}", param_hint="--db-path")
+
+    if db is not None:
+        db.close()
+
+    db = Database(path)
+    obj['db'] = db
+    ctx.find_root().call_on_close(db.close)
+    return db
+
+
+# Alias -> interner Name für Analyse-Kennzahlen (Schlüssel in Kleinschreibung)
+_METRIC_ALIASES = MappingProxyType({
+    'ppm': 'price_per_sqm',
+    'price_per_sqm': 'price_per_sqm',
+    'avg_ppm_diff': 'avg_ppm_diff',
+    'avg_qm_diff': 'avg_ppm_diff',
+    'ms_diff': 'rent_index_diff',
+    'mietspiegel_diff': 'rent_index_diff',
+    'rent_index_diff': 'rent_index_diff',
+    'distance_km': 'distance_km',
+    'duration_min': 'duration_min',
+    'straight_line_km': 'straight_line_km',
+    'route': 'route'
+})
+
+# Vergleichsoperatoren in Filter-Schlüsseln (zweistellige zuerst)
+_SPLIT_OPS = ('>=', '<=', '!=', '>', '<')
+
+# Filter-Operator -> Vergleichsfunktion
+_FILTER_OPERATORS = MappingProxyType({
+    '=': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+})
+
+
+def _normalize_metric(name: str) -> str:
+    """Gibt den internen Namen einer Kennzahl zurück (unbekannte Namen unverändert)."""
+    return _METRIC_ALIASES.get(name) or _METRIC_ALIASES.get(name.lower(), name)
+
+
+def _split_filter_key(key: str) -> tuple:
+    """Zerlegt einen Filter-Schlüssel wie 'rent<=' in ('rent', '<=')."""
+    for op in _SPLIT_OPS:
+        if key.endswith(op):
+            return key[:-len(op)], op
+    return key, '='
+
+
+def _to_filter_key(field: str, op: str) -> str:
+    """Setzt Feld und Operator wieder zu einem Filter-Schlüssel zusammen."""
+    return field if op == '=' else f"{field}{op}"
+
+
+def _format_cursor(cursor: tuple) -> str:
+    """Formatiert einen Keyset-Cursor (scraped_at, id) für --after."""
+    scraped_at, listing_db_id = cursor
+    return f"{scraped_at}|{listing_db_id}"
+
+
+def _parse_cursor(value: str) -> tuple:
+    """
+    Zerlegt einen --after-Cursor im Format 'scraped_at|id'.
+    
+    Raises:
+        click.BadParameter: Bei ungültigem Format
+    """
+    scraped_at, _, listing_db_id = value.rpartition('|')
+    if not scraped_at or not listing_db_id.isdigit():
+        raise click.BadParameter(
+            f"Ungültiger Cursor '{value}' (erwartet: 'scraped_at|id')", param_hint="--after"
+        )
+    return scraped_at, int(listing_db_id)
+
+
+def _compile_metric_filters(metric_filters: dict) -> Callable[[dict], bool]:
+    """
+    Übersetzt Kennzahl-Filter einmalig in ein Prädikat für einzelne Anzeigen.
+    
+    Schlüssel und Operatoren werden nur einmal zerlegt, nicht pro Anzeige.
+    Fehlende Werte und nicht vergleichbare Typen erfüllen keinen Filter.
+    
+    Args:
+        metric_filters: Filter wie {'distance_km<=': 5, 'avg_ppm_diff<': 0}
+        
+    Returns:
+        Funktion, die für eine Anzeige True liefert, wenn alle Filter passen
+    """
+    conditions = []
+    for key, expected in metric_filters.items():
+        field, op = _split_filter_key(key)
+        conditions.append((field, _FILTER_OPERATORS[op], expected))
+    
+    def predicate(listing: dict) -> bool:
+        get = listing.get
+        try:
+            for field, compare, expected in conditions:
+                value = get(field)
+                if value is None or not compare(value, expected):
+                    return False
+        except TypeError:
+            return False
+        return True
+    
+    return predicate
+
+
+def _iter_in_background(iterable: Iterable, maxsize: int) -> Iterator:
+    """
+    Konsumiert ein Iterable in einem Hintergrund-Thread.
+    
+    Die Elemente werden über eine begrenzte Queue weitergereicht: Der
+    Producer (z.B. Scraper) läuft parallel zum Consumer (z.B. DB-Writer),
+    blockiert aber, sobald `maxsize` Elemente ungelesen sind. So bleibt der
+    Speicherbedarf konstant. Exceptions des Producers werden im Consumer
+    erneut ausgelöst.
+    
+    Hört der Consumer vorzeitig auf (Exception, Strg+C, close()), stoppt der
+    Producer und schließt die Quelle, statt an der vollen Queue zu hängen.
+    
+    Args:
+        iterable: Quelle der Elemente
+        maxsize: Maximale Anzahl gepufferter Elemente
+        
+    Yields:
+        Elemente in der Reihenfolge der Quelle
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    done = object()
+    errors = []
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # False, sobald der Consumer aufgehört hat
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_PRODUCER_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            # Generator-Quellen schließen, damit z.B. der Executor des
+            # Scrapers auch bei vorzeitigem Abbruch beendet wird
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+            put(done)
+
+    producer = threading.Thread(target=produce, name="scrape-producer", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+
+    producer.join()
+    if errors:
+        raise errors[0]
+
+
+def _sort_listings(listings, sort_field: str, reverse: bool = False):
+    """
+    Sortiert Listings nach einem Feld; Listings ohne Wert bilden eine eigene Gruppe.
+    
+    Entspricht der Sortierung nach (Wert fehlt, Wert): aufsteigend stehen
+    Listings ohne Wert am Ende, absteigend am Anfang. Sortiert wird nur die
+    Gruppe mit Werten, und zwar mit itemgetter statt einer Lambda-Funktion.
+    
+    Args:
+        listings: Listing-Dictionaries
+        sort_field: Feld, nach dem sortiert wird
+        reverse: Absteigend sortieren
+        
+    Returns:
+        Neue, sortierte Liste
+    """
+    have = [listing for listing in listings if listing.get(sort_field) is not None]
+    missing = [listing for listing in listings if listing.get(sort_field) is None]
+    have.sort(key=itemgetter(sort_field), reverse=reverse)
+    return missing + have if reverse else have + missing
+
+
+def _add_ppm_diffs(listings, avg_diff: bool, rent_index_diff: bool, rent_index=None) -> None:
+    """
+    Ergänzt Abweichungen des Preises pro m² in den Listings.
+    
+    Höchstens zwei Durchläufe: der Durchschnitt (nur für avg_diff) wird mit
+    laufender Summe ohne Zwischenlisten berechnet, danach werden beide
+    Kennzahlen in einem gemeinsamen Durchlauf gesetzt.
+    
+    Args:
+        listings: Listing-Dictionaries mit 'price_per_sqm'
+        avg_diff: 'avg_ppm_diff' (Abweichung vom Durchschnitt) setzen
+        rent_index_diff: 'rent_index_diff' (Abweichung vom Mietspiegel) setzen
+        rent_index: Mietspiegel in EUR/m² (None = unbekannt)
+    """
+    avg_ppm = None
+    if avg_diff:
+        total = 0.0
+        count = 0
+        for listing in listings:
+            ppm = listing.get('price_per_sqm')
+            if ppm is not None:
+                total += ppm
+                count += 1
+        avg_ppm = round(total / count, 2) if count else None
+
+    # Ohne Referenzwert bleibt die jeweilige Kennzahl None
+    with_avg = avg_diff and avg_ppm is not None
+    with_index = rent_index_diff and rent_index is not None
+    for listing in listings:
+        ppm = listing.get('price_per_sqm')
+        if avg_diff:
+            listing['avg_ppm_diff'] = round(ppm - avg_ppm, 2) if with_avg and ppm is not None else None
+        if rent_index_diff:
+            listing['rent_index_diff'] = round(ppm - rent_index, 2) if with_index and ppm is not None else None
+
+
+def _format_listing(index: int, listing: dict, verbose: int, route_mode=None) -> str:
+    """
+    Formatiert eine Anzeige als mehrzeiligen Textblock für die Konsole.
+
+    Args:
+        index: Laufende Nummer der Anzeige (1-basiert)
+        listing: Listing-Dictionary
+        verbose: Verbosity-Level
+        route_mode: Verkehrsmittel, wenn Routing-Daten angezeigt werden sollen
+
+    Returns:
+        Formatierter Block inklusive Trennlinie
+    """
+    get = listing.get
+    district = get('district')
+    price_per_sqm = get('price_per_sqm')
+
+    lines = [
+        f"{index}. {get('title', 'N/A')}",
+        f"   Stadt: {get('city', 'N/A')}" + (f" ({district})" if district else ""),
+        f"   Größe: {get('size', 'N/A')} m² | Miete: {get('rent', 'N/A')} €",
+        f"   Verfügbar ab: {get('available_from', 'N/A')}",
+    ]
+
+    if price_per_sqm is not None:
+        avg_ppm_diff = get('avg_ppm_diff')
+        rent_index_diff = get('rent_index_diff')
+        lines.append(
+            f"   Preis pro m2: {price_per_sqm} €"
+            + (f" | Delta avg/m2: {avg_ppm_diff} €" if avg_ppm_diff is not None else "")
+            + (f" | Delta Mietspiegel: {rent_index_diff} €" if rent_index_diff is not None else "")
+        )
+
+    if route_mode:
+        distance_km = get('distance_km')
+        duration_min = get('duration_min')
+        lines.append(
+            f"   Luftlinie: {get('straight_line_km', 'N/A')} km"
+            + (f" | {route_mode.title()}: {distance_km} km" if distance_km else "")
+            + (f" (~{duration_min} min)" if duration_min else "")
+        )
+
+    if verbose >= 1:
+        available_until = get('available_until')
+        if available_until:
+            lines.append(f"   Verfügbar bis: {available_until}")
+
+        flatmates = get('flatmates')
+        if flatmates:
+            flatmate_line = f"   WG-Größe: {flatmates}er WG"
+            details = []
+            female = get('flatmates_female')
+            if female is not None:
+                details.append(f"{female}w")
+            male = get('flatmates_male')
+            if male is not None:
+                details.append(f"{male}m")
+            diverse = get('flatmates_diverse')
+            if diverse is not None:
+                details.append(f"{diverse}d")
+            rooms_free = get('rooms_free')
+            if rooms_free is not None:
+                details.append(f"{rooms_free} frei")
+            flatmate_details = get('flatmate_details')
+            if flatmate_details and not details:
+                details.append(flatmate_details)
+            if details:
+                flatmate_line += f" ({', '.join(details)})"
+            lines.append(flatmate_line)
+
+        room_type = get('room_type')
+        if room_type:
+            lines.append(f"   Zimmerart: {room_type}")
+
+        online_since = get('online_since')
+        if online_since:
+            lines.append(f"   Online seit: {online_since}")
+
+    if verbose >= 2:
+        desc = get('description')
+        if desc:
+            if len(desc) > 200:
+                desc = desc[:200] + "..."
+            lines.append(f"   Beschreibung: {desc}")
+
+        features = get('features')
+        if features:
+            lines.append(f"   Features: {features}")
+
+        contact_name = get('contact_name')
+        if contact_name:
+            lines.append(f"   Kontakt: {contact_name}")
+
+        lines.append(f"   DB-ID: {get('id', 'N/A')} | Listing-ID: {get('listing_id', 'N/A')}")
+        lines.append(f"   Gescrapt am: {get('scraped_at', 'N/A')}")
+        created_at = get('created_at')
+        if created_at:
+            lines.append(f"   Erstellt am: {created_at}")
+
+    lines.append(f"   URL: {get('url', 'N/A')}")
+    lines.append('-' * 80)
+    return "\n".join(lines) + "\n\n"
 
 
 @main.command()
@@ -69,8 +450,8 @@ def main(ctx, verbose):
 @click.option(
     "--db-path",
     type=click.Path(),
-    default="wg_data.db",
-    help="Pfad zur SQLite-Datenbank (Standard: wg_data.db).",
+    default=None,
+    help="Pfad zur SQLite-Datenbank (Standard: Wert von wg-scraper --db-path).",
 )
 @click.option(
     "--max-pages",
@@ -82,48 +463,92 @@ def main(ctx, verbose):
     "--delay",
     type=float,
     default=1.0,
-    help="Verzögerung zwischen Requests in Sekunden (Standard: 1.0).",
+    help=(
+        "Verzögerung zwischen Requests in Sekunden (Standard: 1.0). "
+        "Rate-Limit-Header des Servers haben Vorrang."
+    ),
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    help=(
+        "Anzahl gleichzeitig abgerufener Suchergebnis-Seiten (Standard: 1). "
+        "Bei Werten > 1 gilt --delay zwischen den Abruf-Wellen."
+    ),
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximale Anzahl offener HTTP-Verbindungen (Standard: max(10, --concurrency)).",
+)
+@click.option(
+    "--details",
+    is_flag=True,
+    help=(
+        "Ruft zusätzlich die Detailseite jeder Anzeige ab (Beschreibung). "
+        "--concurrency gilt auch für die Detailseiten."
+    ),
 )
 @click.pass_context
-def scrape(ctx, url, db_path, max_pages, delay):
+def scrape(ctx, url, db_path, max_pages, delay, concurrency, pool_size, details):
     """
     Scrapt WG-Anzeigen von der angegebenen URL.
     
     Die URL sollte eine Suchergebnis-Seite von wg-gesucht.de sein.
     Der Scraper iteriert automatisch durch alle Seiten der Suchergebnisse.
+    Mit --details wird zusätzlich die Detailseite jeder Anzeige geladen.
     
     Beispiel:
     
         wg-scraper scrape "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html"
     """
+    db_path = db_path or ctx.obj['db_path']
     _logger.info(f"Starte Scraping von: {url}")
     _logger.info(f"Datenbank: {db_path}")
     _logger.info(f"Max. Seiten: {max_pages if max_pages else 'Alle'}")
     _logger.info(f"Delay: {delay}s")
+    _logger.info(f"Parallele Seiten: {concurrency}")
+    _logger.info(f"Detailseiten: {'ja' if details else 'nein'}")
+    
+    # Pool mindestens so groß wie die Parallelität, sonst werden Verbindungen verworfen
+    pool_size = pool_size or max(config.POOL_SIZE, concurrency)
     
     try:
         # Datenbank initialisieren
-        db = Database(db_path)
+        db = get_database(ctx, db_path)
         db.init_db()
         _logger.info("Datenbank initialisiert")
         
         # Scraper initialisieren
-        scraper = WGScraper(delay=delay)
+        scraper = WGScraper(delay=delay, pool_size=pool_size)
         
         # Scraping durchführen
-        results = scraper.scrape_search_results(url, max_pages=max_pages)
+        results = scraper.scrape_search_results(
+            url, max_pages=max_pages, concurrency=concurrency
+        )
+        if details:
+            # Detailseiten in Wellen zu je --concurrency Seiten nachladen
+            results = scraper.scrape_listings_details(results, concurrency=concurrency)
         
-        # Ergebnisse in Datenbank speichern
-        saved_count = 0
-        for listing in results:
-            if db.save_listing(listing):
-                saved_count += 1
+        # Scraping läuft im Hintergrund weiter, während die Ergebnisse
+        # blockweise gespeichert werden (eine Transaktion pro Block)
+        results = _iter_in_background(results, maxsize=2 * SAVE_BATCH_SIZE)
+        try:
+            saved_count = db.save_listings_bulk(results, batch_size=SAVE_BATCH_SIZE)
+        finally:
+            # Producer auch bei Fehlern oder Abbruch sofort stoppen
+            results.close()
         
+        # Statistiken für den stats-Befehl vorberechnen
+        db.refresh_stats()
+
         _logger.info(f"Scraping abgeschlossen: {saved_count} neue Anzeigen gespeichert")
         click.echo(f"✓ {saved_count} neue WG-Anzeigen gespeichert in {db_path}")
         
     except Exception as e:
-        _logger.error(f"Fehler beim Scraping: {e}", exc_info=True)
+        _logger.error(f"Fehler beim Scraping: {e}", exc_info=ctx.obj.get('verbose', 0) >= 2)
         click.echo(f"✗ Fehler: {e}", err=True)
         sys.exit(1)
 
@@ -132,8 +557,8 @@ def scrape(ctx, url, db_path, max_pages, delay):
 @click.option(
     "--db-path",
     type=click.Path(exists=True),
-    default="wg_data.db",
-    help="Pfad zur SQLite-Datenbank.",
+    default=None,
+    help="Pfad zur SQLite-Datenbank (Standard: Wert von wg-scraper --db-path).",
 )
 @click.option(
     "--limit",
@@ -176,12 +601,22 @@ def scrape(ctx, url, db_path, max_pages, delay):
     default="desc",
     help="Sortier-Reihenfolge: asc (aufsteigend) oder desc (absteigend). Standard: desc",
 )
+@click.option(
+    "--after",
+    "after_str",
+    type=str,
+    default=None,
+    help=(
+        "Weiterblättern ab dem Cursor, den die vorherige Ausgabe unter "
+        "'Nächste Seite' anzeigt (nur mit --sort scraped_at --order desc)."
+    ),
+)
 @click.option(
     "--output",
     "-o",
     type=click.Path(),
     default=None,
-    help="Exportiere Ergebnisse in Datei (Format: .txt, .csv, .json). Bsp: --output results.csv",
+    help="Exportiere Ergebnisse in Datei (Format: .txt, .csv, .json, .ndjson). Bsp: --output results.csv",
 )
 @click.option(
     "--addr",
@@ -200,6 +635,12 @@ def scrape(ctx, url, db_path, max_pages, delay):
     is_flag=True,
     help="Sortiere Ergebnisse nach Distanz (nur mit --addr).",
 )
+@click.option(
+    "--max-straight-km",
+    type=float,
+    default=None,
+    help="Berechne Routen nur fuer Anzeigen bis zu dieser Luftlinie in km (nur mit route).",
+)
 @click.pass_context
 def list(
     ctx,
@@ -210,10 +651,12 @@ def list(
     rent_index,
     sort,
     order,
+    after_str,
     output,
     addr,
     route_mode,
     sort_by_distance,
+    max_straight_km,
 ):
     """
     Listet gespeicherte WG-Anzeigen aus der Datenbank auf.
@@ -227,6 +670,7 @@ def list(
     - Aktivierung ueber --metrics (z.B. route,ppm,avg_ppm_diff,ms_diff).
     - route benoetigt --addr; --route-mode bestimmt das Verkehrsmittel.
     - --sort-by-distance sortiert nach Luftlinie (nur mit route).
+    - --max-straight-km ueberspringt das Routing fuer weit entfernte Anzeigen.
     - ms_diff benoetigt --rent-index (EUR/m²).
     
     Filter-Beispiele:
@@ -248,158 +692,120 @@ def list(
         --sort ppm --order asc               # Nach Preis pro m²
         
         --sort straight_line_km --order asc  # Nach Distanz (mit route)
+    
+    Blättern (Standard-Sortierung):
+    
+        --limit 50 --after '2026-01-31T12:00:00|4711'
     """
     from wg_scraper.cli_utils import (
         parse_filters,
         geocode_address,
-        calculate_route,
+        geocode_many,
+        calculate_routes_bulk,
+        straight_line_km_batch,
         export_listings,
         export_routes,
     )
     
     verbose = ctx.obj.get('verbose', 0)
     
+    # Keyset-Blättern nur in der Standard-Sortierung (neueste zuerst)
+    keyset = sort == 'scraped_at' and order.lower() == 'desc' and not sort_by_distance
+    after = None
+    if after_str:
+        if not keyset:
+            raise click.BadParameter(
+                "nur mit --sort scraped_at --order desc möglich", param_hint="--after"
+            )
+        after = _parse_cursor(after_str)
+    
     try:
-        db = Database(db_path)
-
-        metric_aliases = {
-            'ppm': 'price_per_sqm',
-            'price_per_sqm': 'price_per_sqm',
-            'avg_ppm_diff': 'avg_ppm_diff',
-            'avg_qm_diff': 'avg_ppm_diff',
-            'ms_diff': 'rent_index_diff',
-            'mietspiegel_diff': 'rent_index_diff',
-            'rent_index_diff': 'rent_index_diff',
-            'distance_km': 'distance_km',
-            'duration_min': 'duration_min',
-            'straight_line_km': 'straight_line_km',
-            'route': 'route'
-        }
-
-        def normalize_metric(name: str) -> str:
-            return metric_aliases.get(name.lower(), name)
-
-        def split_filter_key(key: str) -> tuple:
-            for op in ('>=', '<=', '!=', '>', '<'):
-                if key.endswith(op):
-                    return key[:-len(op)], op
-            return key, '='
-
-        def to_key(field: str, op: str) -> str:
-            return field if op == '=' else f"{field}{op}"
-
-        def passes_filter(value: Any, op: str, expected: Any) -> bool:
-            if value is None:
-                return False
-            try:
-                if op == '=':
-                    return value == expected
-                if op == '!=':
-                    return value != expected
-                if op == '>':
-                    return value > expected
-                if op == '<':
-                    return value < expected
-                if op == '>=':
-                    return value >= expected
-                if op == '<=':
-                    return value <= expected
-            except TypeError:
-                return False
-            return False
-
-        def apply_metric_filters(items, metric_filters, use_results: bool):
-            if not metric_filters:
-                return items
-            filtered_items = []
-            for item in items:
-                listing = item['listing'] if use_results else item
-                matched = True
-                for key, expected in metric_filters.items():
-                    base, op = split_filter_key(key)
-                    value = listing.get(base)
-                    if not passes_filter(value, op, expected):
-                        matched = False
-                        break
-                if matched:
-                    filtered_items.append(item)
-            return filtered_items
+        db = get_database(ctx, db_path, must_exist=True)
 
         metrics = set()
         if metrics_str:
             for part in metrics_str.split(','):
                 part = part.strip()
                 if part:
-                    metrics.add(normalize_metric(part))
+                    metrics.add(_normalize_metric(part))
 
         route_fields = {'straight_line_km', 'distance_km', 'duration_min'}
-        metric_fields = {'price_per_sqm', 'avg_ppm_diff', 'rent_index_diff'} | route_fields
+        metric_fields = {'avg_ppm_diff', 'rent_index_diff'} | route_fields
+        # Von SQLite berechnete Kennzahlen: Filter/Sortierung laufen vor dem LIMIT
+        sql_metric_fields = {'price_per_sqm'}
 
         filters = parse_filters(filter_str)
         db_filters = {}
         metric_filters = {}
+        metrics_needed_sql = set()
 
         for key, value in filters.items():
-            base, op = split_filter_key(key)
-            normalized = normalize_metric(base)
+            base, op = _split_filter_key(key)
+            normalized = _normalize_metric(base)
             if normalized in metric_fields:
-                metric_filters[to_key(normalized, op)] = value
+                metric_filters[_to_filter_key(normalized, op)] = value
+            elif normalized in sql_metric_fields:
+                db_filters[_to_filter_key(normalized, op)] = value
+                metrics_needed_sql.add(normalized)
             else:
                 db_filters[key] = value
 
-        sort_field = normalize_metric(sort)
+        sort_field = _normalize_metric(sort)
         sort_in_memory = sort_field in metric_fields
+        db_sort = sort
+        if sort_field in sql_metric_fields:
+            metrics_needed_sql.add(sort_field)
+            db_sort = sort_field
 
         if sort_by_distance:
             sort_field = 'straight_line_km'
             sort_in_memory = True
 
         metrics_needed = set(metrics)
-        metrics_needed.update({split_filter_key(k)[0] for k in metric_filters.keys()})
+        metrics_needed.update({_split_filter_key(k)[0] for k in metric_filters.keys()})
         if sort_in_memory and sort_field in metric_fields:
             metrics_needed.add(sort_field)
+        metrics_needed.update(metrics_needed_sql)
 
         route_requested = 'route' in metrics_needed or any(field in route_fields for field in metrics_needed)
 
+        # Preis pro m² wird von SQLite mitberechnet
+        ppm_needed = any(metric in metrics_needed for metric in ['price_per_sqm', 'avg_ppm_diff', 'rent_index_diff'])
+
         # Listings abrufen
-        listings = db.get_listings(
-            limit=limit,
-            filters=db_filters,
-            sort_by=None if sort_in_memory else sort,
-            sort_order=order.upper()
-        )
+        computed_columns = ['price_per_sqm'] if ppm_needed else []
+        next_cursor = None
+        if keyset:
+            listings, next_cursor = db.get_listings_page(
+                limit=limit,
+                filters=db_filters,
+                computed_columns=computed_columns,
+                after=after,
+            )
+        else:
+            listings = db.get_listings(
+                limit=limit,
+                filters=db_filters,
+                sort_by=None if sort_in_memory else db_sort,
+                sort_order=order.upper(),
+                computed_columns=computed_columns,
+            )
 
         if not listings:
             click.echo("Keine Anzeigen gefunden.")
             return
 
-        # Preis pro Quadratmeter berechnen
-        if any(metric in metrics_needed for metric in ['price_per_sqm', 'avg_ppm_diff', 'rent_index_diff']):
-            for listing in listings:
-                rent = listing.get('rent')
-                size = listing.get('size')
-                if rent is not None and size:
-                    listing['price_per_sqm'] = round(rent / size, 2)
-                else:
-                    listing['price_per_sqm'] = None
-
-        if 'avg_ppm_diff' in metrics_needed:
-            ppm_values = [l.get('price_per_sqm') for l in listings if l.get('price_per_sqm') is not None]
-            avg_ppm = round(sum(ppm_values) / len(ppm_values), 2) if ppm_values else None
-            for listing in listings:
-                if listing.get('price_per_sqm') is None or avg_ppm is None:
-                    listing['avg_ppm_diff'] = None
-                else:
-                    listing['avg_ppm_diff'] = round(listing['price_per_sqm'] - avg_ppm, 2)
-
-        if 'rent_index_diff' in metrics_needed:
-            if rent_index is None:
-                click.echo("⚠ Kein Mietspiegel angegeben. Verwende --rent-index EUR/qm.")
-            for listing in listings:
-                if listing.get('price_per_sqm') is None or rent_index is None:
-                    listing['rent_index_diff'] = None
-                else:
-                    listing['rent_index_diff'] = round(listing['price_per_sqm'] - rent_index, 2)
+        with_avg_diff = 'avg_ppm_diff' in metrics_needed
+        with_rent_index_diff = 'rent_index_diff' in metrics_needed
+        if with_rent_index_diff and rent_index is None:
+            click.echo("⚠ Kein Mietspiegel angegeben. Verwende --rent-index EUR/qm.")
+        if with_avg_diff or with_rent_index_diff:
+            _add_ppm_diffs(
+                listings,
+                avg_diff=with_avg_diff,
+                rent_index_diff=with_rent_index_diff,
+                rent_index=rent_index,
+            )
 
         results = None
         if route_requested:
@@ -422,144 +828,108 @@ def list(
 
             results = []
 
-            with click.progressbar(listings, label='Berechnung') as bar:
-                for listing in bar:
-                    address_parts = []
-                    if listing.get('city'):
-                        address_parts.append(listing['city'])
-                    if listing.get('district'):
-                        address_parts.append(listing['district'])
-
-                    if not address_parts:
-                        continue
-
-                    address = ", ".join(address_parts)
-                    coords = geocode_address(address)
-                    if not coords:
-                        continue
-                    route_info = calculate_route(coords, dest_coords, route_mode)
-
-                    if route_info:
-                        listing.update(route_info)
-                        results.append({
-                            'listing': listing,
-                            'route': route_info
-                        })
+            # Jede Adresse nur einmal geocodieren - viele Anzeigen teilen sich
+            # dieselbe Kombination aus Stadt und Stadtteil
+            listing_addresses = []
+            for listing in listings:
+                address_parts = []
+                if listing.get('city'):
+                    address_parts.append(listing['city'])
+                if listing.get('district'):
+                    address_parts.append(listing['district'])
+                listing_addresses.append(", ".join(address_parts) if address_parts else None)
+
+            unique_addresses = {address for address in listing_addresses if address}
+
+            with click.progressbar(length=len(unique_addresses), label='Geocodierung') as bar:
+                address_coords = geocode_many(unique_addresses, on_progress=bar.update)
+
+            routable = [address for address in unique_addresses if address_coords.get(address)]
+
+            # Luftlinie als günstiger Vorfilter, bevor die Routing-API gefragt wird
+            if max_straight_km is not None:
+                distances = straight_line_km_batch(
+                    [address_coords[address] for address in routable], dest_coords
+                )
+                routable = [
+                    address for address, km in zip(routable, distances)
+                    if km <= max_straight_km
+                ]
+
+            # Unterschiedliche Adressen (z.B. Stadtteil-Schreibweisen) können auf
+            # denselben Punkt fallen - jeden Startpunkt nur einmal routen
+            origins = [*dict.fromkeys(address_coords[address] for address in routable)]
+
+            # Alle Routen gebündelt über den OSRM-table-Dienst berechnen
+            with click.progressbar(length=len(origins), label='Berechnung') as bar:
+                routes = calculate_routes_bulk(
+                    origins,
+                    dest_coords,
+                    route_mode,
+                    on_progress=bar.update,
+                )
+            origin_routes = dict(zip(origins, routes))
+            address_routes = {
+                address: origin_routes[address_coords[address]] for address in routable
+            }
+
+            for listing, address in zip(listings, listing_addresses):
+                route_info = address_routes.get(address) if address else None
+                if route_info:
+                    route_info = dict(route_info)
+                    listing.update(route_info)
+                    results.append({
+                        'listing': listing,
+                        'route': route_info
+                    })
 
             if not results:
                 click.echo("\n✗ Keine Routen berechnet.")
                 return
 
-            results = apply_metric_filters(results, metric_filters, use_results=True)
+            if metric_filters:
+                matches = _compile_metric_filters(metric_filters)
+                results = [item for item in results if matches(item['listing'])]
             listings = [item['listing'] for item in results]
 
             if sort_in_memory:
-                reverse = order.lower() == 'desc'
-                results.sort(
-                    key=lambda x: (x['listing'].get(sort_field) is None, x['listing'].get(sort_field)),
-                    reverse=reverse
-                )
+                listings = _sort_listings(listings, sort_field, reverse=order.lower() == 'desc')
+                # Routen-Ergebnisse in dieselbe Reihenfolge bringen (für den Export)
+                result_by_listing = {id(item['listing']): item for item in results}
+                results = [result_by_listing[id(listing)] for listing in listings]
         else:
-            listings = apply_metric_filters(listings, metric_filters, use_results=False)
+            if metric_filters:
+                listings = [*filter(_compile_metric_filters(metric_filters), listings)]
 
             if sort_in_memory:
-                reverse = order.lower() == 'desc'
-                listings.sort(
-                    key=lambda x: (x.get(sort_field) is None, x.get(sort_field)),
-                    reverse=reverse
-                )
+                listings = _sort_listings(listings, sort_field, reverse=order.lower() == 'desc')
 
         if not listings:
             click.echo("Keine Anzeigen gefunden.")
             return
 
-        header_title = f"Routen zum Ziel: {addr}" if route_requested else "Gefundene Anzeigen"
-        click.echo(f"\n{'='*80}")
-        click.echo(header_title)
-        click.echo(f"Anzahl Ergebnisse: {len(listings)}")
+        header = [
+            f"\n{'='*80}",
+            f"Routen zum Ziel: {addr}" if route_requested else "Gefundene Anzeigen",
+            f"Anzahl Ergebnisse: {len(listings)}",
+        ]
         if filter_str:
-            click.echo(f"Filter: {filter_str}")
+            header.append(f"Filter: {filter_str}")
         if metrics_str:
-            click.echo(f"Analyse: {metrics_str}")
+            header.append(f"Analyse: {metrics_str}")
         if not route_requested:
-            click.echo(f"Sortierung: {sort} ({order})")
-        click.echo(f"{'='*80}\n")
-
-        for i, listing in enumerate(listings, 1):
-            click.echo(f"{i}. {listing.get('title', 'N/A')}")
-            click.echo(f"   Stadt: {listing.get('city', 'N/A')}", nl=False)
-            if listing.get('district'):
-                click.echo(f" ({listing['district']})")
-            else:
-                click.echo()
-
-            click.echo(f"   Größe: {listing.get('size', 'N/A')} m² | Miete: {listing.get('rent', 'N/A')} €")
-            click.echo(f"   Verfügbar ab: {listing.get('available_from', 'N/A')}")
-
-            if listing.get('price_per_sqm') is not None:
-                click.echo(f"   Preis pro m2: {listing.get('price_per_sqm')} €", nl=False)
-                if listing.get('avg_ppm_diff') is not None:
-                    click.echo(f" | Delta avg/m2: {listing.get('avg_ppm_diff')} €", nl=False)
-                if listing.get('rent_index_diff') is not None:
-                    click.echo(f" | Delta Mietspiegel: {listing.get('rent_index_diff')} €", nl=False)
-                click.echo()
-
-            if route_requested:
-                click.echo(f"   Luftlinie: {listing.get('straight_line_km', 'N/A')} km", nl=False)
-                if listing.get('distance_km'):
-                    click.echo(f" | {route_mode.title()}: {listing.get('distance_km')} km", nl=False)
-                if listing.get('duration_min'):
-                    click.echo(f" (~{listing.get('duration_min')} min)")
-                else:
-                    click.echo()
-
-            if verbose >= 1:
-                if listing.get('available_until'):
-                    click.echo(f"   Verfügbar bis: {listing['available_until']}")
-
-                if listing.get('flatmates'):
-                    flatmate_line = f"   WG-Größe: {listing['flatmates']}er WG"
-                    details = []
-                    if listing.get('flatmates_female') is not None:
-                        details.append(f"{listing['flatmates_female']}w")
-                    if listing.get('flatmates_male') is not None:
-                        details.append(f"{listing['flatmates_male']}m")
-                    if listing.get('flatmates_diverse') is not None:
-                        details.append(f"{listing['flatmates_diverse']}d")
-                    if listing.get('rooms_free') is not None:
-                        details.append(f"{listing['rooms_free']} frei")
-                    if listing.get('flatmate_details') and not details:
-                        details.append(listing['flatmate_details'])
-                    if details:
-                        flatmate_line += f" ({', '.join(details)})"
-                    click.echo(flatmate_line)
-
-                if listing.get('room_type'):
-                    click.echo(f"   Zimmerart: {listing['room_type']}")
-
-                if listing.get('online_since'):
-                    click.echo(f"   Online seit: {listing['online_since']}")
-
-            if verbose >= 2:
-                if listing.get('description'):
-                    desc = listing['description']
-                    if len(desc) > 200:
-                        desc = desc[:200] + "..."
-                    click.echo(f"   Beschreibung: {desc}")
-
-                if listing.get('features'):
-                    click.echo(f"   Features: {listing['features']}")
-
-                if listing.get('contact_name'):
-                    click.echo(f"   Kontakt: {listing['contact_name']}")
-
-                click.echo(f"   DB-ID: {listing.get('id', 'N/A')} | Listing-ID: {listing.get('listing_id', 'N/A')}")
-                click.echo(f"   Gescrapt am: {listing.get('scraped_at', 'N/A')}")
-                if listing.get('created_at'):
-                    click.echo(f"   Erstellt am: {listing.get('created_at')}")
-
-            click.echo(f"   URL: {listing.get('url', 'N/A')}")
-            click.echo(f"{'-'*80}\n")
+            header.append(f"Sortierung: {sort} ({order})")
+        header.append(f"{'='*80}\n\n")
+
+        # Kopfzeilen und alle Anzeigen mit einem einzigen Schreibaufruf ausgeben
+        route_display_mode = route_mode if route_requested else None
+        click.echo(
+            "\n".join(header) + "".join(
+                _format_listing(i, listing, verbose, route_display_mode)
+                for i, listing in enumerate(listings, 1)
+            ),
+            nl=False,
+        )
 
         if output:
             if route_requested and results is not None:
@@ -572,9 +942,12 @@ def list(
                     click.echo(f"\n✓ {len(listings)} Anzeigen exportiert nach: {output}")
                 else:
                     click.echo(f"\n✗ Export fehlgeschlagen", err=True)
+
+        if next_cursor:
+            click.echo(f"\nNächste Seite: --after '{_format_cursor(next_cursor)}'")
             
     except Exception as e:
-        _logger.error(f"Fehler beim Abrufen der Daten: {e}", exc_info=True)
+        _logger.error(f"Fehler beim Abrufen der Daten: {e}", exc_info=verbose >= 2)
         click.echo(f"✗ Fehler: {e}", err=True)
         sys.exit(1)
 
@@ -583,16 +956,17 @@ def list(
 @click.option(
     "--db-path",
     type=click.Path(exists=True),
-    default="wg_data.db",
-    help="Pfad zur SQLite-Datenbank.",
+    default=None,
+    help="Pfad zur SQLite-Datenbank (Standard: Wert von wg-scraper --db-path).",
 )
-def stats(db_path):
+@click.pass_context
+def stats(ctx, db_path):
     """
     Zeigt Statistiken über die gespeicherten Anzeigen an.
     """
     try:
-        db = Database(db_path)
-        statistics = db.get_statistics()
+        db = get_database(ctx, db_path, must_exist=True)
+        statistics = db.get_cached_statistics()
         
         click.echo(f"\n{'='*80}")
         click.echo("Datenbank-Statistiken")
@@ -607,7 +981,7 @@ def stats(db_path):
         click.echo()
         
     except Exception as e:
-        _logger.error(f"Fehler beim Abrufen der Statistiken: {e}", exc_info=True)
+        _logger.error(f"Fehler beim Abrufen der Statistiken: {e}", exc_info=ctx.obj.get('verbose', 0) >= 2)
         click.echo(f"✗ Fehler: {e}", err=True)
         sys.exit(1)
 
@@ -6,20 +6,95 @@ import re
 import logging
 import json
 import csv
+import math
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime, timedelta
-import hashlib
-from geopy.distance import geodesic
+from typing import Callable, Dict, Any, Iterable, Optional, Sequence, Tuple, List
+from datetime import timedelta
+import sqlite3
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional: pip install wg-scraper[fast]
+    orjson = None
 
 _logger = logging.getLogger(__name__)
 
+# Ein Filter-Term: Feld, Operator (zweistellige zuerst), Wert
+_FILTER_RE = re.compile(r'(\w+)(>=|<=|!=|>|<|=)(.+)')
+
+# Zahlenwerte in Filtern: Ganzzahl oder Dezimalzahl mit Punkt (optional mit Exponent)
+_NUM_RE = re.compile(r'[+-]?(?:\d+|(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+# Mittlerer Erdradius in km (für Haversine-Luftlinie)
+_EARTH_RADIUS_KM = 6371.0088
+
+# WGS84-Ellipsoid für die Cheap-Ruler-Näherung: Äquatorradius in km und
+# Quadrat der Exzentrizität (aus der Abplattung 1/298.257223563)
+_WGS84_RADIUS_KM = 6378.137
+_WGS84_E2 = (1 / 298.257223563) * (2 - 1 / 298.257223563)
+
+# Bis zu dieser Luftlinie ist die flache Näherung genau genug (< 0,1 %),
+# darüber wird mit Haversine nachgerechnet
+_CHEAP_RULER_MAX_KM = 200.0
+
+
+def _json_dumps_bytes(data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialisiert kompakt als UTF-8-JSON (mit orjson, falls installiert)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=default)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=default).encode('utf-8')
+
+
+def _json_dumps_pretty(data: Any) -> str:
+    """Serialisiert mit 2 Leerzeichen Einrückung wie json.dumps(indent=2, default=str)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+
+def _json_loads(data: Any) -> Any:
+    """Liest JSON aus str oder bytes (mit orjson, falls installiert)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _connect_cache_db(db_path: Path, schema: str) -> sqlite3.Connection:
+    """
+    Öffnet eine Cache-Datenbank im Autocommit- und WAL-Modus.
+    
+    Die Verbindung darf von mehreren Threads genutzt werden; Aufrufer
+    serialisieren die Zugriffe über ein eigenes Lock.
+    
+    Args:
+        db_path: Pfad zur SQLite-Datei (Verzeichnis wird angelegt)
+        schema: CREATE TABLE IF NOT EXISTS-Anweisung der Cache-Tabelle
+        
+    Returns:
+        Offene Verbindung
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(schema)
+    return conn
+
 
 class RequestCache:
     """
     Einfacher Cache für HTTP-Requests, um redundante API-Calls zu vermeiden.
+    
+    Alle Einträge liegen in einer SQLite-Datei (cache.sqlite) statt in je
+    einer JSON-Datei pro Request.
     """
     
     def __init__(self, cache_dir: Optional[Path] = None, ttl_hours: int = 24):
@@ -27,17 +102,29 @@ class RequestCache:
         Initialisiert den Cache.
         
         Args:
-            cache_dir: Verzeichnis für Cache-Dateien. Wenn None, wird ~/.wg_scraper_cache verwendet.
+            cache_dir: Verzeichnis für die Cache-Datenbank. Wenn None, wird ~/.wg_scraper_cache verwendet.
             ttl_hours: Time-to-live für Cache-Einträge in Stunden (Standard: 24)
         """
         if cache_dir is None:
             cache_dir = Path.home() / '.wg_scraper_cache'
         
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'cache.sqlite'
         self.ttl = timedelta(hours=ttl_hours)
+        self._ttl_seconds = ttl_hours * 3600
+        self._conn = None
+        self._lock = threading.Lock()
         _logger.debug(f"RequestCache initialisiert in {self.cache_dir} mit TTL {ttl_hours}h")
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Öffnet die Cache-Datenbank beim ersten Zugriff (Aufrufer hält _lock)."""
+        if self._conn is None:
+            self._conn = _connect_cache_db(
+                self.db_path,
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts REAL NOT NULL, data BLOB)"
+            )
+        return self._conn
+    
     def _get_cache_key(self, url: str, params: Optional[Dict] = None) -> str:
         """
         Generiert einen Cache-Schlüssel aus URL und Parametern.
@@ -47,14 +134,12 @@ class RequestCache:
             params: Query-Parameter
             
         Returns:
-            Cache-Schlüssel (MD5-Hash)
+            Cache-Schlüssel (URL, ggf. mit kanonisch sortierten Parametern)
         """
-        cache_data = f"{url}|{json.dumps(params or {}, sort_keys=True)}"
-        return hashlib.md5(cache_data.encode()).hexdigest()
-    
-    def _get_cache_file(self, key: str) -> Path:
-        """Gibt den Cache-Dateipfad für einen Schlüssel zurück."""
-        return self.cache_dir / f"{key}.json"
+        # SQLite indiziert den Klartext direkt, ein Hash bringt hier nichts
+        if not params:
+            return url
+        return f"{url}|{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
     
     def get(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """
@@ -68,24 +153,20 @@ class RequestCache:
             Gecachte Daten oder None
         """
         key = self._get_cache_key(url, params)
-        cache_file = self._get_cache_file(key)
-        
-        if not cache_file.exists():
-            return None
         
         try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+            # TTL wird direkt in der Abfrage geprüft (Zahlenvergleich in SQLite)
+            with self._lock:
+                row = self._get_connection().execute(
+                    "SELECT data FROM cache WHERE key = ? AND ts > ?",
+                    (key, time.time() - self._ttl_seconds)
+                ).fetchone()
             
-            # Prüfe TTL
-            cached_at = datetime.fromisoformat(cache_data['cached_at'])
-            if datetime.now() - cached_at > self.ttl:
-                _logger.debug(f"Cache abgelaufen: {key}")
-                cache_file.unlink()
+            if row is None:
                 return None
             
             _logger.debug(f"Cache Hit: {key}")
-            return cache_data['data']
+            return _json_loads(row[0])
             
         except Exception as e:
             _logger.warning(f"Fehler beim Cache-Read: {e}")
@@ -104,18 +185,14 @@ class RequestCache:
             True bei Erfolg
         """
         key = self._get_cache_key(url, params)
-        cache_file = self._get_cache_file(key)
         
         try:
-            cache_data = {
-                'cached_at': datetime.now().isoformat(),
-                'url': url,
-                'params': params,
-                'data': data
-            }
-            
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
+            payload = _json_dumps_bytes(data)
+            with self._lock:
+                self._get_connection().execute(
+                    "INSERT OR REPLACE INTO cache (key, ts, data) VALUES (?, ?, ?)",
+                    (key, time.time(), payload)
+                )
             
             _logger.debug(f"Cache Set: {key}")
             return True
@@ -132,8 +209,8 @@ class RequestCache:
             True bei Erfolg
         """
         try:
-            for cache_file in self.cache_dir.glob('*.json'):
-                cache_file.unlink()
+            with self._lock:
+                self._get_connection().execute("DELETE FROM cache")
             _logger.info("Cache geleert")
             return True
         except Exception as e:
@@ -141,8 +218,263 @@ class RequestCache:
             return False
 
 
-# Globale Cache-Instanz
-_request_cache = RequestCache()
+class RouteCache:
+    """
+    Persistenter SQLite-Cache für OSRM-Routen.
+    
+    Schlüssel sind die auf wenige Nachkommastellen gerundeten Start- und
+    Zielkoordinaten sowie der Modus, sodass nahe beieinander liegende
+    Geocodierungen denselben Eintrag treffen (4 Stellen ~ 11 m). Treffer
+    werden zusätzlich im Speicher gehalten, damit wiederholte Anfragen
+    innerhalb eines Prozesses die Datenbank nicht erneut abfragen.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_hours: int = 168,
+        precision: int = 4
+    ):
+        """
+        Initialisiert den Cache.
+        
+        Args:
+            cache_dir: Verzeichnis der Cache-Datenbank. Wenn None, wird ~/.wg_scraper_cache verwendet.
+            ttl_hours: Time-to-live für Cache-Einträge in Stunden (Standard: 168 = 7 Tage)
+            precision: Nachkommastellen, auf die Koordinaten gerundet werden
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / '.wg_scraper_cache'
+        
+        self.cache_dir = Path(cache_dir)
+        self.db_path = self.cache_dir / 'routes.sqlite'
+        self.ttl_seconds = ttl_hours * 3600
+        self.precision = precision
+        self._conn = None
+        self._lock = threading.Lock()
+        self._memory_cache: Dict[Tuple[float, float, float, float, str], Tuple[Optional[float], Optional[float]]] = {}
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Öffnet die Cache-Datenbank beim ersten Zugriff (Aufrufer hält _lock)."""
+        if self._conn is None:
+            # Zugriffe aus den Routing-Threads laufen über _lock
+            self._conn = _connect_cache_db(self.db_path, """
+                CREATE TABLE IF NOT EXISTS routecache (
+                    origin_lat REAL NOT NULL,
+                    origin_lon REAL NOT NULL,
+                    dest_lat REAL NOT NULL,
+                    dest_lon REAL NOT NULL,
+                    mode TEXT NOT NULL,
+                    distance_km REAL,
+                    duration_min REAL,
+                    ts REAL NOT NULL,
+                    PRIMARY KEY (origin_lat, origin_lon, dest_lat, dest_lon, mode)
+                )
+            """)
+            _logger.debug(f"RouteCache initialisiert in {self.db_path}")
+        return self._conn
+    
+    def _key(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float],
+        mode: str
+    ) -> Tuple[float, float, float, float, str]:
+        """Baut den Cache-Schlüssel aus gerundeten Koordinaten und Modus."""
+        digits = self.precision
+        return (
+            round(origin[0], digits), round(origin[1], digits),
+            round(destination[0], digits), round(destination[1], digits),
+            mode
+        )
+    
+    def get(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float],
+        mode: str
+    ) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """
+        Holt eine gecachte Route, wenn vorhanden und noch gültig.
+        
+        Args:
+            origin: Start-Koordinaten (lat, lon)
+            destination: Ziel-Koordinaten (lat, lon)
+            mode: Cache-Modus (OSRM-Profil oder 'transit')
+            
+        Returns:
+            Tuple (distance_km, duration_min) oder None
+        """
+        key = self._key(origin, destination, mode)
+        cached = self._memory_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            with self._lock:
+                row = self._get_connection().execute(
+                    """
+                    SELECT distance_km, duration_min FROM routecache
+                    WHERE origin_lat = ? AND origin_lon = ? AND dest_lat = ?
+                      AND dest_lon = ? AND mode = ? AND ts > ?
+                    """,
+                    (*key, time.time() - self.ttl_seconds)
+                ).fetchone()
+        except sqlite3.Error as e:
+            _logger.warning(f"Fehler beim Lesen des Routen-Cache: {e}")
+            return None
+        
+        if not row:
+            return None
+        self._memory_cache[key] = cached = tuple(row)
+        return cached
+    
+    def set_many(
+        self,
+        entries: Iterable[Tuple[Tuple[float, float], Tuple[float, float], str, Optional[float], Optional[float]]]
+    ) -> bool:
+        """
+        Speichert mehrere Routen in einer Transaktion.
+        
+        Args:
+            entries: Tupel (origin, destination, mode, distance_km, duration_min)
+            
+        Returns:
+            True bei Erfolg
+        """
+        now = time.time()
+        rows = [
+            (*self._key(origin, destination, mode), distance_km, duration_min, now)
+            for origin, destination, mode, distance_km, duration_min in entries
+        ]
+        if not rows:
+            return True
+        
+        for row in rows:
+            self._memory_cache[row[:5]] = row[5:7]
+        
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO routecache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+            return True
+        except sqlite3.Error as e:
+            _logger.warning(f"Fehler beim Schreiben des Routen-Cache: {e}")
+            return False
+    
+    def set(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float],
+        mode: str,
+        distance_km: Optional[float],
+        duration_min: Optional[float]
+    ) -> bool:
+        """Speichert eine einzelne Route (siehe set_many)."""
+        return self.set_many([(origin, destination, mode, distance_km, duration_min)])
+    
+    def clear(self) -> bool:
+        """
+        Löscht alle Cache-Einträge.
+        
+        Returns:
+            True bei Erfolg
+        """
+        self._memory_cache.clear()
+        try:
+            with self._lock:
+                self._get_connection().execute("DELETE FROM routecache")
+            _logger.info("Routen-Cache geleert")
+            return True
+        except sqlite3.Error as e:
+            _logger.warning(f"Fehler beim Löschen des Routen-Cache: {e}")
+            return False
+
+
+# Globale Cache-Instanz für OSRM-Routen
+_route_cache = RouteCache()
+
+
+# User-Agent für Nominatim und OSRM - muss laut TOS echte Kontaktinfo enthalten
+_USER_AGENT = "WG-Scraper/1.3 (+https://github.com/jj/wg-scraper)"
+
+
+def _create_http_session() -> requests.Session:
+    """
+    Erstellt die gemeinsame HTTP-Session für Nominatim und OSRM.
+    
+    Keep-Alive-Verbindungen werden über alle Anfragen wiederverwendet,
+    vorübergehende Gateway-Fehler mit kurzem Backoff wiederholt. User-Agent
+    und komprimierte Antworten sind für alle Anfragen voreingestellt.
+    
+    Returns:
+        Konfigurierte requests.Session
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': _USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Globale HTTP-Session (Connection-Pool für alle API-Aufrufe)
+_http_session = _create_http_session()
+
+# Markiert einen Cache-Miss (im Unterschied zu einem gecachten "nicht gefunden")
+_CACHE_MISS = object()
+
+# Anzahl paralleler Geocoding-Aufrufe in geocode_many()
+_GEOCODE_WORKERS = 8
+
+
+class IntervalRateLimiter:
+    """
+    Thread-sicherer Mindestabstand zwischen Anfragen an einen Dienst.
+    
+    Jeder Aufrufer reserviert unter einem Lock den nächsten freien Zeitslot
+    und wartet anschließend außerhalb des Locks darauf. Pro Dienst (Host)
+    wird eine eigene Instanz verwendet, damit sich die Limits verschiedener
+    Dienste nicht gegenseitig ausbremsen.
+    """
+    
+    def __init__(self, min_delay_seconds: float = 1.0, label: str = ""):
+        """
+        Initialisiert den Rate Limiter.
+        
+        Args:
+            min_delay_seconds: Minimale Verzögerung zwischen Anfragen in Sekunden
+            label: Bezeichnung für Log-Ausgaben (z.B. "Nominatim TOS konform")
+        """
+        self.min_delay = min_delay_seconds
+        self.label = label
+        self.last_request_time = time.time() - self.min_delay  # Erlaubt sofortige erste Anfrage
+        self._lock = threading.Lock()
+    
+    def wait(self) -> None:
+        """Wartet, bis die nächste Anfrage erlaubt ist."""
+        with self._lock:
+            current_time = time.time()
+            next_slot = max(current_time, self.last_request_time + self.min_delay)
+            self.last_request_time = next_slot
+        
+        sleep_time = next_slot - current_time
+        if sleep_time > 0:
+            _logger.debug(f"Rate Limit: Warte {sleep_time:.2f}s ({self.label})")
+            time.sleep(sleep_time)
 
 
 class GeocoderRateLimiter:
@@ -157,7 +489,12 @@ class GeocoderRateLimiter:
     Siehe: https://operations.osmfoundation.org/policies/nominatim/
     """
     
-    def __init__(self, min_delay_seconds: float = 1.0, cache_ttl_hours: int = 160008):
+    def __init__(
+        self,
+        min_delay_seconds: float = 1.0,
+        cache_ttl_hours: int = 160008,
+        negative_cache_ttl_hours: int = 24
+    ):
         """
         Initialisiert den Geocoder mit Rate Limiting.
         
@@ -165,17 +502,28 @@ class GeocoderRateLimiter:
             min_delay_seconds: Minimale Verzögerung zwischen Anfragen in Sekunden (Standard: 1.0)
                                Nominatim verlangt mindestens 1 Sekunde zwischen Requests
             cache_ttl_hours: Time-to-live für gecachte Adressen in Stunden (Standard: 168 = 1 Woche)
+            negative_cache_ttl_hours: Time-to-live für "nicht gefunden"-Einträge in Stunden
+                               (Standard: 24), damit neu erfasste Adressen bald gefunden werden
         """
         self.min_delay = min_delay_seconds
-        self.last_request_time = time.time() - self.min_delay  # Erlaubt sofortige erste Anfrage
+        self._limiter = IntervalRateLimiter(min_delay_seconds, "Nominatim TOS konform")
         
-        # Cache für Geocoding-Anfragen
+        # Cache für Geocoding-Anfragen (eine SQLite-Datei, beim ersten Zugriff geöffnet)
         self.cache_dir = Path.home() / '.wg_scraper_geocoding_cache'
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_db_path = self.cache_dir / 'geocoding.sqlite'
         self.cache_ttl = timedelta(hours=cache_ttl_hours)
+        self.negative_cache_ttl = timedelta(hours=negative_cache_ttl_hours)
+        self._ttl_seconds = cache_ttl_hours * 3600
+        self._negative_ttl_seconds = negative_cache_ttl_hours * 3600
+        self._cache_conn = None
+        self._cache_lock = threading.Lock()
+        
+        # Prozesslokaler Cache vor dem Datei-Cache, damit wiederholte Adressen
+        # (z.B. "Berlin, Mitte") nur einmal von der Platte gelesen werden
+        self._memory_cache: Dict[str, Optional[Tuple[float, float]]] = {}
         
         # User-Agent die die TOS erfüllt - muss echte Kontaktinfo enthalten
-        self.user_agent = "WG-Scraper/1.3 (+https://github.com/jj/wg-scraper)"
+        self.user_agent = _USER_AGENT
         self.referer = "https://github.com/jj/wg-scraper"
         
         # Nominatim API Basis-URL
@@ -186,12 +534,31 @@ class GeocoderRateLimiter:
             f"{min_delay_seconds}s Verzögerung zwischen Anfragen (Nominatim TOS konform)"
         )
     
-    def _get_cache_path(self, address: str) -> Path:
-        """Gibt den Cache-Dateipfad für eine Adresse zurück."""
-        cache_key = hashlib.md5(address.lower().encode()).hexdigest()
-        return self.cache_dir / f"{cache_key}.json"
+    @staticmethod
+    def _normalize_address(address: str) -> str:
+        """Entfernt überflüssige Leerzeichen, z.B. "Berlin,  Mitte " -> "Berlin, Mitte"."""
+        return " ".join(address.split())
+    
+    @staticmethod
+    def _cache_key(address: str) -> str:
+        """Gibt den Cache-Schlüssel einer normalisierten Adresse zurück (ohne Groß-/Kleinschreibung)."""
+        return address.lower()
     
-    def _get_from_cache(self, address: str) -> Optional[Tuple[float, float]]:
+    def _get_cache_connection(self) -> sqlite3.Connection:
+        """Öffnet die Cache-Datenbank beim ersten Zugriff (Aufrufer hält _cache_lock)."""
+        if self._cache_conn is None:
+            # lat/lon NULL = Adresse nicht gefunden
+            self._cache_conn = _connect_cache_db(self.cache_db_path, """
+                CREATE TABLE IF NOT EXISTS geocache (
+                    address TEXT PRIMARY KEY,
+                    lat REAL,
+                    lon REAL,
+                    cached_at REAL NOT NULL
+                )
+            """)
+        return self._cache_conn
+    
+    def _get_from_cache(self, address: str) -> Any:
         """
         Versucht, Koordinaten aus dem Cache zu laden.
         
@@ -199,33 +566,36 @@ class GeocoderRateLimiter:
             address: Adresse zum Suchen
             
         Returns:
-            Tuple (latitude, longitude) oder None
+            Tuple (latitude, longitude), None für gecachte "nicht gefunden"-Einträge
+            oder _CACHE_MISS wenn kein gültiger Eintrag existiert
         """
-        cache_path = self._get_cache_path(address)
-        
-        if not cache_path.exists():
-            return None
+        memory_key = self._cache_key(address)
+        if memory_key in self._memory_cache:
+            return self._memory_cache[memory_key]
         
+        # "Nicht gefunden"-Einträge laufen früher ab; die TTL prüft SQLite
+        now = time.time()
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # Prüfe TTL
-            cached_at = datetime.fromisoformat(cache_data['cached_at'])
-            if datetime.now() - cached_at > self.cache_ttl:
-                _logger.debug(f"Geocoding Cache abgelaufen: {address}")
-                cache_path.unlink()
-                return None
-            
-            coords = cache_data.get('coordinates')
-            if coords:
-                _logger.debug(f"Geocoding Cache Hit: {address} -> {coords}")
-                return tuple(coords)
-                
-        except Exception as e:
+            with self._cache_lock:
+                row = self._get_cache_connection().execute(
+                    """
+                    SELECT lat, lon FROM geocache
+                    WHERE address = ?
+                      AND cached_at > CASE WHEN lat IS NULL THEN ? ELSE ? END
+                    """,
+                    (memory_key, now - self._negative_ttl_seconds, now - self._ttl_seconds)
+                ).fetchone()
+        except sqlite3.Error as e:
             _logger.warning(f"Fehler beim Lesen des Geocoding Cache: {e}")
+            return _CACHE_MISS
         
-        return None
+        if row is None:
+            return _CACHE_MISS
+        
+        coords = (row[0], row[1]) if row[0] is not None else None
+        _logger.debug(f"Geocoding Cache Hit: {address} -> {coords}")
+        self._memory_cache[memory_key] = coords
+        return coords
     
     def _save_to_cache(self, address: str, coords: Optional[Tuple[float, float]]) -> None:
         """
@@ -235,32 +605,31 @@ class GeocoderRateLimiter:
             address: Adresse
             coords: Tuple (latitude, longitude) oder None falls nicht gefunden
         """
+        memory_key = self._cache_key(address)
+        self._memory_cache[memory_key] = coords
+        
+        lat, lon = coords if coords else (None, None)
         try:
-            cache_path = self._get_cache_path(address)
-            cache_data = {
-                'cached_at': datetime.now().isoformat(),
-                'address': address,
-                'coordinates': list(coords) if coords else None
-            }
-            
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False)
-                
-        except Exception as e:
+            with self._cache_lock:
+                self._get_cache_connection().execute(
+                    "INSERT OR REPLACE INTO geocache (address, lat, lon, cached_at) VALUES (?, ?, ?, ?)",
+                    (memory_key, lat, lon, time.time())
+                )
+        except sqlite3.Error as e:
             _logger.warning(f"Fehler beim Speichern des Geocoding Cache: {e}")
     
+    def cache_entry_count(self) -> int:
+        """Gibt die Anzahl gespeicherter Cache-Einträge zurück (inkl. abgelaufener)."""
+        if not self.cache_db_path.exists():
+            return 0
+        with self._cache_lock:
+            return self._get_cache_connection().execute(
+                "SELECT COUNT(*) FROM geocache"
+            ).fetchone()[0]
+    
     def _apply_rate_limit(self) -> None:
-        """Wendet das minimale Verzögerungsintervall zwischen Anfragen an."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_delay:
-            sleep_time = self.min_delay - time_since_last_request
-            _logger.debug(f"Rate Limit: Warte {sleep_time:.2f}s (Nominatim TOS konform)")
-            print(f"Rate Limit: Warte {sleep_time:.2f}s (Nominatim TOS konform)")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        """Wendet das minimale Verzögerungsintervall zwischen Anfragen an (thread-sicher)."""
+        self._limiter.wait()
     
     def geocode(self, address: str) -> Optional[Tuple[float, float]]:
         """
@@ -276,11 +645,11 @@ class GeocoderRateLimiter:
             return None
         
         # Normalisiere Adresse für konsistentes Caching
-        address_normalized = address.strip()
+        address_normalized = self._normalize_address(address)
         
         # Versuche aus Cache zu laden
         cached_coords = self._get_from_cache(address_normalized)
-        if cached_coords is not None:
+        if cached_coords is not _CACHE_MISS:
             return cached_coords
         
         try:
@@ -304,7 +673,7 @@ class GeocoderRateLimiter:
                 'Accept-Language': 'de,en'
             }
             
-            response = requests.get(
+            response = _http_session.get(
                 self.nominatim_url,
                 params=params,
                 headers=headers,
@@ -332,11 +701,55 @@ class GeocoderRateLimiter:
             _logger.error(f"Fehler beim Geocoding von '{address_normalized}': {e}")
             return None
     
+    def geocode_many(
+        self,
+        addresses: Iterable[str],
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, Optional[Tuple[float, float]]]:
+        """
+        Geocodiert mehrere Adressen, jede eindeutige Adresse nur einmal.
+        
+        Cache-Treffer werden direkt beantwortet; nur fehlende Adressen gehen
+        parallel an Nominatim, wobei das Rate Limit weiterhin gilt.
+        
+        Args:
+            addresses: Adressen als Strings (Duplikate und leere Werte erlaubt)
+            on_progress: Optionaler Callback, erhält die Anzahl fertiger Adressen
+            
+        Returns:
+            Dictionary Adresse -> (latitude, longitude) oder None
+        """
+        results = {}
+        pending = []
+        
+        for address in dict.fromkeys(address for address in addresses if address):
+            cached_coords = self._get_from_cache(self._normalize_address(address))
+            if cached_coords is _CACHE_MISS:
+                pending.append(address)
+            else:
+                results[address] = cached_coords
+        
+        if on_progress and results:
+            on_progress(len(results))
+        
+        if pending:
+            _logger.debug(f"Geocodiere {len(pending)} von {len(pending) + len(results)} Adressen")
+            # Parallel laufen vor allem die Wartezeiten auf Antworten, die
+            # Anfragen selbst bleiben durch _apply_rate_limit gedrosselt
+            with ThreadPoolExecutor(max_workers=_GEOCODE_WORKERS) as executor:
+                for address, coords in zip(pending, executor.map(self.geocode, pending)):
+                    results[address] = coords
+                    if on_progress:
+                        on_progress(1)
+        
+        return results
+    
     def clear_cache(self) -> None:
         """Löscht den kompletten Geocoding-Cache."""
+        self._memory_cache.clear()
         try:
-            for cache_file in self.cache_dir.glob('*.json'):
-                cache_file.unlink()
+            with self._cache_lock:
+                self._get_cache_connection().execute("DELETE FROM geocache")
             _logger.info("Geocoding-Cache geleert")
         except Exception as e:
             _logger.warning(f"Fehler beim Löschen des Geocoding-Cache: {e}")
@@ -345,6 +758,10 @@ class GeocoderRateLimiter:
 # Globale GeocoderRateLimiter-Instanz
 _geocoder = GeocoderRateLimiter()
 
+# Eigener Rate Limiter für den öffentlichen OSRM-Server (max. 1 Anfrage/s),
+# unabhängig vom Nominatim-Limit
+_osrm_limiter = IntervalRateLimiter(1.0, "OSRM Nutzungsrichtlinie")
+
 
 
 def parse_filters(filter_string: Optional[str]) -> Dict[str, Any]:
@@ -365,17 +782,38 @@ def parse_filters(filter_string: Optional[str]) -> Dict[str, Any]:
         return {}
     
     filters = {}
+    for field, operator, value in _parse_filter_terms(filter_string):
+        # Speichere mit Operator
+        if operator == '=':
+            filters[field] = value
+        else:
+            filters[f"{field}{operator}"] = value
     
-    # Split by semicolon
-    parts = filter_string.split(';')
+    return filters
+
+
+@lru_cache(maxsize=64)
+def _parse_filter_terms(filter_string: str) -> Tuple[Tuple[str, str, Any], ...]:
+    """
+    Zerlegt einen Filter-String in (Feld, Operator, Wert)-Tupel.
     
-    for part in parts:
+    Das Ergebnis ist unveränderlich und wird pro Filter-String gecacht.
+    
+    Args:
+        filter_string: Filter-String mit Semikolon-Trennung
+        
+    Returns:
+        Tuple von (field, operator, value)-Tupeln
+    """
+    terms = []
+    
+    for part in filter_string.split(';'):
         part = part.strip()
         if not part:
             continue
         
         # Finde Operator
-        match = re.match(r'(\w+)(>=|<=|!=|>|<|=)(.+)', part)
+        match = _FILTER_RE.match(part)
         if not match:
             _logger.warning(f"Ungültiger Filter: {part}")
             continue
@@ -383,24 +821,13 @@ def parse_filters(filter_string: Optional[str]) -> Dict[str, Any]:
         field, operator, value = match.groups()
         value = value.strip()
         
-        # Konvertiere Wert
-        try:
-            # Versuche als Zahl
-            if '.' in value:
-                value = float(value)
-            else:
-                value = int(value)
-        except ValueError:
-            # Bleibt String
-            pass
+        # Konvertiere Wert - Zahlen als int/float, alles andere bleibt String
+        if _NUM_RE.fullmatch(value):
+            value = float(value) if '.' in value else int(value)
         
-        # Speichere mit Operator
-        if operator == '=':
-            filters[field] = value
-        else:
-            filters[f"{field}{operator}"] = value
+        terms.append((field, operator, value))
     
-    return filters
+    return tuple(terms)
 
 
 def geocode_address(address: str) -> Optional[Tuple[float, float]]:
@@ -427,6 +854,26 @@ def geocode_address(address: str) -> Optional[Tuple[float, float]]:
     return _geocoder.geocode(address)
 
 
+def geocode_many(
+    addresses: Iterable[str],
+    on_progress: Optional[Callable[[int], None]] = None
+) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Geocodiert mehrere Adressen über den globalen GeocoderRateLimiter.
+    
+    Doppelte Adressen werden nur einmal angefragt, gecachte Adressen ohne
+    Umweg über Worker-Threads beantwortet.
+    
+    Args:
+        addresses: Adressen als Strings (Duplikate und leere Werte erlaubt)
+        on_progress: Optionaler Callback, erhält die Anzahl fertiger Adressen
+        
+    Returns:
+        Dictionary Adresse -> (latitude, longitude) oder None
+    """
+    return _geocoder.geocode_many(addresses, on_progress)
+
+
 def clear_geocoding_cache() -> None:
     """
     Löscht den kompletten Geocoding-Cache.
@@ -451,35 +898,255 @@ def get_geocoding_cache_stats() -> Dict[str, Any]:
     """
     cache_dir = _geocoder.cache_dir
     
-    if not cache_dir.exists():
+    if not _geocoder.cache_db_path.exists():
         return {
             'cache_dir': str(cache_dir),
             'cached_entries': 0,
             'cache_size_mb': 0.0
         }
     
-    cache_files = list(cache_dir.glob('*.json'))
-    total_size = sum(f.stat().st_size for f in cache_files)
+    # Datenbank plus WAL-Datei
+    total_size = sum(
+        path.stat().st_size
+        for path in cache_dir.glob(f"{_geocoder.cache_db_path.name}*")
+    )
     
     return {
         'cache_dir': str(cache_dir),
-        'cached_entries': len(cache_files),
+        'cached_entries': _geocoder.cache_entry_count(),
         'cache_size_mb': round(total_size / (1024 * 1024), 2)
     }
 
 
+def _haversine_km(origin: Tuple[float, float], destination: Tuple[float, float]) -> float:
+    """Berechnet die Großkreis-Entfernung zweier Punkte in km."""
+    lat1, lon1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2, lon2 = math.radians(destination[0]), math.radians(destination[1])
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _cheap_ruler_scale(lat: float) -> Tuple[float, float]:
+    """
+    Gibt km pro Längen- und Breitengrad auf der Breite `lat` zurück.
+    
+    Krümmungsradien des WGS84-Ellipsoids quer zum bzw. entlang des Meridians;
+    in Deutschland ist ein Breitengrad z.B. gut 111,2 km lang, nicht 110,6 km.
+    """
+    cos_lat = math.cos(math.radians(lat))
+    w2 = 1 / (1 - _WGS84_E2 * (1 - cos_lat * cos_lat))
+    w = math.sqrt(w2)
+    km_per_deg = math.radians(_WGS84_RADIUS_KM)
+    return km_per_deg * w * cos_lat, km_per_deg * w * w2 * (1 - _WGS84_E2)
+
+
+def straight_line_km(origin: Tuple[float, float], destination: Tuple[float, float]) -> float:
+    """
+    Berechnet die Luftlinie zwischen zwei Punkten in km.
+    
+    Verwendet eine Cheap-Ruler-Näherung (flache Projektion um die mittlere
+    Breite, Maßstab aus dem WGS84-Ellipsoid wie bei Mapbox cheap-ruler);
+    nur bei großen Entfernungen wird mit Haversine nachgerechnet.
+    
+    Args:
+        origin: Start-Koordinaten (lat, lon)
+        destination: Ziel-Koordinaten (lat, lon)
+        
+    Returns:
+        Luftlinie in km (ungerundet)
+    """
+    lat1, lon1 = origin
+    lat2, lon2 = destination
+    km_per_deg_lon, km_per_deg_lat = _cheap_ruler_scale((lat1 + lat2) / 2)
+    km = math.hypot((lon1 - lon2) * km_per_deg_lon, (lat1 - lat2) * km_per_deg_lat)
+    if km > _CHEAP_RULER_MAX_KM:
+        return _haversine_km(origin, destination)
+    return km
+
+
+def straight_line_km_batch(
+    points: List[Optional[Tuple[float, float]]],
+    destination: Tuple[float, float]
+) -> List[Optional[float]]:
+    """
+    Berechnet die Luftlinie mehrerer Punkte zu einem gemeinsamen Ziel.
+    
+    Entspricht straight_line_km() für jeden Punkt. Geeignet als schneller
+    Vorfilter vor dem Routing.
+    
+    Args:
+        points: Liste von Koordinaten (lat, lon); None-Einträge sind erlaubt
+        destination: Ziel-Koordinaten (lat, lon)
+        
+    Returns:
+        Liste der Luftlinien in km, auf 2 Stellen gerundet (gleiche
+        Reihenfolge, None für None-Punkte)
+    """
+    return [
+        round(straight_line_km(point, destination), 2) if point is not None else None
+        for point in points
+    ]
+
+
+# OSRM-Routing (kostenlos, kein API-Key nötig). Unterstützt: car, bike, foot
+_OSRM_BASE_URL = "http://router.project-osrm.org"
+_OSRM_PROFILES = {
+    'driving': 'car',
+    'car': 'car',
+    'cycling': 'bike',
+    'bike': 'bike',
+    'walking': 'foot',
+    'foot': 'foot'
+}
+_OSRM_ROUTE_PARAMS = {'overview': 'false', 'steps': 'false'}
+_TRANSIT_MODES = ('transit', 'öpnv', 'public')
+
+# Maximale Anzahl Koordinaten pro table-Anfrage (Limit des öffentlichen OSRM-Servers)
+_OSRM_TABLE_MAX_COORDS = 100
+
+# Parallele Einzelabfragen, wenn der table-Dienst keine Werte liefert
+_ROUTE_FALLBACK_WORKERS = 8
+
+
+def _osrm_coord(point: Tuple[float, float]) -> str:
+    """
+    Formatiert einen Punkt (lat, lon) als OSRM-Koordinate "lon,lat".
+    
+    Feste 6 Nachkommastellen (~11 cm) halten die URLs unabhängig von
+    Float-Darstellungen wie 13.400000000000002 stabil.
+    """
+    return f"{point[1]:.6f},{point[0]:.6f}"
+
+
+def _osrm_route_url(
+    profile: str,
+    origin: Tuple[float, float],
+    destination: Tuple[float, float]
+) -> str:
+    """Baut die OSRM-route-URL."""
+    return f"{_OSRM_BASE_URL}/route/v1/{profile}/{_osrm_coord(origin)};{_osrm_coord(destination)}"
+
+
+def _empty_route_result(straight_line: Optional[float]) -> Dict[str, Any]:
+    """Gibt ein Routing-Ergebnis ohne Routendaten zurück."""
+    return {
+        'straight_line_km': round(straight_line, 2) if straight_line is not None else None,
+        'distance_km': None,
+        'duration_min': None,
+        'transit_distance_km': None,
+        'transit_duration_min': None,
+        'is_transit_estimated': False
+    }
+
+
+def _apply_route(result: Dict[str, Any], distance_m: float, duration_s: float) -> Dict[str, Any]:
+    """Trägt Distanz (m) und Dauer (s) einer OSRM-Antwort in ein Ergebnis ein."""
+    result['distance_km'] = round(distance_m / 1000, 2)
+    result['duration_min'] = round(duration_s / 60, 1)
+    return result
+
+
+def _apply_transit_from_foot(result: Dict[str, Any], distance_m: float, duration_s: float) -> Dict[str, Any]:
+    """
+    Schätzt Transit-Werte aus einer Zu-Fuß-Route.
+    
+    Transit ist typischerweise schneller als zu Fuß, aber mit Wartezeiten.
+    Schätzung: ~1.5x Zu-Fuß-Distanz, aber ~0.4x Zu-Fuß-Zeit (mit Wartezeiten)
+    """
+    result['transit_distance_km'] = round(distance_m / 1000 * 1.5, 2)
+    result['transit_duration_min'] = round(duration_s / 60 * 0.4, 1)
+    result['is_transit_estimated'] = True
+    _logger.debug(f"Transit-Fahrtzeit geschätzt: {result['transit_duration_min']}min")
+    return result
+
+
+def _apply_transit_estimate(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fallback: Schätzt Transit-Werte nur aus der Luftlinie.
+    
+    Annahme: ÖPNV-Route ist 20% länger als Luftlinie, durchschnittliche
+    ÖPNV-Geschwindigkeit ~12 km/h (mit Wartezeiten, Haltestellen).
+    """
+    straight_line = result['straight_line_km']
+    if straight_line:
+        result['transit_distance_km'] = round(straight_line * 1.2, 2)
+        result['transit_duration_min'] = round((straight_line * 1.2) / 12 * 60, 1)
+        result['is_transit_estimated'] = True
+        _logger.debug(f"Transit-Fahrtzeit aus Luftlinie geschätzt: {result['transit_duration_min']}min")
+    return result
+
+
+def _route_cache_mode(mode: str) -> str:
+    """
+    Gibt den Modus für den Routen-Cache zurück.
+    
+    Aliase teilen sich das OSRM-Profil; Transit-Schätzungen basieren zwar auf
+    dem foot-Profil, brauchen aber einen eigenen Eintrag.
+    """
+    mode = mode.lower()
+    return 'transit' if mode in _TRANSIT_MODES else _OSRM_PROFILES.get(mode, 'car')
+
+
+def _route_cache_entry(
+    origin: Tuple[float, float],
+    destination: Tuple[float, float],
+    cache_mode: str,
+    result: Dict[str, Any]
+) -> Tuple[Tuple[float, float], Tuple[float, float], str, Optional[float], Optional[float]]:
+    """Baut einen Eintrag für RouteCache.set_many() aus einem Ergebnis."""
+    if cache_mode == 'transit':
+        return (origin, destination, cache_mode,
+                result['transit_distance_km'], result['transit_duration_min'])
+    return (origin, destination, cache_mode, result['distance_km'], result['duration_min'])
+
+
+def _get_cached_route(
+    origin: Tuple[float, float],
+    destination: Tuple[float, float],
+    cache_mode: str,
+    result: Dict[str, Any]
+) -> bool:
+    """
+    Übernimmt gecachte Routendaten in ein Ergebnis.
+    
+    Returns:
+        True bei Cache Hit
+    """
+    cached = _route_cache.get(origin, destination, cache_mode)
+    if cached is None:
+        return False
+    
+    distance_km, duration_min = cached
+    if cache_mode == 'transit':
+        result['transit_distance_km'] = distance_km
+        result['transit_duration_min'] = duration_min
+        result['is_transit_estimated'] = True
+    else:
+        result['distance_km'] = distance_km
+        result['duration_min'] = duration_min
+    return True
+
+
 def calculate_route(
     origin: Tuple[float, float],
     destination: Tuple[float, float],
-    mode: str = "driving"
+    mode: str = "driving",
+    use_walking_proxy: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
     Berechnet Route und Distanz mit Caching.
     
+    Für Transit gibt es kein echtes Routing; standardmäßig wird ohne
+    Netzwerkzugriff aus der Luftlinie geschätzt.
+    
     Args:
         origin: Start-Koordinaten (lat, lon)
         destination: Ziel-Koordinaten (lat, lon)
         mode: Verkehrsmittel ('driving', 'transit', 'walking', 'cycling')
+        use_walking_proxy: Transit stattdessen aus einer OSRM-Zu-Fuß-Route schätzen
         
     Returns:
         Dictionary mit:
@@ -490,64 +1157,38 @@ def calculate_route(
             - 'transit_duration_min': Transit-Dauer (nur bei mode='transit')
             - 'is_transit_estimated': True wenn Transit-Zeit geschätzt wurde
     """
+    straight_line = None
     try:
         # Luftlinie berechnen (immer verfügbar)
-        straight_line = geodesic(origin, destination).kilometers
-        
-        result = {
-            'straight_line_km': round(straight_line, 2),
-            'distance_km': None,
-            'duration_min': None,
-            'transit_distance_km': None,
-            'transit_duration_min': None,
-            'is_transit_estimated': False
-        }
+        straight_line = straight_line_km(origin, destination)
+        result = _empty_route_result(straight_line)
         
         # Transit-Modus: Spezialbehandlung
-        if mode.lower() in ['transit', 'öpnv', 'public']:
-            return _calculate_transit_route(origin, destination, result)
-        
-        # Standard-Routing über OSRM (kostenlos, keine API-Key nötig)
-        # Unterstützt: car, bike, foot
-        osrm_mode = {
-            'driving': 'car',
-            'car': 'car',
-            'cycling': 'bike',
-            'bike': 'bike',
-            'walking': 'foot',
-            'foot': 'foot'
-        }.get(mode.lower(), 'car')
-        
-        url = f"http://router.project-osrm.org/route/v1/{osrm_mode}/{origin[1]},{origin[0]};{destination[1]},{destination[0]}"
-        params = {
-            'overview': 'false',
-            'steps': 'false'
-        }
+        if mode.lower() in _TRANSIT_MODES:
+            if use_walking_proxy:
+                return _calculate_transit_route(origin, destination, result)
+            return _apply_transit_estimate(result)
+        
+        cache_mode = _route_cache_mode(mode)
         
         # Prüfe Cache
-        cached_data = _request_cache.get(url, params)
-        if cached_data:
-            result['distance_km'] = cached_data.get('distance_km')
-            result['duration_min'] = cached_data.get('duration_min')
+        if _get_cached_route(origin, destination, cache_mode, result):
             return result
         
-        _geocoder._apply_rate_limit()  # Rate Limiting auch für OSRM-Requests anwenden
+        url = _osrm_route_url(cache_mode, origin, destination)
+        
+        _osrm_limiter.wait()
 
-        headers = {'User-Agent': _geocoder.user_agent}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = _http_session.get(url, params=_OSRM_ROUTE_PARAMS, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
             if data.get('code') == 'Ok' and data.get('routes'):
                 route = data['routes'][0]
-                result['distance_km'] = round(route['distance'] / 1000, 2)
-                result['duration_min'] = round(route['duration'] / 60, 1)
+                _apply_route(result, route['distance'], route['duration'])
                 
                 # Speichere im Cache
-                _request_cache.set(url, params, {
-                    'distance_km': result['distance_km'],
-                    'duration_min': result['duration_min']
-                })
+                _route_cache.set_many([_route_cache_entry(origin, destination, cache_mode, result)])
         else:
             _logger.warning(f"OSRM Routing fehlgeschlagen: {response.status_code}")
         
@@ -555,14 +1196,7 @@ def calculate_route(
         
     except Exception as e:
         _logger.error(f"Fehler bei Routing-Berechnung: {e}")
-        return {
-            'straight_line_km': round(straight_line, 2) if 'straight_line' in locals() else None,
-            'distance_km': None,
-            'duration_min': None,
-            'transit_distance_km': None,
-            'transit_duration_min': None,
-            'is_transit_estimated': False
-        }
+        return _empty_route_result(straight_line)
 
 
 def _calculate_transit_route(
@@ -586,61 +1220,241 @@ def _calculate_transit_route(
     try:
         # Versuche, echte Transit-Daten zu holen (z.B. von OSRM mit foot-Routing als Proxy)
         # OSRM unterstützt kein echtes Transit-Routing, daher verwenden wir Schätzung
-        url = f"http://router.project-osrm.org/route/v1/foot/{origin[1]},{origin[0]};{destination[1]},{destination[0]}"
-        params = {'overview': 'false', 'steps': 'false'}
-        
         # Prüfe Cache
-        cached_data = _request_cache.get(url, params)
-        if cached_data:
-            result['transit_distance_km'] = cached_data.get('transit_distance_km')
-            result['transit_duration_min'] = cached_data.get('transit_duration_min')
-            result['is_transit_estimated'] = cached_data.get('is_transit_estimated')
+        if _get_cached_route(origin, destination, 'transit', result):
             return result
         
-        _geocoder._apply_rate_limit()  # Rate Limiting auch für Transit-Proxy-Requests anwenden
+        url = _osrm_route_url('foot', origin, destination)
+        
+        _osrm_limiter.wait()
 
-        headers = {'User-Agent': _geocoder.user_agent}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = _http_session.get(url, params=_OSRM_ROUTE_PARAMS, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
             if data.get('code') == 'Ok' and data.get('routes'):
                 # Verwende Zu-Fuß-Route als ungefähre Basis für Transit
                 route = data['routes'][0]
-                # Transit ist typischerweise schneller als zu Fuß, aber mit Wartezeiten
-                # Schätzung: ~1.5x Zu-Fuß-Distanz, aber ~0.4x Zu-Fuß-Zeit (mit Wartezeiten)
-                result['transit_distance_km'] = round(route['distance'] / 1000 * 1.5, 2)
-                result['transit_duration_min'] = round(route['duration'] / 60 * 0.4, 1)
-                result['is_transit_estimated'] = True
+                _apply_transit_from_foot(result, route['distance'], route['duration'])
                 
                 # Speichere im Cache
-                _request_cache.set(url, params, {
-                    'transit_distance_km': result['transit_distance_km'],
-                    'transit_duration_min': result['transit_duration_min'],
-                    'is_transit_estimated': True
-                })
-                
-                _logger.debug(f"Transit-Fahrtzeit geschätzt: {result['transit_duration_min']}min")
+                _route_cache.set_many([_route_cache_entry(origin, destination, 'transit', result)])
                 return result
     except Exception as e:
         _logger.debug(f"Transit-Routing fehlgeschlagen, verwende Fallback-Schätzung: {e}")
     
-    # Fallback: Schätzung nur aus Luftlinie
-    # Durchschnittliche Busgeschwindigkeit: ~20 km/h (inklusive Wartezeiten, Haltestellen)
-    straight_line = result['straight_line_km']
-    if straight_line:
-        # Annahme: ÖPNV-Route ist 20% länger als Luftlinie
-        result['transit_distance_km'] = round(straight_line * 1.2, 2)
-        # Durchschnittliche ÖPNV-Geschwindigkeit: ~12 km/h (mit Wartezeiten)
-        result['transit_duration_min'] = round((straight_line * 1.2) / 12 * 60, 1)
-        result['is_transit_estimated'] = True
-        _logger.debug(f"Transit-Fahrtzeit aus Luftlinie geschätzt: {result['transit_duration_min']}min")
+    return _apply_transit_estimate(result)
+
+
+def _spread_bits(value: int) -> int:
+    """Verteilt die unteren 16 Bit auf jede zweite Bitposition (für die Z-Kurve)."""
+    value &= 0xFFFF
+    value = (value | (value << 8)) & 0x00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F
+    value = (value | (value << 2)) & 0x33333333
+    value = (value | (value << 1)) & 0x55555555
+    return value
+
+
+def _morton_key(point: Tuple[float, float]) -> int:
+    """
+    Berechnet den Morton-Code (Z-Kurve) einer Koordinate.
     
-    return result
+    Nahe beieinander liegende Punkte erhalten meist nahe beieinander liegende
+    Codes; das Raster hat 2^16 Zellen je Achse (~600 m).
+    
+    Args:
+        point: Koordinate (lat, lon)
+        
+    Returns:
+        Sortierschlüssel als Ganzzahl
+    """
+    lat, lon = point
+    x = int((lon + 180.0) * (0xFFFF / 360.0))
+    y = int((lat + 90.0) * (0xFFFF / 180.0))
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+def calculate_routes_bulk(
+    origins: List[Tuple[float, float]],
+    destination: Tuple[float, float],
+    mode: str = "driving",
+    on_progress: Optional[Callable[[int], None]] = None,
+    use_walking_proxy: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Berechnet Routen von vielen Startpunkten zu einem Ziel.
+    
+    Nicht gecachte Strecken werden blockweise über den OSRM-table-Dienst
+    abgefragt (eine Anfrage pro bis zu 99 Startpunkte statt einer pro
+    Startpunkt). Strecken, die der table-Dienst nicht liefert, werden
+    einzeln über calculate_route() berechnet. Die Ergebnisse landen im
+    selben Cache wie bei calculate_route().
+    
+    Args:
+        origins: Start-Koordinaten (lat, lon)
+        destination: Ziel-Koordinaten (lat, lon)
+        mode: Verkehrsmittel ('driving', 'transit', 'walking', 'cycling')
+        on_progress: Optionaler Callback, erhält die Anzahl fertig berechneter Startpunkte
+        use_walking_proxy: Transit aus OSRM-Zu-Fuß-Routen schätzen (siehe calculate_route())
+        
+    Returns:
+        Liste von Ergebnissen wie bei calculate_route(), in der Reihenfolge von origins
+    """
+    cache_mode = _route_cache_mode(mode)
+    transit = cache_mode == 'transit'
+    profile = 'foot' if transit else cache_mode
+    
+    straight_lines = straight_line_km_batch(origins, destination)
+    
+    # Transit-Schätzung aus der Luftlinie braucht weder Cache noch OSRM
+    if transit and not use_walking_proxy:
+        if on_progress and origins:
+            on_progress(len(origins))
+        return [
+            _apply_transit_estimate(_empty_route_result(straight_line))
+            for straight_line in straight_lines
+        ]
+    
+    results = []
+    pending = []  # Indizes ohne Cache-Eintrag
+    
+    for index, (origin, straight_line) in enumerate(zip(origins, straight_lines)):
+        result = _empty_route_result(straight_line)
+        results.append(result)
+        if not _get_cached_route(origin, destination, cache_mode, result):
+            pending.append(index)
+    
+    if on_progress and len(origins) > len(pending):
+        on_progress(len(origins) - len(pending))
+    
+    # Entlang der Z-Kurve sortieren, damit jeder table-Block räumlich
+    # beieinander liegende Startpunkte enthält
+    pending.sort(key=lambda index: _morton_key(origins[index]))
+    
+    chunk_size = _OSRM_TABLE_MAX_COORDS - 1  # Ein Platz für das Ziel
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        table = _fetch_osrm_table([origins[i] for i in chunk], destination, profile)
+        fallback = []
+        cache_entries = []
+        
+        for offset, index in enumerate(chunk):
+            origin = origins[index]
+            distance_m, duration_s = table[offset] if table else (None, None)
+            
+            if distance_m is None or duration_s is None:
+                fallback.append(index)
+                continue
+            
+            result = results[index]
+            if transit:
+                _apply_transit_from_foot(result, distance_m, duration_s)
+            else:
+                _apply_route(result, distance_m, duration_s)
+            cache_entries.append(_route_cache_entry(origin, destination, cache_mode, result))
+        
+        # Alle Routen des Blocks in einer Transaktion speichern
+        _route_cache.set_many(cache_entries)
+        
+        if fallback:
+            # Einzelabfragen als Fallback (nutzen Cache und Transit-Schätzung).
+            # Parallel, damit sich die Antwortzeiten überlappen; das OSRM-Limit
+            # wird weiterhin über _osrm_limiter eingehalten.
+            with ThreadPoolExecutor(max_workers=_ROUTE_FALLBACK_WORKERS) as executor:
+                routes = executor.map(
+                    lambda index: calculate_route(
+                        origins[index], destination, mode, use_walking_proxy
+                    ),
+                    fallback
+                )
+                for index, route in zip(fallback, routes):
+                    results[index] = route
+        
+        if on_progress:
+            on_progress(len(chunk))
+    
+    return results
+
+
+def _fetch_osrm_table(
+    origins: List[Tuple[float, float]],
+    destination: Tuple[float, float],
+    profile: str
+) -> Optional[List[Tuple[Optional[float], Optional[float]]]]:
+    """
+    Fragt Distanz und Dauer aller Startpunkte zum Ziel über den OSRM-table-Dienst ab.
+    
+    Args:
+        origins: Start-Koordinaten (lat, lon), maximal _OSRM_TABLE_MAX_COORDS - 1
+        destination: Ziel-Koordinaten (lat, lon)
+        profile: OSRM-Profil ('car', 'bike', 'foot')
+        
+    Returns:
+        Liste von (distance_m, duration_s) pro Startpunkt (None für nicht
+        routbare Punkte) oder None, wenn die Anfrage fehlschlägt
+    """
+    coords = ";".join(map(_osrm_coord, [*origins, destination]))
+    url = f"{_OSRM_BASE_URL}/table/v1/{profile}/{coords}"
+    params = {
+        'sources': ";".join(str(i) for i in range(len(origins))),
+        'destinations': str(len(origins)),
+        'annotations': 'distance,duration'
+    }
+    
+    try:
+        _osrm_limiter.wait()
+        
+        response = _http_session.get(url, params=params, timeout=30)
+        
+        if response.status_code != 200:
+            _logger.warning(f"OSRM table-Anfrage fehlgeschlagen: {response.status_code}")
+            return None
+        
+        data = response.json()
+        if data.get('code') != 'Ok':
+            _logger.warning(f"OSRM table-Anfrage fehlgeschlagen: {data.get('code')}")
+            return None
+        
+        distances = data.get('distances') or []
+        durations = data.get('durations') or []
+        return [
+            (
+                distances[i][0] if i < len(distances) else None,
+                durations[i][0] if i < len(durations) else None
+            )
+            for i in range(len(origins))
+        ]
+        
+    except Exception as e:
+        _logger.warning(f"Fehler bei OSRM table-Anfrage: {e}")
+        return None
+
+
+# Schreibpuffer für Exporte: wenige große write()-Aufrufe statt vieler kleiner
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# Trennlinien der TXT-Exporte
+_SEP_EQ = "=" * 80
+_SEP_DASH = "-" * 80
+
+# Dateiendung -> Exportformat; unbekannte Endungen werden als Text exportiert
+_EXPORT_FORMATS = {
+    'txt': 'txt',
+    'csv': 'csv',
+    'json': 'json',
+    'ndjson': 'ndjson',
+    'jsonl': 'ndjson',
+}
+
+
+def _export_format(path: Path) -> str:
+    """Leitet das Exportformat aus der Dateiendung ab."""
+    return _EXPORT_FORMATS.get(path.suffix.lstrip('.').lower(), 'txt')
 
 
 def export_listings(
-    listings: List[Dict[str, Any]],
+    listings: Iterable[Dict[str, Any]],
     output_path: str,
     format_type: Optional[str] = None,
     verbose: int = 0,
@@ -648,10 +1462,14 @@ def export_listings(
     """
     Exportiert Listings in eine Datei.
     
+    JSON, NDJSON und CSV werden zeilenweise geschrieben, ein Generator (z.B. aus
+    Database.iter_listings) wird also nie vollständig im Speicher gehalten.
+    
     Args:
-        listings: Liste von Listing-Dictionaries
+        listings: Listing-Dictionaries (Liste oder Generator)
         output_path: Pfad zur Ausgabe-Datei
-        format_type: Format ('txt', 'csv', 'json'). Wenn None, wird aus Dateiendung abgeleitet.
+        format_type: Format ('txt', 'csv', 'json', 'ndjson'). Wenn None, wird aus
+            Dateiendung abgeleitet (.jsonl gilt als NDJSON).
         
     Returns:
         True bei Erfolg, False bei Fehler
@@ -661,13 +1479,13 @@ def export_listings(
         
         # Format aus Dateiendung ableiten wenn nicht angegeben
         if format_type is None:
-            format_type = path.suffix.lstrip('.').lower()
-            if format_type not in ['txt', 'csv', 'json']:
-                format_type = 'txt'
+            format_type = _export_format(path)
         
         # Je nach Format exportieren
         if format_type == 'json':
             return _export_json(listings, path, verbose)
+        elif format_type == 'ndjson':
+            return _export_ndjson(listings, path, verbose)
         elif format_type == 'csv':
             return _export_csv(listings, path, verbose)
         else:  # txt
@@ -678,12 +1496,38 @@ def export_listings(
         return False
 
 
-def _export_json(listings: List[Dict[str, Any]], path: Path, verbose: int) -> bool:
+def _as_sequence(items: Iterable[Any]) -> Sequence[Any]:
+    """Gibt Listen unverändert zurück; Generatoren werden materialisiert."""
+    return items if hasattr(items, '__len__') else list(items)
+
+
+def _write_json_array(f, items: Iterable[Any], level: int = 0) -> None:
+    """
+    Schreibt ein JSON-Array Element für Element in eine Datei.
+    
+    Die Ausgabe entspricht json.dump(..., indent=2) für ein Array auf der
+    Verschachtelungstiefe level.
+    
+    Args:
+        f: Geöffnete Text-Datei
+        items: JSON-serialisierbare Elemente
+        level: Einrückungstiefe des Arrays
+    """
+    indent = "  " * (level + 1)
+    first = True
+    for item in items:
+        f.write("[\n" if first else ",\n")
+        first = False
+        text = _json_dumps_pretty(item)
+        f.write(indent + text.replace("\n", "\n" + indent))
+    f.write("[]" if first else "\n" + "  " * level + "]")
+
+
+def _export_json(listings: Iterable[Dict[str, Any]], path: Path, verbose: int) -> bool:
     """Exportiert als JSON."""
     try:
-        filtered = [_filter_listing_fields(listing, verbose) for listing in listings]
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(filtered, f, indent=2, ensure_ascii=False, default=str)
+        with open(path, 'w', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as f:
+            _write_json_array(f, (_filter_listing_fields(listing, verbose) for listing in listings))
         _logger.info(f"JSON exportiert nach: {path}")
         return True
     except Exception as e:
@@ -691,28 +1535,40 @@ def _export_json(listings: List[Dict[str, Any]], path: Path, verbose: int) -> bo
         return False
 
 
-def _export_csv(listings: List[Dict[str, Any]], path: Path, verbose: int) -> bool:
+def _write_ndjson(path: Path, items: Iterable[Any]) -> None:
+    """Schreibt ein kompaktes JSON-Objekt pro Zeile (NDJSON)."""
+    with open(path, 'wb', buffering=_EXPORT_BUFFER_SIZE) as f:
+        f.writelines(_json_dumps_bytes(item, default=str) + b"\n" for item in items)
+
+
+def _export_ndjson(listings: Iterable[Dict[str, Any]], path: Path, verbose: int) -> bool:
+    """Exportiert als NDJSON (eine Anzeige pro Zeile, z.B. für jq oder DuckDB)."""
+    try:
+        _write_ndjson(path, (_filter_listing_fields(listing, verbose) for listing in listings))
+        _logger.info(f"NDJSON exportiert nach: {path}")
+        return True
+    except Exception as e:
+        _logger.error(f"NDJSON-Export fehlgeschlagen: {e}")
+        return False
+
+
+def _export_csv(listings: Iterable[Dict[str, Any]], path: Path, verbose: int) -> bool:
     """Exportiert als CSV mit zusätzlichem Stadt-Feld."""
     try:
-        if not listings:
+        listings = iter(listings)
+        first = next(listings, None)
+        if first is None:
             return False
 
-        filtered = [_filter_listing_fields(listing, verbose) for listing in listings]
-        fieldnames = _listing_field_order(verbose)
-        
-        # Füge Stadt-Feld nach 'city' ein (nur für CSV-Export sichtbar)
-        if 'city' in fieldnames:
-            city_index = fieldnames.index('city')
-            fieldnames.insert(city_index + 1, 'listing_city')
+        header, keys = _csv_listing_columns(verbose)
         
-        # Extrahiere Stadt aus jedem Listing und füge es als 'listing_city' hinzu
-        for listing in filtered:
-            listing['listing_city'] = listing.get('city', '')  # Stadt seperiert für CSV
-        
-        with open(path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(filtered)
+        with open(path, 'w', encoding='utf-8', newline='', buffering=_EXPORT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(
+                [listing.get(key) for key in keys]
+                for listing in chain((first,), listings)
+            )
         
         _logger.info(f"CSV exportiert nach: {path}")
         return True
@@ -721,81 +1577,20 @@ def _export_csv(listings: List[Dict[str, Any]], path: Path, verbose: int) -> boo
         return False
 
 
-def _export_txt(listings: List[Dict[str, Any]], path: Path, verbose: int) -> bool:
+def _export_txt(listings: Iterable[Dict[str, Any]], path: Path, verbose: int) -> bool:
     """Exportiert als Text (lesbar)."""
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write(f"WG-Gesucht Scraper Export\n")
-            f.write(f"Anzahl Anzeigen: {len(listings)}\n")
-            f.write("="*80 + "\n\n")
-            
+        # Die Kopfzeile enthält die Anzahl, daher wird hier eine Liste benötigt
+        listings = _as_sequence(listings)
+        with open(path, 'w', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as f:
+            f.write(
+                f"{_SEP_EQ}\n"
+                f"WG-Gesucht Scraper Export\n"
+                f"Anzahl Anzeigen: {len(listings)}\n"
+                f"{_SEP_EQ}\n\n"
+            )
             for i, listing in enumerate(listings, 1):
-                f.write(f"{i}. {listing.get('title', 'N/A')}\n")
-                f.write(f"   Stadt: {listing.get('city', 'N/A')}")
-                if listing.get('district'):
-                    f.write(f" ({listing['district']})")
-                f.write("\n")
-
-                f.write(f"   Größe: {listing.get('size', 'N/A')} m² | ")
-                f.write(f"Miete: {listing.get('rent', 'N/A')} €\n")
-                f.write(f"   Verfügbar ab: {listing.get('available_from', 'N/A')}\n")
-
-                if listing.get('price_per_sqm') is not None:
-                    f.write(f"   Preis pro m2: {listing.get('price_per_sqm')} €")
-                    if listing.get('avg_ppm_diff') is not None:
-                        f.write(f" | Delta avg/m2: {listing.get('avg_ppm_diff')} €")
-                    if listing.get('rent_index_diff') is not None:
-                        f.write(f" | Delta Mietspiegel: {listing.get('rent_index_diff')} €")
-                    f.write("\n")
-
-                if verbose >= 1:
-                    if listing.get('available_until'):
-                        f.write(f"   Verfügbar bis: {listing.get('available_until', 'N/A')}\n")
-
-                    if listing.get('flatmates'):
-                        detail_parts = []
-                        if listing.get('flatmates_female') is not None:
-                            detail_parts.append(f"{listing['flatmates_female']}w")
-                        if listing.get('flatmates_male') is not None:
-                            detail_parts.append(f"{listing['flatmates_male']}m")
-                        if listing.get('flatmates_diverse') is not None:
-                            detail_parts.append(f"{listing['flatmates_diverse']}d")
-                        if listing.get('rooms_free') is not None:
-                            detail_parts.append(f"{listing['rooms_free']} frei")
-                        if listing.get('flatmate_details') and not detail_parts:
-                            detail_parts.append(listing['flatmate_details'])
-
-                        f.write(f"   WG-Größe: {listing['flatmates']}er WG")
-                        if detail_parts:
-                            f.write(f" ({', '.join(detail_parts)})")
-                        f.write("\n")
-
-                    if listing.get('room_type'):
-                        f.write(f"   Zimmerart: {listing.get('room_type', 'N/A')}\n")
-
-                    if listing.get('online_since'):
-                        f.write(f"   Online seit: {listing.get('online_since', 'N/A')}\n")
-
-                if verbose >= 2:
-                    if listing.get('description'):
-                        desc = listing['description']
-                        if len(desc) > 200:
-                            desc = desc[:200] + "..."
-                        f.write(f"   Beschreibung: {desc}\n")
-
-                    if listing.get('features'):
-                        f.write(f"   Features: {listing.get('features', 'N/A')}\n")
-
-                    if listing.get('contact_name'):
-                        f.write(f"   Kontakt: {listing.get('contact_name', 'N/A')}\n")
-
-                    f.write(f"   DB-ID: {listing.get('id', 'N/A')} | Listing-ID: {listing.get('listing_id', 'N/A')}\n")
-                    f.write(f"   Gescrapt am: {listing.get('scraped_at', 'N/A')}\n")
-                    f.write(f"   Erstellt am: {listing.get('created_at', 'N/A')}\n")
-
-                f.write(f"   URL: {listing.get('url', 'N/A')}\n")
-                f.write("-"*80 + "\n\n")
+                f.write(_format_txt_listing(i, listing, verbose))
         
         _logger.info(f"TXT exportiert nach: {path}")
         return True
@@ -804,8 +1599,123 @@ def _export_txt(listings: List[Dict[str, Any]], path: Path, verbose: int) -> boo
         return False
 
 
+def _format_txt_listing(index: int, listing: Dict[str, Any], verbose: int) -> str:
+    """Formatiert eine Anzeige als Textblock für den TXT-Export."""
+    get = listing.get
+    district = get('district')
+
+    lines = [
+        f"{index}. {get('title', 'N/A')}",
+        f"   Stadt: {get('city', 'N/A')}" + (f" ({district})" if district else ""),
+        f"   Größe: {get('size', 'N/A')} m² | Miete: {get('rent', 'N/A')} €",
+        f"   Verfügbar ab: {get('available_from', 'N/A')}",
+    ]
+    _append_ppm_line(lines, listing)
+
+    if verbose >= 1:
+        if get('available_until'):
+            lines.append(f"   Verfügbar bis: {get('available_until')}")
+        _append_detail_lines(lines, listing)
+
+    return _finish_txt_block(lines, listing, verbose)
+
+
+def _finish_txt_block(lines: List[str], listing: Dict[str, Any], verbose: int) -> str:
+    """
+    Schließt einen Textblock des TXT-Exports ab (Anzeigen und Routen).
+    
+    Hängt ab -vv die Metadaten an, danach URL und Trennlinie, und gibt den
+    Block als einen String zurück, der mit einem write() geschrieben wird.
+    """
+    if verbose >= 2:
+        _append_meta_lines(lines, listing)
+
+    lines.append(f"   URL: {listing.get('url', 'N/A')}")
+    lines.append(_SEP_DASH)
+    return "\n".join(lines) + "\n\n"
+
+
+def _append_ppm_line(lines: List[str], listing: Dict[str, Any]) -> None:
+    """Hängt die Zeile mit Preis pro m² und den Abweichungen an (falls vorhanden)."""
+    price_per_sqm = listing.get('price_per_sqm')
+    if price_per_sqm is None:
+        return
+    avg_ppm_diff = listing.get('avg_ppm_diff')
+    rent_index_diff = listing.get('rent_index_diff')
+    lines.append(
+        f"   Preis pro m2: {price_per_sqm} €"
+        + (f" | Delta avg/m2: {avg_ppm_diff} €" if avg_ppm_diff is not None else "")
+        + (f" | Delta Mietspiegel: {rent_index_diff} €" if rent_index_diff is not None else "")
+    )
+
+
+def _format_flatmates(listing: Dict[str, Any]) -> str:
+    """
+    Formatiert die WG-Größe inklusive Aufteilung, z.B. "3er WG (1w, 1m, 1 frei)".
+    
+    Die Freitext-Details werden nur verwendet, wenn keine Einzelangaben vorliegen.
+    """
+    get = listing.get
+    female = get('flatmates_female')
+    male = get('flatmates_male')
+    diverse = get('flatmates_diverse')
+    rooms_free = get('rooms_free')
+    
+    parts = []
+    if female is not None:
+        parts.append(f"{female}w")
+    if male is not None:
+        parts.append(f"{male}m")
+    if diverse is not None:
+        parts.append(f"{diverse}d")
+    if rooms_free is not None:
+        parts.append(f"{rooms_free} frei")
+    if not parts:
+        details = get('flatmate_details')
+        if details:
+            parts.append(details)
+    
+    text = f"{get('flatmates')}er WG"
+    return f"{text} ({', '.join(parts)})" if parts else text
+
+
+def _append_detail_lines(lines: List[str], listing: Dict[str, Any]) -> None:
+    """Hängt WG-Größe, Zimmerart und Online-Datum an (ab -v)."""
+    get = listing.get
+    if get('flatmates'):
+        lines.append(f"   WG-Größe: {_format_flatmates(listing)}")
+
+    room_type = get('room_type')
+    if room_type:
+        lines.append(f"   Zimmerart: {room_type}")
+
+    online_since = get('online_since')
+    if online_since:
+        lines.append(f"   Online seit: {online_since}")
+
+
+def _append_meta_lines(lines: List[str], listing: Dict[str, Any]) -> None:
+    """Hängt Beschreibung, Features, Kontakt und DB-Metadaten an (ab -vv)."""
+    get = listing.get
+    desc = get('description')
+    if desc:
+        if len(desc) > 200:
+            desc = desc[:200] + "..."
+        lines.append(f"   Beschreibung: {desc}")
+
+    if get('features'):
+        lines.append(f"   Features: {get('features')}")
+
+    if get('contact_name'):
+        lines.append(f"   Kontakt: {get('contact_name')}")
+
+    lines.append(f"   DB-ID: {get('id', 'N/A')} | Listing-ID: {get('listing_id', 'N/A')}")
+    lines.append(f"   Gescrapt am: {get('scraped_at', 'N/A')}")
+    lines.append(f"   Erstellt am: {get('created_at', 'N/A')}")
+
+
 def export_routes(
-    results: List[Dict[str, Any]],
+    results: Iterable[Dict[str, Any]],
     output_path: str,
     destination: str,
     mode: str,
@@ -816,11 +1726,11 @@ def export_routes(
     Exportiert Routen-Ergebnisse in eine Datei.
     
     Args:
-        results: Liste von Results mit 'listing' und 'route' Keys
+        results: Results mit 'listing' und 'route' Keys (Liste oder Generator)
         output_path: Pfad zur Ausgabe-Datei
         destination: Ziel-Adresse
         mode: Verkehrsmittel
-        format_type: Format ('txt', 'csv', 'json')
+        format_type: Format ('txt', 'csv', 'json', 'ndjson')
         
     Returns:
         True bei Erfolg
@@ -829,12 +1739,12 @@ def export_routes(
         path = Path(output_path)
         
         if format_type is None:
-            format_type = path.suffix.lstrip('.').lower()
-            if format_type not in ['txt', 'csv', 'json']:
-                format_type = 'txt'
+            format_type = _export_format(path)
         
         if format_type == 'json':
             return _export_routes_json(results, path, destination, mode, verbose)
+        elif format_type == 'ndjson':
+            return _export_routes_ndjson(results, path, destination, mode, verbose)
         elif format_type == 'csv':
             return _export_routes_csv(results, path, destination, mode, verbose)
         else:
@@ -846,7 +1756,7 @@ def export_routes(
 
 
 def _export_routes_json(
-    results: List[Dict[str, Any]],
+    results: Iterable[Dict[str, Any]],
     path: Path,
     destination: str,
     mode: str,
@@ -854,22 +1764,23 @@ def _export_routes_json(
 ) -> bool:
     """Exportiert Routen als JSON."""
     try:
-        filtered_results = []
-        for result in results:
-            filtered_results.append({
-                'listing': _filter_listing_fields(result['listing'], verbose),
-                'route': result['route']
-            })
+        # 'count' steht vor den Ergebnissen, daher wird hier eine Liste benötigt
+        results = _as_sequence(results)
+        header = _json_dumps_pretty(
+            {'destination': destination, 'mode': mode, 'count': len(results)}
+        )
 
-        export_data = {
-            'destination': destination,
-            'mode': mode,
-            'count': len(results),
-            'results': filtered_results
-        }
-        
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
+        with open(path, 'w', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as f:
+            # Schließende Klammer abtrennen und die Ergebnisse einzeln anhängen
+            f.write(header[:-2] + ',\n  "results": ')
+            _write_json_array(f, (
+                {
+                    'listing': _filter_listing_fields(result['listing'], verbose),
+                    'route': result['route']
+                }
+                for result in results
+            ), level=1)
+            f.write("\n}")
         
         _logger.info(f"Routen-JSON exportiert nach: {path}")
         return True
@@ -878,8 +1789,33 @@ def _export_routes_json(
         return False
 
 
+def _export_routes_ndjson(
+    results: Iterable[Dict[str, Any]],
+    path: Path,
+    destination: str,
+    mode: str,
+    verbose: int,
+) -> bool:
+    """Exportiert Routen als NDJSON; jede Zeile enthält Ziel und Modus mit."""
+    try:
+        _write_ndjson(path, (
+            {
+                'destination': destination,
+                'mode': mode,
+                'listing': _filter_listing_fields(result['listing'], verbose),
+                'route': result['route']
+            }
+            for result in results
+        ))
+        _logger.info(f"Routen-NDJSON exportiert nach: {path}")
+        return True
+    except Exception as e:
+        _logger.error(f"Routen-NDJSON-Export fehlgeschlagen: {e}")
+        return False
+
+
 def _export_routes_csv(
-    results: List[Dict[str, Any]],
+    results: Iterable[Dict[str, Any]],
     path: Path,
     destination: str,
     mode: str,
@@ -887,37 +1823,19 @@ def _export_routes_csv(
 ) -> bool:
     """Exportiert Routen als CSV mit zusätzlichem Stadt-Feld."""
     try:
-        with open(path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = list(_route_field_order(verbose))
-            
-            # Füge Stadt-Feld nach 'city' ein (nur für CSV-Export sichtbar)
-            if 'city' in fieldnames:
-                city_index = fieldnames.index('city')
-                fieldnames.insert(city_index + 1, 'listing_city')
-            
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        header, keys = _csv_listing_columns(verbose)
+        
+        with open(path, 'w', encoding='utf-8', newline='', buffering=_EXPORT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(header + _ROUTE_FIELDS)
             
             for result in results:
-                listing = result['listing']
-                route = result['route']
-                
-                filtered = _filter_listing_fields(listing, verbose)
-                row = dict(filtered)
-                
-                # Füge Stadt-Feld seperat ein
-                row['listing_city'] = filtered.get('city', '')
-                
-                row.update({
-                    'straight_line_km': route.get('straight_line_km', ''),
-                    'distance_km': route.get('distance_km', ''),
-                    'duration_min': route.get('duration_min', ''),
-                    'transit_distance_km': route.get('transit_distance_km', ''),
-                    'transit_duration_min': route.get('transit_duration_min', ''),
-                    'is_transit_estimated': route.get('is_transit_estimated', '')
-                })
-                
-                writer.writerow(row)
+                listing_get = result['listing'].get
+                route_get = result['route'].get
+                writer.writerow(
+                    [listing_get(key) for key in keys]
+                    + [route_get(key, '') for key in _ROUTE_FIELDS]
+                )
         
         _logger.info(f"Routen-CSV exportiert nach: {path}")
         return True
@@ -927,7 +1845,7 @@ def _export_routes_csv(
 
 
 def _export_routes_txt(
-    results: List[Dict[str, Any]],
+    results: Iterable[Dict[str, Any]],
     path: Path,
     destination: str,
     mode: str,
@@ -935,101 +1853,18 @@ def _export_routes_txt(
 ) -> bool:
     """Exportiert Routen als Text."""
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write(f"WG-Gesucht Scraper - Routen-Analyse\n")
-            f.write(f"Ziel: {destination}\n")
-            f.write(f"Verkehrsmittel: {mode}\n")
-            f.write(f"Anzahl Ergebnisse: {len(results)}\n")
-            f.write("="*80 + "\n\n")
-            
+        results = _as_sequence(results)
+        with open(path, 'w', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as f:
+            f.write(
+                f"{_SEP_EQ}\n"
+                f"WG-Gesucht Scraper - Routen-Analyse\n"
+                f"Ziel: {destination}\n"
+                f"Verkehrsmittel: {mode}\n"
+                f"Anzahl Ergebnisse: {len(results)}\n"
+                f"{_SEP_EQ}\n\n"
+            )
             for i, result in enumerate(results, 1):
-                listing = result['listing']
-                route = result['route']
-
-                f.write(f"{i}. {listing.get('title', 'N/A')}\n")
-                f.write(f"   {listing.get('city', 'N/A')}")
-                if listing.get('district'):
-                    f.write(f" - {listing['district']}")
-                f.write("\n")
-
-                f.write(f"   Miete: {listing.get('rent', 'N/A')} € | ")
-                f.write(f"Größe: {listing.get('size', 'N/A')} m²\n")
-
-                if listing.get('price_per_sqm') is not None:
-                    f.write(f"   Preis pro m2: {listing.get('price_per_sqm')} €")
-                    if listing.get('avg_ppm_diff') is not None:
-                        f.write(f" | Delta avg/m2: {listing.get('avg_ppm_diff')} €")
-                    if listing.get('rent_index_diff') is not None:
-                        f.write(f" | Delta Mietspiegel: {listing.get('rent_index_diff')} €")
-                    f.write("\n")
-
-                f.write(f"   Luftlinie: {route['straight_line_km']} km")
-                if route['distance_km']:
-                    f.write(f" | {mode.title()}: {route['distance_km']} km")
-                if route['duration_min']:
-                    f.write(f" (~{route['duration_min']} min)")
-                f.write("\n")
-                
-                # Zusätzliche Transit-Informationen wenn verfügbar
-                if route.get('transit_distance_km'):
-                    f.write(f"   Transit: {route['transit_distance_km']} km")
-                    if route['transit_duration_min']:
-                        f.write(f" (~{route['transit_duration_min']} min)")
-                    if route.get('is_transit_estimated'):
-                        f.write(" [geschätzt]")
-                    f.write("\n")
-
-                if verbose >= 1:
-                    if listing.get('available_from'):
-                        f.write(f"   Verfügbar ab: {listing.get('available_from', 'N/A')}")
-                        if listing.get('available_until'):
-                            f.write(f" bis {listing.get('available_until', 'N/A')}")
-                        f.write("\n")
-
-                    if listing.get('flatmates'):
-                        detail_parts = []
-                        if listing.get('flatmates_female') is not None:
-                            detail_parts.append(f"{listing['flatmates_female']}w")
-                        if listing.get('flatmates_male') is not None:
-                            detail_parts.append(f"{listing['flatmates_male']}m")
-                        if listing.get('flatmates_diverse') is not None:
-                            detail_parts.append(f"{listing['flatmates_diverse']}d")
-                        if listing.get('rooms_free') is not None:
-                            detail_parts.append(f"{listing['rooms_free']} frei")
-                        if listing.get('flatmate_details') and not detail_parts:
-                            detail_parts.append(listing['flatmate_details'])
-
-                        f.write(f"   WG-Größe: {listing['flatmates']}er WG")
-                        if detail_parts:
-                            f.write(f" ({', '.join(detail_parts)})")
-                        f.write("\n")
-
-                    if listing.get('room_type'):
-                        f.write(f"   Zimmerart: {listing.get('room_type', 'N/A')}\n")
-
-                    if listing.get('online_since'):
-                        f.write(f"   Online seit: {listing.get('online_since', 'N/A')}\n")
-
-                if verbose >= 2:
-                    if listing.get('description'):
-                        desc = listing['description']
-                        if len(desc) > 200:
-                            desc = desc[:200] + "..."
-                        f.write(f"   Beschreibung: {desc}\n")
-
-                    if listing.get('features'):
-                        f.write(f"   Features: {listing.get('features', 'N/A')}\n")
-
-                    if listing.get('contact_name'):
-                        f.write(f"   Kontakt: {listing.get('contact_name', 'N/A')}\n")
-
-                    f.write(f"   DB-ID: {listing.get('id', 'N/A')} | Listing-ID: {listing.get('listing_id', 'N/A')}\n")
-                    f.write(f"   Gescrapt am: {listing.get('scraped_at', 'N/A')}\n")
-                    f.write(f"   Erstellt am: {listing.get('created_at', 'N/A')}\n")
-
-                f.write(f"   URL: {listing.get('url', 'N/A')}\n")
-                f.write("-"*80 + "\n\n")
+                f.write(_format_txt_route(i, result['listing'], result['route'], mode, verbose))
         
         _logger.info(f"Routen-TXT exportiert nach: {path}")
         return True
@@ -1038,84 +1873,119 @@ def _export_routes_txt(
         return False
 
 
-def _listing_field_order(verbose: int) -> List[str]:
-    """Definiert die Spaltenreihenfolge fuer Listing-Exports."""
-    base_fields = [
-        'title', 'city', 'district', 'size', 'rent', 'available_from', 'url',
-        'price_per_sqm', 'avg_ppm_diff', 'rent_index_diff'
+def _format_txt_route(
+    index: int,
+    listing: Dict[str, Any],
+    route: Dict[str, Any],
+    mode: str,
+    verbose: int,
+) -> str:
+    """Formatiert eine Anzeige mit Routen-Daten als Textblock für den TXT-Export."""
+    get = listing.get
+    district = get('district')
+    distance_km = route['distance_km']
+    duration_min = route['duration_min']
+
+    lines = [
+        f"{index}. {get('title', 'N/A')}",
+        f"   {get('city', 'N/A')}" + (f" - {district}" if district else ""),
+        f"   Miete: {get('rent', 'N/A')} € | Größe: {get('size', 'N/A')} m²",
     ]
+    _append_ppm_line(lines, listing)
+
+    lines.append(
+        f"   Luftlinie: {route['straight_line_km']} km"
+        + (f" | {mode.title()}: {distance_km} km" if distance_km else "")
+        + (f" (~{duration_min} min)" if duration_min else "")
+    )
+
+    # Zusätzliche Transit-Informationen wenn verfügbar
+    transit_distance_km = route.get('transit_distance_km')
+    if transit_distance_km:
+        transit_duration_min = route['transit_duration_min']
+        lines.append(
+            f"   Transit: {transit_distance_km} km"
+            + (f" (~{transit_duration_min} min)" if transit_duration_min else "")
+            + (" [geschätzt]" if route.get('is_transit_estimated') else "")
+        )
 
-    detail_fields = [
-        'available_until', 'flatmates', 'flatmate_details', 'flatmates_female',
-        'flatmates_male', 'flatmates_diverse', 'rooms_free', 'room_type', 'online_since'
-    ]
+    if verbose >= 1:
+        available_from = get('available_from')
+        if available_from:
+            available_until = get('available_until')
+            lines.append(
+                f"   Verfügbar ab: {available_from}"
+                + (f" bis {available_until}" if available_until else "")
+            )
+        _append_detail_lines(lines, listing)
 
-    meta_fields = [
-        'description', 'features', 'contact_name', 'images',
-        'id', 'listing_id', 'scraped_at', 'created_at'
-    ]
+    return _finish_txt_block(lines, listing, verbose)
 
-    fields = list(base_fields)
+
+# Listing-Felder je Verbosity-Stufe (Reihenfolge = Spalten-/Schlüsselreihenfolge)
+_BASE_FIELDS = (
+    'title', 'city', 'district', 'size', 'rent', 'available_from', 'url',
+    'price_per_sqm', 'avg_ppm_diff', 'rent_index_diff'
+)
+
+_DETAIL_FIELDS = (
+    'available_until', 'flatmates', 'flatmate_details', 'flatmates_female',
+    'flatmates_male', 'flatmates_diverse', 'rooms_free', 'room_type', 'online_since'
+)
+
+_META_FIELDS = (
+    'description', 'features', 'contact_name', 'images',
+    'id', 'listing_id', 'scraped_at', 'created_at'
+)
+
+
+@lru_cache(maxsize=8)
+def _listing_field_order(verbose: int) -> Tuple[str, ...]:
+    """Definiert die Spaltenreihenfolge fuer Listing-Exports."""
+    fields = _BASE_FIELDS
     if verbose >= 1:
-        fields.extend(detail_fields)
+        fields += _DETAIL_FIELDS
     if verbose >= 2:
-        fields.extend(meta_fields)
+        fields += _META_FIELDS
     return fields
 
 
-def _route_field_order(verbose: int) -> List[str]:
-    """Definiert die Spaltenreihenfolge fuer Routen-CSV-Export."""
-    fields = _listing_field_order(verbose)
-    # Getrennte Felder für Luftlinie, Standard-Routing und Transit
-    fields.extend([
-        'straight_line_km', 
-        'distance_km', 
-        'duration_min',
-        'transit_distance_km',
-        'transit_duration_min',
-        'is_transit_estimated'
-    ])
-    return fields
+# Routen-Spalten im CSV-Export (nach den Listing-Spalten): getrennte Felder
+# für Luftlinie, Standard-Routing und Transit
+_ROUTE_FIELDS = (
+    'straight_line_km',
+    'distance_km',
+    'duration_min',
+    'transit_distance_km',
+    'transit_duration_min',
+    'is_transit_estimated'
+)
 
 
-def _filter_listing_fields(listing: Dict[str, Any], verbose: int) -> Dict[str, Any]:
-    """Reduziert Listing-Felder basierend auf Verbosity-Level."""
-    filtered = {
-        'title': listing.get('title'),
-        'city': listing.get('city'),
-        'district': listing.get('district'),
-        'size': listing.get('size'),
-        'rent': listing.get('rent'),
-        'available_from': listing.get('available_from'),
-        'url': listing.get('url'),
-        'price_per_sqm': listing.get('price_per_sqm'),
-        'avg_ppm_diff': listing.get('avg_ppm_diff'),
-        'rent_index_diff': listing.get('rent_index_diff')
-    }
+@lru_cache(maxsize=8)
+def _csv_listing_columns(verbose: int) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Gibt Spaltennamen und Quell-Schlüssel der Listing-Spalten im CSV-Export zurück.
+    
+    Nach 'city' folgt die nur im CSV sichtbare Spalte 'listing_city', die
+    ebenfalls aus 'city' befüllt wird.
+    
+    Args:
+        verbose: Verbosity-Level
+        
+    Returns:
+        Tuple (Spaltennamen, Listing-Schlüssel je Spalte)
+    """
+    header = []
+    for field in _listing_field_order(verbose):
+        header.append(field)
+        if field == 'city':
+            header.append('listing_city')
+    keys = tuple('city' if field == 'listing_city' else field for field in header)
+    return tuple(header), keys
 
-    if verbose >= 1:
-        filtered.update({
-            'available_until': listing.get('available_until'),
-            'flatmates': listing.get('flatmates'),
-            'flatmate_details': listing.get('flatmate_details'),
-            'flatmates_female': listing.get('flatmates_female'),
-            'flatmates_male': listing.get('flatmates_male'),
-            'flatmates_diverse': listing.get('flatmates_diverse'),
-            'rooms_free': listing.get('rooms_free'),
-            'room_type': listing.get('room_type'),
-            'online_since': listing.get('online_since')
-        })
 
-    if verbose >= 2:
-        filtered.update({
-            'description': listing.get('description'),
-            'features': listing.get('features'),
-            'contact_name': listing.get('contact_name'),
-            'images': listing.get('images'),
-            'id': listing.get('id'),
-            'listing_id': listing.get('listing_id'),
-            'scraped_at': listing.get('scraped_at'),
-            'created_at': listing.get('created_at')
-        })
-
-    return filtered
+def _filter_listing_fields(listing: Dict[str, Any], verbose: int) -> Dict[str, Any]:
+    """Reduziert Listing-Felder basierend auf Verbosity-Level."""
+    get = listing.get
+    return {field: get(field) for field in _listing_field_order(verbose)}
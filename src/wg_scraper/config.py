@@ -30,6 +30,15 @@ REQUEST_TIMEOUT = 30
 # Maximale Anzahl Retry-Versuche bei fehlgeschlagenen Requests
 MAX_RETRIES = 3
 
+# Basis für exponentielles Backoff zwischen Retry-Versuchen (in Sekunden)
+RETRY_BACKOFF_FACTOR = 0.5
+
+# HTTP-Statuscodes, bei denen ein Request wiederholt wird
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Maximale Anzahl offener Keep-Alive-Verbindungen pro Host
+POOL_SIZE = 10
+
 # Logging-Konfiguration
 LOG_FORMAT = "[%(asctime)s] %(levelname)s:%(name)s:%(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
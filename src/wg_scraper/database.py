@@ -4,15 +4,163 @@ Datenbank-Modul für die Speicherung von WG-Anzeigen.
 Verwendet SQLite für die lokale Datenspeicherung.
 """
 
+import json
 import logging
 import sqlite3
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 
 from wg_scraper.models import WGListing
 
 _logger = logging.getLogger(__name__)
 
+# Performance-Einstellungen, die für jede neue Verbindung gesetzt werden.
+# synchronous=NORMAL ist im WAL-Modus sicher und spart ein fsync pro Commit.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",      # 64 MiB Page-Cache
+    "PRAGMA mmap_size=268435456",    # 256 MiB Memory-Mapped I/O
+    "PRAGMA analysis_limit=1000",    # ANALYZE/optimize nur auf Stichproben
+)
+
+# Größe des Statement-Caches von sqlite3 pro Verbindung (Standard: 128).
+# iter_listings erzeugt je Filter-/Sortier-Kombination eigenen SQL-Text,
+# daher etwas mehr Platz, damit häufige Abfragen nicht neu kompiliert werden.
+_CACHED_STATEMENTS = 256
+
+# Einheitliches INSERT für Einzel- und Block-Speicherung. sqlite3 cached
+# vorbereitete Statements pro Verbindung anhand des SQL-Texts, daher wird
+# dieser String bei jedem Aufruf wiederverwendet statt neu aufgebaut.
+# Positionale Platzhalter in der Reihenfolge von _listing_row().
+_INSERT_LISTING_SQL = """
+    INSERT OR IGNORE INTO listings (
+        listing_id, url, title, city, district, size, rent,
+        available_from, available_until, room_type, online_since,
+        description, flatmates, flatmate_details, flatmates_female,
+        flatmates_male, flatmates_diverse, rooms_free, features,
+        images, contact_name, scraped_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Anzahl Zeilen pro fetchmany()-Aufruf beim Lesen von Listings
+_FETCH_BATCH_SIZE = 500
+
+# Spalten, nach denen gefiltert bzw. sortiert werden darf. Feldnamen werden
+# direkt in das SQL eingesetzt und müssen daher gegen diese Liste geprüft werden.
+_FILTER_COLUMNS = frozenset({
+    'id', 'listing_id', 'url', 'title', 'city', 'district', 'size', 'rent',
+    'available_from', 'available_until', 'room_type', 'online_since',
+    'flatmates', 'flatmates_female', 'flatmates_male', 'flatmates_diverse',
+    'rooms_free', 'contact_name', 'scraped_at', 'created_at',
+})
+
+_SORT_COLUMNS = frozenset({
+    'id', 'listing_id', 'title', 'city', 'district',
+    'size', 'rent', 'available_from', 'available_until',
+    'flatmates', 'flatmates_female', 'flatmates_male',
+    'flatmates_diverse', 'rooms_free', 'scraped_at', 'created_at',
+})
+
+# Berechnete Spalten: Name -> SQL-Ausdruck. Können wie normale Spalten
+# gefiltert und sortiert werden und werden bei Bedarf mit selektiert.
+# ROUND() rundet kaufmännisch (x.xx5 aufwärts), Pythons round() dagegen auf
+# die nächste Binärdarstellung; Werte können daher um 0,01 abweichen.
+_COMPUTED_COLUMNS = {
+    'price_per_sqm': 'ROUND(CAST(rent AS REAL) / NULLIF(size, 0), 2)',
+}
+
+# Tabellen und Indizes, die init_db() anlegt, sowie von init_db() entfernte
+# Vorgänger-Indizes. Stimmt sqlite_master damit überein, ist keine DDL und
+# damit auch keine Schreibsperre nötig.
+_SCHEMA_OBJECTS = frozenset({
+    'listings', 'stats_cache',
+    'idx_city', 'idx_rent', 'idx_scraped_at', 'idx_size',
+    'idx_city_rent_size', 'idx_city_scraped_at_id', 'idx_price_per_sqm',
+})
+_LEGACY_INDEXES = frozenset({'idx_city_rent', 'idx_city_scraped_at'})
+
+# Filter-Operator -> SQL-Operator. Zweistellige Operatoren stehen vorne,
+# damit z.B. 'size>=' nicht als '>' erkannt wird.
+_SQL_OPERATORS = {
+    '>=': '>=',
+    '<=': '<=',
+    '!=': '!=',
+    '>': '>',
+    '<': '<',
+}
+
+
+def _listing_row(listing: WGListing) -> Tuple[Any, ...]:
+    """
+    Baut die Parameter für _INSERT_LISTING_SQL direkt aus dem Listing.
+    
+    Entspricht den Werten von WGListing.to_dict(), spart aber das
+    Dictionary und das Binden per Name beim Schreiben.
+    
+    Args:
+        listing: WGListing-Objekt
+        
+    Returns:
+        Tuple in Spaltenreihenfolge des INSERT
+    """
+    return (
+        listing.listing_id, listing.url, listing.title, listing.city,
+        listing.district, listing.size, listing.rent,
+        listing.available_from, listing.available_until, listing.room_type,
+        listing.online_since, listing.description, listing.flatmates,
+        listing.flatmate_details, listing.flatmates_female,
+        listing.flatmates_male, listing.flatmates_diverse, listing.rooms_free,
+        ','.join(listing.features) if listing.features else None,
+        ','.join(listing.images) if listing.images else None,
+        listing.contact_name,
+        listing.scraped_at.isoformat() if listing.scraped_at else None,
+    )
+
+
+def filters_to_sql(filters: Optional[Dict[str, Any]]) -> Tuple[str, Tuple[Any, ...]]:
+    """
+    Übersetzt ein Filter-Dictionary in eine parametrisierte WHERE-Bedingung.
+    
+    Args:
+        filters: Dictionary mit Filter-Bedingungen, z.B.
+                 {'size>': 20, 'rent<': 500, 'city': 'Berlin'}
+        
+    Returns:
+        Tuple (clause, params); clause beginnt mit " AND " oder ist leer
+        
+    Raises:
+        ValueError: Bei einem Feld, das nicht gefiltert werden darf
+    """
+    if not filters:
+        return "", ()
+    
+    conditions = []
+    params = []
+    
+    for key, value in filters.items():
+        if value is None:
+            continue
+        
+        field, op = key, '='
+        for suffix, sql_op in _SQL_OPERATORS.items():
+            if key.endswith(suffix):
+                field, op = key[:-len(suffix)], sql_op
+                break
+        
+        # Validierung gegen SQL-Injection
+        if field in _COMPUTED_COLUMNS:
+            field = f"({_COMPUTED_COLUMNS[field]})"
+        elif field not in _FILTER_COLUMNS:
+            raise ValueError(f"Unbekanntes Filterfeld: {field}")
+        
+        conditions.append(f" AND {field} {op} ?")
+        params.append(value)
+    
+    return "".join(conditions), tuple(params)
+
 
 class Database:
     """
@@ -21,15 +169,22 @@ class Database:
     Verwaltet die SQLite-Datenbank mit allen gescrapten Anzeigen.
     """
     
-    def __init__(self, db_path: str = "wg_data.db"):
+    def __init__(self, db_path: str = "wg_data.db", journal_mode: Optional[str] = "WAL"):
         """
         Initialisiert die Datenbankverbindung.
         
         Args:
             db_path: Pfad zur SQLite-Datenbankdatei
+            journal_mode: SQLite-Journal-Modus (Standard: WAL). Für Datenbanken
+                auf Netzwerk-Dateisystemen None übergeben, um den
+                Standard-Journal-Modus von SQLite beizubehalten.
         """
         self.db_path = Path(db_path)
+        self.journal_mode = journal_mode
         self.conn: Optional[sqlite3.Connection] = None
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._transaction_depth = 0
         _logger.info(f"Datenbank-Manager initialisiert: {self.db_path}")
     
     def _get_connection(self) -> sqlite3.Connection:
@@ -40,61 +195,198 @@ class Database:
             SQLite-Connection
         """
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
+            # Autocommit: Transaktionen werden ausschließlich über transaction()
+            # mit BEGIN IMMEDIATE geöffnet statt implizit vor DML-Statements
+            self.conn = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=_CACHED_STATEMENTS
+            )
             self.conn.row_factory = sqlite3.Row  # Ermöglicht dict-ähnlichen Zugriff
+            self._apply_pragmas(self.conn)
+            self._cursor = self.conn.cursor()
         return self.conn
-    
-    def init_db(self):
-        """
-        Initialisiert die Datenbank mit den erforderlichen Tabellen.
+
+    def _get_read_connection(self) -> sqlite3.Connection:
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        Gibt die Verbindung für reine Lesezugriffe zurück.
         
-        # Haupttabelle für WG-Anzeigen
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS listings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                listing_id TEXT UNIQUE NOT NULL,
-                url TEXT NOT NULL,
-                title TEXT NOT NULL,
-                city TEXT,
-                district TEXT,
-                size REAL,
-                rent REAL,
-                available_from TEXT,
-                available_until TEXT,
-                room_type TEXT,
-                online_since TEXT,
-                description TEXT,
-                flatmates INTEGER,
-                flatmate_details TEXT,
-                flatmates_female INTEGER,
-                flatmates_male INTEGER,
-                flatmates_diverse INTEGER,
-                rooms_free INTEGER,
-                features TEXT,
-                images TEXT,
-                contact_name TEXT,
-                scraped_at TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        Im WAL-Modus blockieren Leser den Schreiber nicht. Lesezugriffe laufen
+        daher über eine eigene Verbindung mit query_only=1, damit Abfragen
+        nicht hinter Commits der Schreibverbindung warten. Innerhalb eines
+        transaction()-Blocks, ohne WAL und bei In-Memory-Datenbanken wird die
+        Schreibverbindung verwendet, damit eigene, noch nicht committete
+        Änderungen sichtbar bleiben.
+        
+        Returns:
+            SQLite-Connection
+        """
+        if (self._transaction_depth > 0 or not self.journal_mode
+                or str(self.db_path) == ":memory:"):
+            return self._get_connection()
+        if self._read_conn is None:
+            self._read_conn = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=_CACHED_STATEMENTS
             )
-        """)
+            self._read_conn.row_factory = sqlite3.Row
+            self._apply_pragmas(self._read_conn)
+            self._read_conn.execute("PRAGMA query_only=1")
+        return self._read_conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Fasst mehrere Schreibzugriffe in einer Transaktion zusammen.
         
-        # Index für schnellere Suchen
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_city ON listings(city)
-        """)
+        Die Transaktion wird mit BEGIN IMMEDIATE geöffnet, sodass die
+        Schreibsperre gleich zu Beginn geholt wird und nicht erst mitten im
+        Block (kein SQLITE_BUSY beim Hochstufen einer Lese-Transaktion).
+        Innerhalb des Blocks committen save_listing & Co. nicht einzeln;
+        am Ende wird einmal committet bzw. bei einer Exception zurückgerollt.
+        Verschachtelte Aufrufe laufen in der äußeren Transaktion.
         
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_rent ON listings(rent)
-        """)
+        Beispiel:
+            with db.transaction():
+                for listing in listings:
+                    db.save_listing(listing)
         
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_scraped_at ON listings(scraped_at)
-        """)
+        Yields:
+            SQLite-Connection
+        """
+        conn = self._get_connection()
+        if self._transaction_depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._transaction_depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                conn.rollback()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                conn.commit()
+
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        """
+        Setzt Journal-Modus und Performance-PRAGMAs für eine Verbindung.
+
+        Schlägt das Aktivieren von WAL fehl (z.B. bei schreibgeschützten
+        Dateien), wird mit dem bisherigen Journal-Modus weitergearbeitet.
+
+        Args:
+            conn: SQLite-Connection
+        """
+        if self.journal_mode:
+            try:
+                conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            except sqlite3.DatabaseError as e:
+                _logger.debug(f"Journal-Modus {self.journal_mode} nicht aktivierbar: {e}")
+
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    
+    def _schema_is_current(self) -> bool:
+        """
+        Prüft ohne Schreibsperre, ob alle Tabellen und Indizes aktuell sind.
+        
+        Returns:
+            True, wenn init_db() nichts ändern müsste
+        """
+        names = {
+            row[0] for row in self._get_connection().execute("SELECT name FROM sqlite_master")
+        }
+        return _SCHEMA_OBJECTS <= names and not names & _LEGACY_INDEXES
+    
+    def init_db(self):
+        """
+        Initialisiert die Datenbank mit den erforderlichen Tabellen.
+        
+        Ist das Schema bereits aktuell, wird nur gelesen. So lassen sich auch
+        schreibgeschützte oder gerade von einem Schreiber gesperrte
+        Datenbanken öffnen; BEGIN IMMEDIATE folgt nur, wenn DDL nötig ist.
+        """
+        if self._schema_is_current():
+            _logger.debug("Datenbank-Schema ist aktuell")
+            return
+        
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Haupttabelle für WG-Anzeigen
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS listings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    listing_id TEXT UNIQUE NOT NULL,
+                    url TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    city TEXT,
+                    district TEXT,
+                    size REAL,
+                    rent REAL,
+                    available_from TEXT,
+                    available_until TEXT,
+                    room_type TEXT,
+                    online_since TEXT,
+                    description TEXT,
+                    flatmates INTEGER,
+                    flatmate_details TEXT,
+                    flatmates_female INTEGER,
+                    flatmates_male INTEGER,
+                    flatmates_diverse INTEGER,
+                    rooms_free INTEGER,
+                    features TEXT,
+                    images TEXT,
+                    contact_name TEXT,
+                    scraped_at TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Index für schnellere Suchen
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_city ON listings(city)
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rent ON listings(rent)
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scraped_at ON listings(scraped_at)
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_size ON listings(size)
+            """)
+            
+            # Kombinierter Index für die häufige Abfrage "Stadt + Mietobergrenze";
+            # ein zusätzlicher Größen-Filter wird direkt im Index geprüft
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_city_rent_size ON listings(city, rent, size)
+            """)
+            
+            # Vorgänger ohne size-Spalte, durch idx_city_rent_size abgedeckt
+            cursor.execute("DROP INDEX IF EXISTS idx_city_rent")
+            
+            # Standard-Listenansicht "Stadt, neueste zuerst" ohne temporäre Sortierung;
+            # id gehört zur Sortierung (Tiebreaker für Keyset-Pagination)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_city_scraped_at_id
+                ON listings(city, scraped_at DESC, id DESC)
+            """)
+            
+            # Vorgänger ohne id-Spalte, durch idx_city_scraped_at_id abgedeckt
+            cursor.execute("DROP INDEX IF EXISTS idx_city_scraped_at")
+            
+            # Ausdrucks-Index für Filter und Sortierung nach Preis pro m²
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_price_per_sqm
+                ON listings({_COMPUTED_COLUMNS['price_per_sqm']})
+            """)
+            
+            self._ensure_stats_cache(cursor)
         
-        conn.commit()
         _logger.info("Datenbank initialisiert")
     
     def save_listing(self, listing: WGListing) -> bool:
@@ -108,42 +400,88 @@ class Database:
             listing: WGListing-Objekt
             
         Returns:
-            True wenn gespeichert, False wenn bereits vorhanden
+            True wenn gespeichert, False wenn bereits vorhanden oder bei einem
+            Fehler außerhalb eines transaction()-Blocks
+        
+        Raises:
+            sqlite3.Error: Nur innerhalb eines äußeren transaction()-Blocks
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        self._get_connection()
+        cursor = self._cursor
         
         try:
-            data = listing.to_dict()
-            
-            cursor.execute("""
-                INSERT INTO listings (
-                    listing_id, url, title, city, district, size, rent,
-                    available_from, available_until, room_type, online_since,
-                    description, flatmates, flatmate_details, flatmates_female,
-                    flatmates_male, flatmates_diverse, rooms_free, features,
-                    images, contact_name, scraped_at
-                ) VALUES (
-                    :listing_id, :url, :title, :city, :district, :size, :rent,
-                    :available_from, :available_until, :room_type, :online_since,
-                    :description, :flatmates, :flatmate_details, :flatmates_female,
-                    :flatmates_male, :flatmates_diverse, :rooms_free, :features,
-                    :images, :contact_name, :scraped_at
-                )
-            """, data)
-            
-            conn.commit()
+            with self.transaction():
+                cursor.execute(_INSERT_LISTING_SQL, _listing_row(listing))
+                
+                if cursor.rowcount == 0:
+                    _logger.debug(f"Listing {listing.listing_id} bereits vorhanden")
+                    return False
+                
+                self._invalidate_stats(cursor)
             _logger.debug(f"Listing {listing.listing_id} gespeichert")
             return True
             
-        except sqlite3.IntegrityError:
-            _logger.debug(f"Listing {listing.listing_id} bereits vorhanden")
-            return False
         except Exception as e:
+            # Wie bei save_listings_bulk: keine Teil-Commits der äußeren Transaktion
+            if self._transaction_depth > 0:
+                raise
             _logger.error(f"Fehler beim Speichern von Listing {listing.listing_id}: {e}")
-            conn.rollback()
             return False
-    
+
+    def save_listings_bulk(self, listings: Iterable[WGListing], batch_size: int = 500) -> int:
+        """
+        Speichert mehrere WG-Anzeigen gebündelt in der Datenbank.
+
+        Die Anzeigen werden in Blöcken von `batch_size` per `executemany`
+        eingefügt, jeweils in einer einzigen Transaktion. Bereits vorhandene
+        Anzeigen (gleiche listing_id) werden übersprungen. Ein fehlerhafter
+        Block wird protokolliert und übersprungen, innerhalb eines äußeren
+        transaction()-Blocks dagegen weitergereicht.
+
+        Args:
+            listings: Iterable von WGListing-Objekten
+            batch_size: Anzahl der Anzeigen pro Transaktion
+
+        Returns:
+            Anzahl der neu gespeicherten Anzeigen
+        
+        Raises:
+            sqlite3.Error: Nur innerhalb eines äußeren transaction()-Blocks
+        """
+        self._get_connection()
+        cursor = self._cursor
+        saved = 0
+
+        iterator = iter(listings)
+        while True:
+            batch = [_listing_row(listing) for listing in islice(iterator, batch_size)]
+            if not batch:
+                break
+
+            try:
+                with self.transaction():
+                    cursor.executemany(_INSERT_LISTING_SQL, batch)
+                    inserted = cursor.rowcount
+                    if inserted:
+                        self._invalidate_stats(cursor)
+                saved += inserted
+                _logger.debug(f"{inserted} von {len(batch)} Listings gespeichert")
+
+            except Exception as e:
+                # In einer äußeren Transaktion muss der Aufrufer den Fehler
+                # sehen, sonst committet er die übrigen Blöcke stillschweigend
+                if self._transaction_depth > 0:
+                    raise
+                _logger.error(f"Fehler beim Speichern eines Listing-Blocks: {e}")
+
+        # Nach größeren Importen Planer-Statistiken auffrischen, damit der
+        # Query-Planer den passenden Index wählt; Lesepfade lösen kein ANALYZE
+        # aus, dort genügt PRAGMA optimize in close()
+        if saved and self._transaction_depth == 0:
+            cursor.execute("ANALYZE listings")
+
+        return saved
+
     def get_listing(self, listing_id: str) -> Optional[Dict[str, Any]]:
         """
         Ruft eine einzelne Anzeige anhand der listing_id ab.
@@ -154,15 +492,12 @@ class Database:
         Returns:
             Dictionary mit Anzeigendaten oder None
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        conn = self._get_read_connection()
         
-        cursor.execute(
+        row = conn.execute(
             "SELECT * FROM listings WHERE listing_id = ?",
             (listing_id,)
-        )
-        
-        row = cursor.fetchone()
+        ).fetchone()
         return dict(row) if row else None
     
     def get_listings(
@@ -171,83 +506,148 @@ class Database:
         offset: int = 0,
         filters: Optional[Dict[str, Any]] = None,
         sort_by: Optional[str] = None,
-        sort_order: str = "DESC"
+        sort_order: str = "DESC",
+        computed_columns: Iterable[str] = (),
+        after: Optional[Tuple[str, int]] = None
     ) -> List[Dict[str, Any]]:
         """
         Ruft mehrere Anzeigen mit flexiblen Filtern ab.
         
+        Parameter wie bei iter_listings().
+        
+        Returns:
+            Liste von Dictionaries mit Anzeigendaten
+        """
+        return list(self.iter_listings(
+            limit=limit,
+            offset=offset,
+            filters=filters,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            computed_columns=computed_columns,
+            after=after,
+        ))
+    
+    def get_listings_page(
+        self,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        computed_columns: Iterable[str] = (),
+        after: Optional[Tuple[str, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """
+        Ruft eine Seite der Standard-Sortierung (neueste zuerst) per Keyset ab.
+        
+        Args:
+            limit: Maximale Anzahl der Ergebnisse
+            filters: Filter wie bei iter_listings()
+            computed_columns: Berechnete Spalten wie bei iter_listings()
+            after: Cursor der vorherigen Seite oder None für die erste Seite
+            
+        Returns:
+            Tupel (Anzeigen, Cursor für die nächste Seite). Der Cursor ist
+            (scraped_at, id) der letzten Zeile, oder None, wenn die Seite
+            nicht voll ist und daher keine weitere folgt.
+        """
+        listings = self.get_listings(
+            limit=limit, filters=filters, computed_columns=computed_columns, after=after
+        )
+        if len(listings) < limit:
+            return listings, None
+        last = listings[-1]
+        return listings, (last['scraped_at'], last['id'])
+    
+    def iter_listings(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "DESC",
+        computed_columns: Iterable[str] = (),
+        after: Optional[Tuple[str, int]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert Anzeigen mit flexiblen Filtern einzeln als Generator.
+        
+        Die Zeilen werden blockweise vom Cursor abgeholt, sodass nie das
+        gesamte Ergebnis gleichzeitig im Speicher liegt.
+        
+        Filter und Sortierung dürfen auch berechnete Spalten wie
+        'price_per_sqm' verwenden; SQLite wertet sie dann vor dem LIMIT aus.
+        
+        Für tiefe Seiten in der Standard-Sortierung (neueste zuerst) ist
+        `after` schneller als `offset`: SQLite springt über den Index direkt
+        hinter die letzte Zeile der vorherigen Seite, statt alle
+        übersprungenen Zeilen zu lesen.
+        
         Args:
             limit: Maximale Anzahl der Ergebnisse
             offset: Offset für Pagination
             filters: Dictionary mit Filter-Bedingungen, z.B.:
-                     {'size>': 20, 'rent<': 500, 'city': 'Berlin'}
-            sort_by: Spalte zum Sortieren (z.B. 'rent', 'size', 'scraped_at')
+                     {'size>': 20, 'rent<': 500, 'city': 'Berlin', 'price_per_sqm<': 15}
+            sort_by: Spalte zum Sortieren (z.B. 'rent', 'size', 'scraped_at', 'price_per_sqm')
             sort_order: 'ASC' oder 'DESC'
+            computed_columns: Namen berechneter Spalten, die zusätzlich
+                     in die Ergebnisse aufgenommen werden (z.B. ['price_per_sqm'])
+            after: (scraped_at, id) der letzten Zeile der vorherigen Seite
+                     (Keyset-Pagination, nur ohne sort_by)
             
-        Returns:
-            Liste von Dictionaries mit Anzeigendaten
+        Yields:
+            Dictionaries mit Anzeigendaten
+            
+        Raises:
+            ValueError: Bei unbekannten Spalten oder after zusammen mit sort_by
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM listings WHERE 1=1"
-        params = []
+        conn = self._get_read_connection()
         
         # Filter anwenden
-        if filters:
-            for key, value in filters.items():
-                if value is None:
-                    continue
-                
-                # Operatoren unterstützen
-                if key.endswith('>'):
-                    field = key[:-1]
-                    query += f" AND {field} > ?"
-                    params.append(value)
-                elif key.endswith('<'):
-                    field = key[:-1]
-                    query += f" AND {field} < ?"
-                    params.append(value)
-                elif key.endswith('>='): 
-                    field = key[:-2]
-                    query += f" AND {field} >= ?"
-                    params.append(value)
-                elif key.endswith('<='): 
-                    field = key[:-2]
-                    query += f" AND {field} <= ?"
-                    params.append(value)
-                elif key.endswith('!='):
-                    field = key[:-2]
-                    query += f" AND {field} != ?"
-                    params.append(value)
-                else:
-                    # Exakte Übereinstimmung
-                    query += f" AND {key} = ?"
-                    params.append(value)
+        select = "*"
+        for name in computed_columns:
+            if name not in _COMPUTED_COLUMNS:
+                raise ValueError(f"Unbekannte berechnete Spalte: {name}")
+            select += f", {_COMPUTED_COLUMNS[name]} AS {name}"
+        
+        clause, filter_params = filters_to_sql(filters)
+        query = f"SELECT {select} FROM listings WHERE 1=1{clause}"
+        params = list(filter_params)
+        
+        custom_sort = sort_by in _SORT_COLUMNS or sort_by in _COMPUTED_COLUMNS
+        if after is not None:
+            if custom_sort:
+                raise ValueError("after ist nur mit der Standard-Sortierung möglich")
+            query += " AND (scraped_at, id) < (?, ?)"
+            params.extend(after)
         
         # Sortierung
-        if sort_by:
-            # Validierung gegen SQL-Injection
-            valid_columns = [
-                'id', 'listing_id', 'title', 'city', 'district',
-                'size', 'rent', 'available_from', 'available_until',
-                'flatmates', 'flatmates_female', 'flatmates_male',
-                'flatmates_diverse', 'rooms_free', 'scraped_at', 'created_at'
-            ]
-            if sort_by in valid_columns:
-                order = 'ASC' if sort_order.upper() == 'ASC' else 'DESC'
-                query += f" ORDER BY {sort_by} {order}"
-            else:
-                query += " ORDER BY scraped_at DESC"
+        order = 'ASC' if sort_order.upper() == 'ASC' else 'DESC'
+        if sort_by in _SORT_COLUMNS:
+            query += f" ORDER BY {sort_by} {order}"
+        elif sort_by in _COMPUTED_COLUMNS:
+            # Anzeigen ohne Wert (z.B. ohne Größe) stehen immer am Ende. Bei DESC
+            # ist das die Standard-Reihenfolge von SQLite und der Ausdrucks-Index
+            # bleibt nutzbar; NULLS LAST bei ASC kann eine temporäre Sortierung
+            # erzwingen. id als Tiebreaker für eine stabile Reihenfolge.
+            expression = _COMPUTED_COLUMNS[sort_by]
+            nulls = " NULLS LAST" if order == 'ASC' else ""
+            query += f" ORDER BY {expression} {order}{nulls}, id {order}"
         else:
-            query += " ORDER BY scraped_at DESC"
+            # id als eindeutiger Tiebreaker, damit after eindeutig weiterblättert
+            query += " ORDER BY scraped_at DESC, id DESC"
         
         query += " LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
-        cursor.execute(query, params)
+        cursor = conn.execute(query, params)
         
-        return [dict(row) for row in cursor.fetchall()]
+        # Blockweise abholen, damit nicht alle sqlite3.Row-Objekte
+        # gleichzeitig im Speicher liegen
+        while True:
+            rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -256,27 +656,24 @@ class Database:
         Returns:
             Dictionary mit Statistiken
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Gesamtzahl
-        cursor.execute("SELECT COUNT(*) as total FROM listings")
-        total = cursor.fetchone()['total']
-        
-        # Anzahl verschiedener Städte
-        cursor.execute("SELECT COUNT(DISTINCT city) as cities FROM listings WHERE city IS NOT NULL")
-        cities = cursor.fetchone()['cities']
-        
-        # Durchschnittliche Miete
-        cursor.execute("SELECT AVG(rent) as avg_rent FROM listings WHERE rent IS NOT NULL")
-        avg_rent = cursor.fetchone()['avg_rent'] or 0
-        
-        # Durchschnittliche Größe
-        cursor.execute("SELECT AVG(size) as avg_size FROM listings WHERE size IS NOT NULL")
-        avg_size = cursor.fetchone()['avg_size'] or 0
+        conn = self._get_read_connection()
+        
+        # Gesamtzahl, Anzahl Städte und Durchschnitte in einem Durchlauf;
+        # COUNT(DISTINCT) und AVG ignorieren NULL-Werte ohnehin
+        row = conn.execute("""
+            SELECT COUNT(*) as total,
+                   COUNT(DISTINCT city) as cities,
+                   AVG(rent) as avg_rent,
+                   AVG(size) as avg_size
+            FROM listings
+        """).fetchone()
+        total = row['total']
+        cities = row['cities']
+        avg_rent = row['avg_rent'] or 0
+        avg_size = row['avg_size'] or 0
         
         # Top 5 Städte
-        cursor.execute("""
+        cursor = conn.execute("""
             SELECT city, COUNT(*) as count 
             FROM listings 
             WHERE city IS NOT NULL 
@@ -294,6 +691,82 @@ class Database:
             'top_cities': top_cities
         }
     
+    def refresh_stats(self) -> Dict[str, Any]:
+        """
+        Berechnet die Statistiken neu und speichert sie in der Tabelle stats_cache.
+        
+        Returns:
+            Dictionary mit Statistiken (wie get_statistics)
+        """
+        statistics = self.get_statistics()
+        
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            self._ensure_stats_cache(cursor)
+            cursor.execute("DELETE FROM stats_cache")
+            cursor.executemany(
+                "INSERT INTO stats_cache (key, value, updated_at) VALUES (?, ?, datetime('now'))",
+                [(key, json.dumps(value)) for key, value in statistics.items()]
+            )
+        
+        _logger.debug("Statistik-Cache aktualisiert")
+        return statistics
+    
+    def get_cached_statistics(self) -> Dict[str, Any]:
+        """
+        Liefert die Statistiken aus der Tabelle stats_cache.
+        
+        Ist der Cache leer (z.B. nach Schreibzugriffen oder bei älteren
+        Datenbanken ohne stats_cache), werden die Statistiken neu berechnet
+        und gespeichert. Ist die Datenbank schreibgeschützt, werden sie nur
+        berechnet.
+        
+        Returns:
+            Dictionary mit Statistiken (wie get_statistics)
+        """
+        conn = self._get_read_connection()
+        
+        try:
+            rows = conn.execute("SELECT key, value FROM stats_cache").fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        
+        if not rows:
+            try:
+                return self.refresh_stats()
+            except sqlite3.OperationalError as e:
+                # z.B. schreibgeschützte Datei oder Mount: nur lesen, nicht cachen
+                _logger.debug(f"Statistik-Cache nicht beschreibbar: {e}")
+                return self.get_statistics()
+        
+        statistics = {row['key']: json.loads(row['value']) for row in rows}
+        statistics['top_cities'] = [tuple(item) for item in statistics.get('top_cities', [])]
+        _logger.debug("Statistiken aus Cache geladen")
+        return statistics
+    
+    def _ensure_stats_cache(self, cursor: sqlite3.Cursor) -> None:
+        """Legt die Tabelle stats_cache an, falls sie noch nicht existiert."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+    
+    def _invalidate_stats(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Verwirft die gecachten Statistiken nach einer Änderung an listings.
+        
+        Läuft in der Transaktion des Aufrufers, damit Daten und Cache
+        konsistent bleiben.
+        """
+        try:
+            cursor.execute("DELETE FROM stats_cache")
+        except sqlite3.OperationalError:
+            # Ältere Datenbank ohne stats_cache - nichts zu verwerfen
+            pass
+    
     def delete_listing(self, listing_id: str) -> bool:
         """
         Löscht eine Anzeige aus der Datenbank.
@@ -304,13 +777,13 @@ class Database:
         Returns:
             True wenn gelöscht, False wenn nicht gefunden
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM listings WHERE listing_id = ?", (listing_id,))
-        conn.commit()
+        with self.transaction():
+            cursor = self._cursor
+            cursor.execute("DELETE FROM listings WHERE listing_id = ?", (listing_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._invalidate_stats(cursor)
         
-        deleted = cursor.rowcount > 0
         if deleted:
             _logger.info(f"Listing {listing_id} gelöscht")
         else:
@@ -324,19 +797,28 @@ class Database:
         
         ACHTUNG: Diese Aktion kann nicht rückgängig gemacht werden!
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM listings")
-        conn.commit()
+        with self.transaction():
+            cursor = self._cursor
+            cursor.execute("DELETE FROM listings")
+            self._invalidate_stats(cursor)
         
         _logger.warning("Alle Listings aus der Datenbank gelöscht")
     
     def close(self):
         """Schließt die Datenbankverbindung."""
+        if self._read_conn:
+            self._read_conn.close()
+            self._read_conn = None
         if self.conn:
+            # Von SQLite empfohlen vor dem Schließen: analysiert nur Tabellen,
+            # deren Statistiken veraltet sind, und ist sonst fast kostenlos
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                _logger.debug(f"PRAGMA optimize fehlgeschlagen: {e}")
             self.conn.close()
             self.conn = None
+            self._cursor = None
             _logger.debug("Datenbankverbindung geschlossen")
     
     def __enter__(self):
@@ -4,12 +4,17 @@ Datenmodelle für WG-Anzeigen.
 Definiert die Struktur der gescrapten Daten.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
 
+# __slots__ statt __dict__ pro Instanz (kompakter, schnellerer Attributzugriff);
+# dataclass(slots=True) gibt es erst ab Python 3.10
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class WGListing:
     """
     Repräsentiert eine WG-Anzeige von wg-gesucht.de.
@@ -6,18 +6,201 @@ Dieses Modul enthält die Logik zum Scrapen von WG-Anzeigen.
 
 import logging
 import re
+import threading
 import time
-from typing import List, Optional, Generator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, List, Mapping, Optional, Generator, Tuple
 from urllib.parse import urljoin, urlparse, parse_qs
 
 import requests
+import soupsieve
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from wg_scraper.models import WGListing
 from wg_scraper import config
 
 _logger = logging.getLogger(__name__)
 
+# Vorkompilierte Muster für das Parsen der Suchergebnis-Seiten
+_LISTING_ID_RE = re.compile(r'\.([0-9]+)\.html')
+_NUMBER_RE = re.compile(r'([0-9]+[,.]?[0-9]*)')
+_WG_SIZE_RE = re.compile(r'([0-9]+)er WG')
+_FLATMATE_DETAILS_RE = re.compile(r'\(([^)]+)\)')
+_COUNT_RE = re.compile(r'(\d+)')
+_FEMALE_RE = re.compile(r'\d+\s*w\b')
+_MALE_RE = re.compile(r'\d+\s*m\b')
+_DIVERSE_RE = re.compile(r'\d+\s*d\b')
+_ROOMS_FREE_RE = re.compile(r'(\d+)\s*frei')
+_PAGE_URL_RE = re.compile(r'(.*\.[0-9]+\.[0-9]+\.[0-9]+\.)([0-9]+)(\.html.*)')
+
+# Deutsches Zahlenformat: Tausenderpunkte entfernen, Dezimalkomma -> Punkt
+_NUMBER_TRANSLATION = str.maketrans({'.': None, ',': '.'})
+
+
+@lru_cache(maxsize=128)
+def _split_page_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Zerlegt eine Suchergebnis-URL in den Teil vor und nach der Seitenzahl.
+    
+    Beim parallelen Abruf wird die Start-URL für jede Seite erneut zerlegt;
+    das Ergebnis wird daher pro URL gecacht.
+    
+    Args:
+        url: URL einer Suchergebnis-Seite
+        
+    Returns:
+        Tupel (Präfix, Suffix) oder None, wenn die URL kein Seitenzahl-Muster hat
+    """
+    match = _PAGE_URL_RE.search(url)
+    return (match.group(1), match.group(3)) if match else None
+
+
+class RateLimiter:
+    """
+    Adaptiver Rate Limiter anhand der Antwort-Header des Servers.
+    
+    Wertet `Retry-After` sowie `X-RateLimit-Remaining`/`X-RateLimit-Reset`
+    aus: Das verbleibende Kontingent wird gleichmäßig auf das Zeitfenster bis
+    zum Reset verteilt, bei erschöpftem Kontingent oder `Retry-After` wird
+    bis zum angegebenen Zeitpunkt gewartet. Solange der Server keine
+    Rate-Limit-Header sendet, gilt die feste Verzögerung `default_delay`.
+    """
+    
+    def __init__(self, default_delay: float = 1.0):
+        """
+        Initialisiert den Rate Limiter.
+        
+        Args:
+            default_delay: Verzögerung in Sekunden, wenn der Server keine
+                Rate-Limit-Header sendet
+        """
+        self.default_delay = default_delay
+        self.has_server_limits = False
+        self._interval = 0.0
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Wartet, bis der nächste Request laut Server-Vorgaben erlaubt ist."""
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = slot + self._interval
+        
+        wait = slot - now
+        if wait > 0:
+            _logger.debug(f"Rate Limit: Warte {wait:.2f}s")
+            time.sleep(wait)
+    
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Passt das Tempo an die Rate-Limit-Header einer Antwort an.
+        
+        Args:
+            headers: HTTP-Header der Antwort
+        """
+        now = time.time()
+        retry_after = self._parse_retry_after(headers.get('Retry-After'), now)
+        remaining = self._parse_float(headers.get('X-RateLimit-Remaining'))
+        reset_in = self._parse_reset(headers.get('X-RateLimit-Reset'), now)
+        
+        with self._lock:
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                _logger.info(f"Server verlangt Pause von {retry_after:.1f}s (Retry-After)")
+            
+            if remaining is None or reset_in is None:
+                return
+            
+            self.has_server_limits = True
+            if remaining <= 0:
+                self._blocked_until = max(self._blocked_until, now + reset_in)
+                _logger.info(f"Rate-Limit-Kontingent erschöpft - warte {reset_in:.1f}s bis Reset")
+            else:
+                self._interval = reset_in / remaining
+    
+    def idle_delay(self) -> float:
+        """
+        Gibt die feste Verzögerung nach einem Request zurück.
+        
+        Returns:
+            default_delay ohne Server-Vorgaben, sonst 0 (das Tempo regelt acquire)
+        """
+        return 0.0 if self.has_server_limits else self.default_delay
+    
+    @staticmethod
+    def _parse_float(value: Optional[str]) -> Optional[float]:
+        """Wandelt einen Header-Wert in eine Zahl um (None bei Fehler)."""
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+    
+    @classmethod
+    def _parse_retry_after(cls, value: Optional[str], now: float) -> Optional[float]:
+        """Parst Retry-After als Sekunden oder HTTP-Datum und gibt Sekunden zurück."""
+        if value is None:
+            return None
+        seconds = cls._parse_float(value)
+        if seconds is None:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - now
+            except (TypeError, ValueError):
+                return None
+        return max(0.0, seconds)
+    
+    @classmethod
+    def _parse_reset(cls, value: Optional[str], now: float) -> Optional[float]:
+        """Parst X-RateLimit-Reset (Unix-Zeitstempel oder Sekunden) als Sekunden bis zum Reset."""
+        reset = cls._parse_float(value)
+        if reset is None:
+            return None
+        # Große Werte sind absolute Unix-Zeitstempel, kleine relative Sekunden
+        if reset > 1e9:
+            reset -= now
+        return max(0.0, reset)
+
+
+def create_session(pool_size: int = config.POOL_SIZE) -> requests.Session:
+    """
+    Erzeugt eine HTTP-Session mit Connection-Pool, Retry und User-Agent.
+    
+    Args:
+        pool_size: Maximale Anzahl wiederverwendeter Verbindungen pro Host
+        
+    Returns:
+        Konfigurierte requests.Session
+    """
+    session = requests.Session()
+    
+    # Keep-Alive-Verbindungen wiederverwenden und vorübergehende Fehler
+    # (Rate Limit, Serverfehler) mit Backoff wiederholen
+    retry = Retry(
+        total=config.MAX_RETRIES,
+        backoff_factor=config.RETRY_BACKOFF_FACTOR,
+        status_forcelist=config.RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    # User-Agent setzen, um nicht als Bot erkannt zu werden
+    session.headers.update({
+        'User-Agent': (
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+            'AppleWebKit/537.36 (KHTML, like Gecko) '
+            'Chrome/91.0.4472.124 Safari/537.36'
+        )
+    })
+    return session
+
 
 class WGScraper:
     """
@@ -29,31 +212,63 @@ class WGScraper:
     
     BASE_URL = "https://www.wg-gesucht.de"
     
-    def __init__(self, delay: float = 1.0):
+    def __init__(
+        self,
+        delay: float = 1.0,
+        pool_size: int = config.POOL_SIZE,
+        session: Optional[requests.Session] = None
+    ):
         """
         Initialisiert den Scraper.
         
         Args:
             delay: Verzögerung zwischen Requests in Sekunden (Standard: 1.0)
+            pool_size: Maximale Anzahl wiederverwendeter Verbindungen pro Host
+            session: Bestehende Session (z.B. aus create_session()), die sich
+                mehrere Scraper teilen, damit Keep-Alive-Verbindungen erhalten
+                bleiben. Ohne Angabe wird eine eigene Session erzeugt.
         """
         self.delay = delay
-        self.session = requests.Session()
-        
-        # User-Agent setzen, um nicht als Bot erkannt zu werden
-        self.session.headers.update({
-            'User-Agent': (
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/91.0.4472.124 Safari/537.36'
-            )
-        })
+        self.rate_limiter = RateLimiter(default_delay=delay)
+        
+        # CSS-Selektoren einmal kompilieren statt bei jedem select()-Aufruf
+        self._selectors = {
+            key: soupsieve.compile(selector)
+            for key, selector in config.SELECTORS.items()
+        }
+        
+        # Eine übergebene Session gehört dem Aufrufer und wird von close()
+        # nicht geschlossen
+        self._owns_session = session is None
+        self.session = create_session(pool_size) if session is None else session
         
-        _logger.info(f"Scraper initialisiert mit {delay}s Delay")
+        _logger.info(f"Scraper initialisiert mit {delay}s Delay und {pool_size} Verbindungen")
     
     def _get_page(self, url: str) -> Optional[BeautifulSoup]:
         """
         Ruft eine Seite ab und parst sie mit BeautifulSoup.
         
+        Args:
+            url: URL der abzurufenden Seite
+            
+        Returns:
+            BeautifulSoup-Objekt oder None bei Fehler
+        """
+        soup = self._fetch_page(url)
+        
+        # Feste Verzögerung nur, solange der Server kein Rate Limit vorgibt
+        if soup is not None:
+            time.sleep(self.rate_limiter.idle_delay())
+        
+        return soup
+    
+    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+        """
+        Ruft eine Seite ohne anschließende Verzögerung ab.
+        
+        Wird für parallele Abrufe verwendet, bei denen die Verzögerung
+        zwischen den Abruf-Wellen statt nach jedem Request eingehalten wird.
+        
         Args:
             url: URL der abzurufenden Seite
             
@@ -61,14 +276,15 @@ class WGScraper:
             BeautifulSoup-Objekt oder None bei Fehler
         """
         try:
+            self.rate_limiter.acquire()
             _logger.debug(f"Rufe Seite ab: {url}")
             response = self.session.get(url, timeout=30)
+            self.rate_limiter.update(response.headers)
             response.raise_for_status()
             
-            # Verzögerung einhalten
-            time.sleep(self.delay)
-            
-            return BeautifulSoup(response.content, 'html.parser')
+            # lxml (libxml2) parst deutlich schneller als html.parser und
+            # erkennt die Kodierung selbst aus den Roh-Bytes
+            return BeautifulSoup(response.content, 'lxml')
             
         except requests.exceptions.RequestException as e:
             _logger.error(f"Fehler beim Abrufen von {url}: {e}")
@@ -88,7 +304,7 @@ class WGScraper:
         """
         try:
             # Muster: Stadt.LISTING_ID.html
-            match = re.search(r'\.([0-9]+)\.html', url)
+            match = _LISTING_ID_RE.search(url)
             if match:
                 return match.group(1)
             
@@ -113,7 +329,7 @@ class WGScraper:
         
         try:
             # Finde erste Zahl im Text (auch mit Dezimalstellen)
-            match = re.search(r'([0-9]+[,.]?[0-9]*)', text.replace('.', '').replace(',', '.'))
+            match = _NUMBER_RE.search(text.translate(_NUMBER_TRANSLATION))
             if match:
                 return float(match.group(1))
         except (ValueError, AttributeError):
@@ -177,11 +393,11 @@ class WGScraper:
         
         try:
             # Extrahiere WG-Größe (z.B. "3er WG")
-            wg_size_match = re.search(r'([0-9]+)er WG', neighbors_title)
+            wg_size_match = _WG_SIZE_RE.search(neighbors_title)
             wg_size = int(wg_size_match.group(1)) if wg_size_match else None
             
             # Flatmate-Details (in Klammern)
-            flatmates = re.search(r'\(([^)]+)\)', neighbors_title)
+            flatmates = _FLATMATE_DETAILS_RE.search(neighbors_title)
             flatmate_details = flatmates.group(1) if flatmates else None
 
             female = None
@@ -192,7 +408,7 @@ class WGScraper:
             if flatmate_details:
                 for part in flatmate_details.split(','):
                     part = part.strip().lower()
-                    count_match = re.search(r'(\d+)', part)
+                    count_match = _COUNT_RE.search(part)
                     count = int(count_match.group(1)) if count_match else None
 
                     if 'frei' in part:
@@ -203,15 +419,15 @@ class WGScraper:
                     if count is None:
                         continue
 
-                    if re.search(r'\d+\s*w\b', part):
+                    if _FEMALE_RE.search(part):
                         female = count
-                    elif re.search(r'\d+\s*m\b', part):
+                    elif _MALE_RE.search(part):
                         male = count
-                    elif re.search(r'\d+\s*d\b', part):
+                    elif _DIVERSE_RE.search(part):
                         diverse = count
 
             if rooms_free is None:
-                free_match = re.search(r'(\d+)\s*frei', neighbors_title.lower())
+                free_match = _ROOMS_FREE_RE.search(neighbors_title.lower())
                 if free_match:
                     rooms_free = int(free_match.group(1))
 
@@ -232,10 +448,10 @@ class WGScraper:
             WGListing-Objekt oder None bei Fehler
         """
         try:
-            selectors = config.SELECTORS
+            selectors = self._selectors
             
             # URL und ID extrahieren
-            link_elem = element.select_one(selectors['listing_link'])
+            link_elem = selectors['listing_link'].select_one(element)
             if not link_elem or 'href' not in link_elem.attrs:
                 _logger.debug("Kein Link gefunden")
                 return None
@@ -248,28 +464,28 @@ class WGScraper:
                 return None
             
             # Titel extrahieren
-            title_elem = element.select_one(selectors['listing_title'])
+            title_elem = selectors['listing_title'].select_one(element)
             title = title_elem.text.strip() if title_elem else "Kein Titel"
             
             # Adresse parsen (Stadt/Stadtteil/Straße)
-            address_elem = element.select_one(selectors['listing_address'])
+            address_elem = selectors['listing_address'].select_one(element)
             address_text = address_elem.text.strip() if address_elem else None
             city, district, street = self._parse_address(address_text)
             
             # Größe extrahieren
-            size_elem = element.select_one(selectors['listing_size'])
+            size_elem = selectors['listing_size'].select_one(element)
             size = self._parse_number(size_elem.text if size_elem else None)
             
             # Miete extrahieren
-            rent_elem = element.select_one(selectors['listing_rent'])
+            rent_elem = selectors['listing_rent'].select_one(element)
             rent = self._parse_number(rent_elem.text if rent_elem else None)
             
             # Verfügbarkeit
-            available_elem = element.select_one(selectors['listing_available'])
+            available_elem = selectors['listing_available'].select_one(element)
             available_from = available_elem.text.strip() if available_elem else None
             
             # Mitbewohner (aus title-Attribut!)
-            neighbors_elem = element.select_one(selectors['listing_neighbors'])
+            neighbors_elem = selectors['listing_neighbors'].select_one(element)
             neighbors_title = neighbors_elem.get('title') if neighbors_elem else None
             wg_size, flatmate_details, female, male, diverse, rooms_free = self._parse_neighbors(
                 neighbors_title
@@ -316,15 +532,16 @@ class WGScraper:
         try:
             # Finde das Muster: .X.html
             # Beispiel: Stuttgart.124.0.1.0.html?sort_column=3
-            match = re.search(r'(.*\.[0-9]+\.[0-9]+\.[0-9]+\.)([0-9]+)(\.html.*)', current_url)
+            parts = _split_page_url(current_url)
             
-            if not match:
+            if not parts:
                 _logger.warning(f"Konnte Seitenzahl-Muster in URL nicht finden: {current_url}")
                 return None
             
             # Baue neue URL mit inkrementierter Seitenzahl
+            prefix, suffix = parts
             next_page = current_page + 1
-            next_url = f"{match.group(1)}{next_page}{match.group(3)}"
+            next_url = f"{prefix}{next_page}{suffix}"
             
             _logger.debug(f"Nächste Seite: {next_url}")
             return next_url
@@ -336,7 +553,8 @@ class WGScraper:
     def scrape_search_results(
         self, 
         start_url: str, 
-        max_pages: Optional[int] = None
+        max_pages: Optional[int] = None,
+        concurrency: int = 1
     ) -> Generator[WGListing, None, None]:
         """
         Scrapt alle Anzeigen aus den Suchergebnissen.
@@ -347,10 +565,15 @@ class WGScraper:
         Args:
             start_url: URL der ersten Suchergebnis-Seite
             max_pages: Maximale Anzahl zu scrapender Seiten (None = alle)
+            concurrency: Anzahl parallel abgerufener Seiten (Standard: 1 = sequentiell)
             
         Yields:
             WGListing-Objekte
         """
+        if concurrency > 1:
+            yield from self._scrape_search_results_concurrent(start_url, max_pages, concurrency)
+            return
+        
         current_url = start_url
         page_num = 0
         total_listings = 0
@@ -372,7 +595,7 @@ class WGScraper:
                 break
             
             # Listings auf der Seite finden
-            listing_elements = soup.select(config.SELECTORS['listing_container'])
+            listing_elements = self._selectors['listing_container'].select(soup)
             
             if not listing_elements:
                 _logger.warning(f"Keine Listings auf Seite {page_num + 1} gefunden - Ende erreicht?")
@@ -387,9 +610,94 @@ class WGScraper:
                     total_listings += 1
                     yield listing
             
-            # Zur nächsten Seite
-            page_num += 1
+            # Zur nächsten Seite (_get_next_page_url erwartet die aktuelle Seite)
             current_url = self._get_next_page_url(current_url, page_num)
+            page_num += 1
+        
+        _logger.info(
+            f"Scraping abgeschlossen: {total_listings} Listings "
+            f"von {page_num} Seite(n) gescrapt"
+        )
+    
+    def _scrape_search_results_concurrent(
+        self,
+        start_url: str,
+        max_pages: Optional[int],
+        concurrency: int
+    ) -> Generator[WGListing, None, None]:
+        """
+        Scrapt die Suchergebnisse in Wellen von parallel abgerufenen Seiten.
+        
+        Da sich die Seiten-URLs direkt aus der Start-URL ableiten lassen,
+        werden jeweils `concurrency` Seiten gleichzeitig abgerufen. Die
+        Verzögerung wird zwischen den Wellen eingehalten. Die Listings werden
+        in Seitenreihenfolge zurückgegeben; das Scraping endet bei der ersten
+        Seite, die nicht abgerufen werden kann oder keine Listings enthält.
+        
+        Args:
+            start_url: URL der ersten Suchergebnis-Seite
+            max_pages: Maximale Anzahl zu scrapender Seiten (None = alle)
+            concurrency: Anzahl parallel abgerufener Seiten
+            
+        Yields:
+            WGListing-Objekte
+        """
+        page_num = 0
+        total_listings = 0
+        
+        _logger.info(f"Starte paralleles Scraping ({concurrency} Seiten gleichzeitig) von: {start_url}")
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                # URLs der nächsten Welle bestimmen
+                wave_size = concurrency
+                if max_pages:
+                    wave_size = min(wave_size, max_pages - page_num)
+                if wave_size <= 0:
+                    _logger.info(f"Maximale Seitenanzahl ({max_pages}) erreicht")
+                    break
+                
+                urls = []
+                for offset in range(wave_size):
+                    num = page_num + offset
+                    url = start_url if num == 0 else self._get_next_page_url(start_url, num - 1)
+                    if not url:
+                        break
+                    urls.append(url)
+                
+                if not urls:
+                    break
+                
+                finished = False
+                # executor.map hat alle Abrufe der Welle bereits eingereicht;
+                # nach der ersten leeren Seite werden die übrigen verworfen
+                for soup in executor.map(self._fetch_page, urls):
+                    if not soup:
+                        _logger.error(f"Konnte Seite {page_num + 1} nicht abrufen")
+                        finished = True
+                        break
+                    
+                    listing_elements = self._selectors['listing_container'].select(soup)
+                    if not listing_elements:
+                        _logger.warning(f"Keine Listings auf Seite {page_num + 1} gefunden - Ende erreicht?")
+                        finished = True
+                        break
+                    
+                    _logger.info(f"Gefundene Listings auf Seite {page_num + 1}: {len(listing_elements)}")
+                    
+                    for element in listing_elements:
+                        listing = self._parse_listing_preview(element)
+                        if listing:
+                            total_listings += 1
+                            yield listing
+                    
+                    page_num += 1
+                
+                if finished or len(urls) < wave_size:
+                    break
+                
+                # Verzögerung zwischen den Wellen einhalten
+                time.sleep(self.rate_limiter.idle_delay())
         
         _logger.info(
             f"Scraping abgeschlossen: {total_listings} Listings "
@@ -411,18 +719,70 @@ class WGScraper:
         _logger.debug(f"Scrape Details für {listing.listing_id}")
         
         soup = self._get_page(listing.url)
-        if not soup:
-            return listing
+        if soup:
+            self._apply_details(listing, soup)
+        return listing
+    
+    def scrape_listings_details(
+        self,
+        listings: Iterable[WGListing],
+        concurrency: int = 1
+    ) -> Generator[WGListing, None, None]:
+        """
+        Scrapt die Detailseiten mehrerer Anzeigen.
+        
+        Bei concurrency > 1 werden jeweils `concurrency` Detailseiten
+        gleichzeitig abgerufen und die Verzögerung zwischen den Abruf-Wellen
+        eingehalten, wie beim parallelen Scrapen der Suchergebnisse.
         
+        Args:
+            listings: WGListing-Objekte mit mindestens URL
+            concurrency: Anzahl parallel abgerufener Detailseiten
+            
+        Yields:
+            Aktualisierte WGListing-Objekte in Eingabereihenfolge
+        """
+        if concurrency <= 1:
+            for listing in listings:
+                yield self.scrape_listing_details(listing)
+            return
+        
+        iterator = iter(listings)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                wave = list(islice(iterator, concurrency))
+                if not wave:
+                    break
+                
+                soups = executor.map(self._fetch_page, [listing.url for listing in wave])
+                for listing, soup in zip(wave, soups):
+                    if soup:
+                        self._apply_details(listing, soup)
+                    yield listing
+                
+                if len(wave) < concurrency:
+                    break
+                
+                # Verzögerung zwischen den Wellen einhalten
+                time.sleep(self.rate_limiter.idle_delay())
+    
+    def _apply_details(self, listing: WGListing, soup: BeautifulSoup) -> None:
+        """
+        Überträgt die Beschreibungen einer Detailseite in das Listing.
+        
+        Args:
+            listing: Zu aktualisierendes WGListing
+            soup: Geparste Detailseite
+        """
         try:
-            selectors = config.SELECTORS
+            selectors = self._selectors
             descriptions = []
             
             # Verschiedene Beschreibungs-Bereiche sammeln
             for key in ['detail_description', 'detail_desc_location', 
                         'detail_desc_social', 'detail_desc_other']:
                 if key in selectors:
-                    elems = soup.select(selectors[key])
+                    elems = selectors[key].select(soup)
                     if elems:
                         text = '\n'.join(elem.text.strip() for elem in elems if elem.text.strip())
                         if text:
@@ -435,10 +795,9 @@ class WGScraper:
             
         except Exception as e:
             _logger.warning(f"Fehler beim Scrapen der Details: {e}")
-        
-        return listing
     
     def close(self):
-        """Schließt die Session."""
-        self.session.close()
-        _logger.debug("Scraper-Session geschlossen")
+        """Schließt die Session, sofern sie vom Scraper selbst erzeugt wurde."""
+        if self._owns_session:
+            self.session.close()
+            _logger.debug("Scraper-Session geschlossen")
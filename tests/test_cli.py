@@ -0,0 +1,316 @@
+import json
+import re
+import threading
+import time
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from wg_scraper import cli_utils
+from wg_scraper import scraper as scraper_module
+from wg_scraper.cli import _format_cursor, _iter_in_background, _parse_cursor, main
+from wg_scraper.database import Database
+from wg_scraper.models import WGListing
+
+__author__ = "Jonas"
+__copyright__ = "Jonas"
+__license__ = "MIT"
+
+STUTTGART = (48.7823, 9.1770)
+COORDS = {
+    "Stuttgart, Vaihingen": (48.7290, 9.1080),
+    "Esslingen": (48.7406, 9.3108),
+    "München, Schwabing": (48.1650, 11.5860),
+}
+
+
+def make_listing(listing_id, **kwargs):
+    kwargs.setdefault("url", f"https://www.wg-gesucht.de/wg-zimmer.{listing_id}.html")
+    kwargs.setdefault("title", f"Zimmer {listing_id}")
+    return WGListing(listing_id=str(listing_id), **kwargs)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "wg.db"
+    with Database(path) as db:
+        db.init_db()
+        db.save_listings_bulk([
+            make_listing(1, city="Stuttgart", district="Vaihingen", size=15, rent=450),
+            make_listing(2, city="Esslingen", size=20, rent=400),
+            make_listing(3, city="München", district="Schwabing", size=10, rent=700),
+        ])
+    return str(path)
+
+
+def run_cli(*args):
+    return CliRunner().invoke(main, [*args], catch_exceptions=False)
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    """Ersetzt Geocoding und Routing durch feste Koordinaten bzw. Luftlinien"""
+    routed = []
+
+    def fake_routes_bulk(origins, destination, mode="driving", on_progress=None, **kwargs):
+        routed.extend(origins)
+        if on_progress:
+            on_progress(len(origins))
+        return [
+            {
+                "straight_line_km": round(cli_utils.straight_line_km(origin, destination), 2),
+                "distance_km": 10.0,
+                "duration_min": 12.0,
+            }
+            for origin in origins
+        ]
+
+    monkeypatch.setattr(cli_utils, "geocode_address", lambda address: STUTTGART)
+    monkeypatch.setattr(
+        cli_utils, "geocode_many",
+        lambda addresses, on_progress=None: {address: COORDS.get(address) for address in addresses},
+    )
+    monkeypatch.setattr(cli_utils, "calculate_routes_bulk", fake_routes_bulk)
+    return routed
+
+
+def test_list_max_straight_km_skips_distant_listings(db_path, routing):
+    """Nur Anzeigen innerhalb der Luftlinie werden geroutet und angezeigt"""
+    result = run_cli(
+        "--db-path", db_path, "list",
+        "--metrics", "route", "--addr", "Universität Stuttgart", "--max-straight-km", "50",
+    )
+
+    assert result.exit_code == 0, result.output
+    assert sorted(routing) == sorted([COORDS["Stuttgart, Vaihingen"], COORDS["Esslingen"]])
+    assert "Zimmer 1" in result.output and "Zimmer 2" in result.output
+    assert "Zimmer 3" not in result.output
+
+
+def test_list_without_max_straight_km_routes_everything(db_path, routing):
+    result = run_cli("--db-path", db_path, "list", "--metrics", "route", "--addr", "Universität Stuttgart")
+
+    assert result.exit_code == 0, result.output
+    assert len(routing) == 3
+    assert "Zimmer 3" in result.output
+
+
+def test_stats_command_reads_cached_statistics(db_path):
+    result = run_cli("--db-path", db_path, "stats")
+
+    assert result.exit_code == 0, result.output
+    assert "Gesamt Anzeigen: 3" in result.output
+    assert "Durchschn. Miete: 516.67 €" in result.output
+
+
+def wait_for_producer_exit(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not any(thread.name == "scrape-producer" for thread in threading.enumerate()):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_iter_in_background_keeps_order():
+    assert list(_iter_in_background(range(100), maxsize=3)) == list(range(100))
+
+
+def test_iter_in_background_reraises_producer_exception():
+    """Exceptions des Producers kommen nach den bereits gelieferten Elementen an"""
+    def source():
+        yield 1
+        yield 2
+        raise ValueError("Seite kaputt")
+
+    received = []
+    with pytest.raises(ValueError, match="Seite kaputt"):
+        for item in _iter_in_background(source(), maxsize=1):
+            received.append(item)
+
+    assert received == [1, 2]
+    assert wait_for_producer_exit()
+
+
+def test_iter_in_background_stops_producer_when_consumer_quits():
+    """Ein vorzeitig beendeter Consumer lässt den Producer nicht an der vollen Queue hängen"""
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(10**6):
+                yield i
+        finally:
+            closed.set()
+
+    items = _iter_in_background(source(), maxsize=2)
+    assert next(items) == 0
+    items.close()
+
+    assert closed.wait(timeout=5.0)
+    assert wait_for_producer_exit()
+
+
+SEARCH_ITEM = (
+    '<div class="offer_list_item">'
+    '<h2 class="truncate_title"><a href="/wg-zimmer-in-Berlin.{id}.html">Zimmer {id}</a></h2>'
+    '</div>'
+)
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = body.encode()
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Liefert für jede Suchseite zwei Anzeigen und Detailseiten mit Beschreibung"""
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        number = int(re.search(r"\.(\d+)\.html", url).group(1))
+        if ".8.0.1." not in url:
+            return FakeResponse(f'<html><div class="freitext_0"><p>Details {number}</p></div></html>')
+        items = "".join(SEARCH_ITEM.format(id=1000 + number * 10 + i) for i in range(2))
+        return FakeResponse(f"<html>{items}</html>")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(scraper_module, "create_session", lambda pool_size=None: fake)
+    return fake
+
+
+@pytest.mark.parametrize("concurrency", ["1", "3"])
+def test_scrape_saves_listings_from_background_producer(tmp_path, session, concurrency):
+    db_path = str(tmp_path / "scrape.db")
+
+    result = run_cli(
+        "--db-path", db_path, "scrape", "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+        "--max-pages", "3", "--delay", "0", "--concurrency", concurrency,
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "6 neue WG-Anzeigen gespeichert" in result.output
+    assert len(session.requested) == 3
+    with Database(db_path) as db:
+        assert db.get_cached_statistics()["total"] == 6
+    assert wait_for_producer_exit()
+
+
+def listing_titles(output):
+    return re.findall(r"^\d+\. (Zimmer \d+)$", output, re.MULTILINE)
+
+
+def test_list_sorts_by_price_per_sqm(db_path):
+    result = run_cli("--db-path", db_path, "list", "--sort", "ppm", "--order", "asc")
+
+    assert result.exit_code == 0, result.output
+    assert listing_titles(result.output) == ["Zimmer 2", "Zimmer 1", "Zimmer 3"]
+    assert "Preis pro m2: 20.0 €" in result.output
+
+
+def test_list_filters_by_price_per_sqm_before_limit(db_path):
+    result = run_cli(
+        "--db-path", db_path, "list", "--filter", "ppm<50", "--sort", "ppm", "--order", "desc",
+        "--limit", "1",
+    )
+
+    assert result.exit_code == 0, result.output
+    assert listing_titles(result.output) == ["Zimmer 1"]
+
+
+def test_list_exports_ndjson(db_path, tmp_path):
+    output = tmp_path / "listings.ndjson"
+
+    result = run_cli("--db-path", db_path, "list", "--output", str(output))
+
+    assert result.exit_code == 0, result.output
+    assert "3 Anzeigen exportiert" in result.output
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["title"] for line in lines) == ["Zimmer 1", "Zimmer 2", "Zimmer 3"]
+
+
+def test_cursor_roundtrip():
+    cursor = ("2026-01-31T12:00:00.123456", 4711)
+    assert _parse_cursor(_format_cursor(cursor)) == cursor
+
+
+@pytest.mark.parametrize("value", ["", "2026-01-31", "2026-01-31|abc", "|5"])
+def test_parse_cursor_rejects_invalid_values(value):
+    with pytest.raises(click.BadParameter):
+        _parse_cursor(value)
+
+
+def test_list_pages_with_after_cursor(db_path):
+    """Die Ausgabe nennt den Cursor der nächsten Seite, bis keine weitere folgt"""
+    first = run_cli("--db-path", db_path, "list", "--limit", "2")
+    assert first.exit_code == 0, first.output
+    cursor = re.search(r"Nächste Seite: --after '([^']+)'", first.output).group(1)
+
+    second = run_cli("--db-path", db_path, "list", "--limit", "2", "--after", cursor)
+
+    assert second.exit_code == 0, second.output
+    assert "Nächste Seite" not in second.output
+    titles = listing_titles(first.output) + listing_titles(second.output)
+    assert sorted(titles) == ["Zimmer 1", "Zimmer 2", "Zimmer 3"]
+
+
+def test_list_without_more_rows_prints_no_cursor(db_path):
+    result = run_cli("--db-path", db_path, "list", "--limit", "10")
+
+    assert result.exit_code == 0, result.output
+    assert "Nächste Seite" not in result.output
+
+
+@pytest.mark.parametrize("args", [
+    ["--after", "2026-01-31T12:00:00|abc"],
+    ["--sort", "rent", "--after", "2026-01-31T12:00:00|1"],
+])
+def test_list_rejects_invalid_after(db_path, args):
+    result = CliRunner().invoke(main, ["--db-path", db_path, "list", *args])
+
+    assert result.exit_code == 2
+    assert "--after" in result.output
+
+
+@pytest.mark.parametrize("concurrency", ["1", "2"])
+def test_scrape_details_stores_descriptions(tmp_path, session, concurrency):
+    db_path = str(tmp_path / "scrape.db")
+
+    result = run_cli(
+        "--db-path", db_path, "scrape", "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+        "--max-pages", "2", "--delay", "0", "--concurrency", concurrency, "--details",
+    )
+
+    assert result.exit_code == 0, result.output
+    # 2 Suchseiten + 4 Detailseiten
+    assert len(session.requested) == 6
+    with Database(db_path) as db:
+        assert db.get_listing("1011")["description"] == "Details 1011"
+        assert all(row["description"] for row in db.get_listings())
+
+
+def test_scrape_without_details_skips_detail_pages(tmp_path, session):
+    db_path = str(tmp_path / "scrape.db")
+
+    result = run_cli(
+        "--db-path", db_path, "scrape", "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html",
+        "--max-pages", "2", "--delay", "0",
+    )
+
+    assert result.exit_code == 0, result.output
+    assert all(".8.0.1." in url for url in session.requested)
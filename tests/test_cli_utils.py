@@ -0,0 +1,350 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from wg_scraper import cli_utils
+from wg_scraper.cli_utils import (
+    RouteCache,
+    calculate_routes_bulk,
+    export_listings,
+    export_routes,
+    straight_line_km,
+    straight_line_km_batch,
+)
+
+__author__ = "Jonas"
+__copyright__ = "Jonas"
+__license__ = "MIT"
+
+DESTINATION = (48.7823, 9.1770)
+
+
+@pytest.fixture
+def osrm(monkeypatch, tmp_path):
+    """Ersetzt OSRM, Rate Limiter und Routen-Cache durch lokale Attrappen"""
+    monkeypatch.setattr(cli_utils, "_route_cache", RouteCache(cache_dir=tmp_path))
+    monkeypatch.setattr(cli_utils._osrm_limiter, "wait", lambda: None)
+    # Blöcke mit 2 Startpunkten (+ Ziel)
+    monkeypatch.setattr(cli_utils, "_OSRM_TABLE_MAX_COORDS", 3)
+
+    calls = {"table": [], "route": [], "unroutable": set(), "table_down": False}
+
+    def fake_table(origins, destination, profile):
+        calls["table"].append((list(origins), profile))
+        if calls["table_down"]:
+            return None
+        return [
+            (None, None) if origin in calls["unroutable"] else (1000.0 * origin[0], 60.0 * origin[0])
+            for origin in origins
+        ]
+
+    def fake_route(origin, destination, mode="driving", use_walking_proxy=False):
+        calls["route"].append(origin)
+        return {"fallback": origin}
+
+    monkeypatch.setattr(cli_utils, "_fetch_osrm_table", fake_table)
+    monkeypatch.setattr(cli_utils, "calculate_route", fake_route)
+    return calls
+
+
+def test_calculate_routes_bulk_batches_table_requests(osrm):
+    """Nicht gecachte Startpunkte gehen blockweise an den table-Dienst"""
+    origins = [(float(i), 9.0) for i in range(1, 6)]
+    progress = []
+
+    results = calculate_routes_bulk(origins, DESTINATION, "driving", on_progress=progress.append)
+
+    assert [len(batch) for batch, _ in osrm["table"]] == [2, 2, 1]
+    assert {profile for _, profile in osrm["table"]} == {"car"}
+    assert sorted(origin for batch, _ in osrm["table"] for origin in batch) == origins
+    # Ergebnisse in der Reihenfolge der Startpunkte
+    assert [result["distance_km"] for result in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert [result["duration_min"] for result in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert osrm["route"] == []
+    assert sum(progress) == len(origins)
+
+
+def test_calculate_routes_bulk_falls_back_per_pair(osrm):
+    """Vom table-Dienst nicht gelieferte Strecken werden einzeln berechnet"""
+    origins = [(float(i), 9.0) for i in range(1, 5)]
+    osrm["unroutable"].add(origins[2])
+
+    results = calculate_routes_bulk(origins, DESTINATION, "driving")
+
+    assert osrm["route"] == [origins[2]]
+    assert results[2] == {"fallback": origins[2]}
+    assert results[3]["distance_km"] == 4.0
+
+
+def test_calculate_routes_bulk_falls_back_when_table_fails(osrm):
+    origins = [(float(i), 9.0) for i in range(1, 4)]
+    osrm["table_down"] = True
+    progress = []
+
+    results = calculate_routes_bulk(origins, DESTINATION, "driving", on_progress=progress.append)
+
+    assert sorted(osrm["route"]) == origins
+    assert results == [{"fallback": origin} for origin in origins]
+    assert sum(progress) == len(origins)
+
+
+
+def test_calculate_routes_bulk_transit_estimate_needs_no_requests(osrm):
+    results = calculate_routes_bulk([(48.78, 9.18), (48.80, 9.20)], DESTINATION, "transit")
+
+    assert osrm["table"] == [] and osrm["route"] == []
+    assert all(result["is_transit_estimated"] for result in results)
+
+
+class FakeNominatim:
+    """Beantwortet Nominatim-Suchen aus einem Dictionary und zählt die Anfragen"""
+
+    def __init__(self, known):
+        self.known = known
+        self.queries = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.queries.append(params["q"])
+        coords = self.known.get(params["q"])
+        data = [{"lat": str(coords[0]), "lon": str(coords[1])}] if coords else []
+        return FakeJSONResponse(data)
+
+
+class FakeJSONResponse:
+    status_code = 200
+    text = ""
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def nominatim(monkeypatch):
+    fake = FakeNominatim({"Berlin, Mitte": (52.52, 13.40)})
+    monkeypatch.setattr(cli_utils, "_http_session", fake)
+    return fake
+
+
+def make_geocoder(cache_dir):
+    geocoder = cli_utils.GeocoderRateLimiter(min_delay_seconds=0)
+    geocoder.cache_dir = cache_dir
+    geocoder.cache_db_path = cache_dir / "geocoding.sqlite"
+    return geocoder
+
+
+def age_geocode_cache(geocoder, hours):
+    with geocoder._cache_lock:
+        geocoder._get_cache_connection().execute(
+            "UPDATE geocache SET cached_at = cached_at - ?", (hours * 3600,)
+        )
+
+
+def test_geocoder_negative_results_expire_sooner(tmp_path, nominatim):
+    """'Nicht gefunden' wird gecacht, läuft aber nach negative_cache_ttl_hours ab"""
+    geocoder = make_geocoder(tmp_path)
+    assert geocoder.geocode("Berlin, Mitte") == (52.52, 13.40)
+    assert geocoder.geocode("Nirgendwo") is None
+    assert len(nominatim.queries) == 2
+
+    # Innerhalb beider TTLs: auch eine neue Instanz fragt nicht erneut
+    assert make_geocoder(tmp_path).geocode("Nirgendwo") is None
+    assert len(nominatim.queries) == 2
+
+    age_geocode_cache(geocoder, hours=48)
+    fresh = make_geocoder(tmp_path)
+
+    assert fresh.geocode("Berlin, Mitte") == (52.52, 13.40)
+    assert fresh.geocode("Nirgendwo") is None
+    assert nominatim.queries == ["Berlin, Mitte", "Nirgendwo", "Nirgendwo"]
+
+
+def test_geocoder_normalises_cache_keys(tmp_path, nominatim):
+    geocoder = make_geocoder(tmp_path)
+
+    assert geocoder.geocode("Berlin,  Mitte ") == (52.52, 13.40)
+    assert geocoder.geocode("berlin, mitte") == (52.52, 13.40)
+
+    assert nominatim.queries == ["Berlin, Mitte"]
+
+
+ORIGIN = (48.74001, 9.10002)
+
+
+def test_route_cache_rounds_coordinates(tmp_path):
+    """Geocodierungen, die sich erst ab der 5. Nachkommastelle unterscheiden, teilen einen Eintrag"""
+    cache = RouteCache(cache_dir=tmp_path)
+    assert cache.set(ORIGIN, DESTINATION, "car", 12.5, 18.0)
+
+    assert cache.get((48.74004, 9.09998), DESTINATION, "car") == (12.5, 18.0)
+    assert cache.get((48.7410, 9.1000), DESTINATION, "car") is None
+    assert cache.get(ORIGIN, DESTINATION, "bike") is None
+
+
+def test_route_cache_persists_across_instances(tmp_path):
+    RouteCache(cache_dir=tmp_path).set_many([
+        (ORIGIN, DESTINATION, "car", 12.5, 18.0),
+        ((48.0, 9.0), DESTINATION, "car", None, None),
+    ])
+
+    cache = RouteCache(cache_dir=tmp_path)
+
+    assert cache.get(ORIGIN, DESTINATION, "car") == (12.5, 18.0)
+    # Auch "keine Route" wird gecacht
+    assert cache.get((48.0, 9.0), DESTINATION, "car") == (None, None)
+
+
+def test_route_cache_expires_entries(tmp_path):
+    RouteCache(cache_dir=tmp_path).set(ORIGIN, DESTINATION, "car", 12.5, 18.0)
+    cache = RouteCache(cache_dir=tmp_path, ttl_hours=1)
+    with cache._lock:
+        cache._get_connection().execute("UPDATE routecache SET ts = ts - 7200")
+
+    assert cache.get(ORIGIN, DESTINATION, "car") is None
+
+
+def test_route_cache_clear(tmp_path):
+    cache = RouteCache(cache_dir=tmp_path)
+    cache.set(ORIGIN, DESTINATION, "car", 12.5, 18.0)
+
+    assert cache.clear()
+
+    assert cache.get(ORIGIN, DESTINATION, "car") is None
+    assert RouteCache(cache_dir=tmp_path).get(ORIGIN, DESTINATION, "car") is None
+
+
+def test_calculate_routes_bulk_uses_cache(osrm):
+    origins = [(float(i), 9.0) for i in range(1, 4)]
+    first = calculate_routes_bulk(origins, DESTINATION, "driving")
+    osrm["table"].clear()
+
+    second = calculate_routes_bulk(origins, DESTINATION, "driving")
+
+    assert osrm["table"] == []
+    assert [r["distance_km"] for r in second] == [r["distance_km"] for r in first]
+
+
+# Ellipsoid-Entfernungen (WGS84, geodätisch nach Karney) in km
+KNOWN_DISTANCES = [
+    ((48.7823, 9.1770), (48.7406, 9.3108), 10.875),    # Stuttgart - Esslingen
+    ((52.5200, 13.4050), (52.3906, 13.0645), 27.260),  # Berlin - Potsdam
+    ((50.0, 8.0), (50.5, 8.0), 55.617),                # Nord-Süd bei 50° N
+    ((48.1374, 11.5755), (48.3705, 10.8978), 56.607),  # München - Augsburg
+    ((53.5511, 9.9937), (53.8655, 10.6866), 57.601),   # Hamburg - Lübeck
+    ((47.9990, 7.8421), (49.0069, 8.4037), 119.514),   # Freiburg - Karlsruhe
+]
+
+
+@pytest.mark.parametrize("origin, destination, expected_km", KNOWN_DISTANCES)
+def test_straight_line_km_within_cheap_ruler_error_bound(origin, destination, expected_km):
+    """Die flache Näherung weicht bis 200 km um weniger als 0,1 % ab"""
+    assert straight_line_km(origin, destination) == pytest.approx(expected_km, rel=1e-3)
+    assert straight_line_km(destination, origin) == pytest.approx(expected_km, rel=1e-3)
+
+
+def test_straight_line_km_uses_haversine_for_long_distances():
+    # Berlin - München, Haversine auf der mittleren Erdkugel
+    assert straight_line_km((52.5200, 13.4050), (48.1374, 11.5755)) == pytest.approx(504.56, rel=5e-3)
+
+
+def test_straight_line_km_batch_rounds_and_keeps_missing_points():
+    origin, destination, _ = KNOWN_DISTANCES[1]
+
+    assert straight_line_km_batch([origin, None], destination) == [27.26, None]
+
+
+def test_geocoder_cache_persists_in_one_sqlite_file(tmp_path, nominatim):
+    geocoder = make_geocoder(tmp_path)
+    geocoder.geocode("Berlin, Mitte")
+    geocoder.geocode("Nirgendwo")
+
+    fresh = make_geocoder(tmp_path)
+
+    assert fresh.geocode("Berlin, Mitte") == (52.52, 13.40)
+    assert fresh.cache_entry_count() == 2
+    assert len(nominatim.queries) == 2
+    assert [path.name for path in tmp_path.glob("*.sqlite")] == ["geocoding.sqlite"]
+
+
+def test_geocoder_clear_cache(tmp_path, nominatim):
+    geocoder = make_geocoder(tmp_path)
+    geocoder.geocode("Berlin, Mitte")
+
+    geocoder.clear_cache()
+
+    assert geocoder.cache_entry_count() == 0
+    assert geocoder.geocode("Berlin, Mitte") == (52.52, 13.40)
+    assert len(nominatim.queries) == 2
+
+
+def test_request_cache_roundtrip_and_expiry(tmp_path):
+    cache = cli_utils.RequestCache(cache_dir=tmp_path, ttl_hours=1)
+    url = "https://nominatim.openstreetmap.org/search"
+    assert cache.set(url, {"q": "Berlin", "limit": 1}, {"lat": 52.52})
+
+    # Parameter-Reihenfolge spielt für den Schlüssel keine Rolle
+    assert cache.get(url, {"limit": 1, "q": "Berlin"}) == {"lat": 52.52}
+    assert cache.get(url, {"q": "Hamburg", "limit": 1}) is None
+
+    with cache._lock:
+        cache._get_connection().execute("UPDATE cache SET ts = ts - 7200")
+    assert cache.get(url, {"q": "Berlin", "limit": 1}) is None
+
+    assert cache.set(url, None, [1, 2])
+    assert cache.clear()
+    assert cache.get(url) is None
+
+
+LISTINGS = [
+    {
+        "title": "Zimmer 1",
+        "city": "Berlin",
+        "rent": 450.0,
+        "size": 20.0,
+        "url": "https://www.wg-gesucht.de/1.html",
+        "scraped_at": datetime(2026, 1, 1, 12, 0),
+    },
+    {"title": "Zimmer 2", "city": "München", "rent": None, "size": 15.0, "url": "u2"},
+]
+
+
+@pytest.mark.parametrize("suffix", ["ndjson", "jsonl"])
+def test_export_listings_ndjson(tmp_path, suffix):
+    """Eine Anzeige pro Zeile, Felder wie beim JSON-Export"""
+    path = tmp_path / f"out.{suffix}"
+
+    assert export_listings(iter(LISTINGS), str(path), verbose=0)
+
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 2
+    assert rows[0]["title"] == "Zimmer 1"
+    assert rows[1]["city"] == "München"
+    assert rows[1]["rent"] is None
+    assert list(rows[0]) == list(cli_utils._listing_field_order(0))
+
+
+def test_export_listings_ndjson_serialises_datetimes(tmp_path):
+    path = tmp_path / "out.ndjson"
+
+    assert export_listings(LISTINGS, str(path), verbose=2)
+
+    row = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    assert row["scraped_at"].startswith("2026-01-01")
+
+
+def test_export_routes_ndjson(tmp_path):
+    path = tmp_path / "routes.ndjson"
+    results = [{"listing": LISTINGS[0], "route": {"distance_km": 3.2, "duration_min": 7.5}}]
+
+    assert export_routes(results, str(path), "Universität Stuttgart", "driving")
+
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert rows == [{
+        "destination": "Universität Stuttgart",
+        "mode": "driving",
+        "listing": json.loads(json.dumps(cli_utils._filter_listing_fields(LISTINGS[0], 0))),
+        "route": {"distance_km": 3.2, "duration_min": 7.5},
+    }]
@@ -0,0 +1,343 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from wg_scraper.database import Database, filters_to_sql
+from wg_scraper.models import WGListing
+
+__author__ = "Jonas"
+__copyright__ = "Jonas"
+__license__ = "MIT"
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(tmp_path / "test.db")
+    database.init_db()
+    yield database
+    database.close()
+
+
+def make_listing(listing_id, **kwargs):
+    kwargs.setdefault("url", f"https://www.wg-gesucht.de/wg-zimmer-in-Berlin.{listing_id}.html")
+    kwargs.setdefault("title", f"Zimmer {listing_id}")
+    kwargs.setdefault("city", "Berlin")
+    return WGListing(listing_id=str(listing_id), **kwargs)
+
+
+def test_save_listings_bulk_returns_saved_count(db):
+    """Zählt nur neu gespeicherte Anzeigen, auch über Blockgrenzen hinweg"""
+    assert db.save_listings_bulk([make_listing(i) for i in range(5)], batch_size=2) == 5
+    assert db.get_statistics()["total"] == 5
+
+
+def test_save_listings_bulk_ignores_duplicates(db):
+    """INSERT OR IGNORE überspringt bekannte und doppelte listing_ids"""
+    db.save_listings_bulk([make_listing(1), make_listing(2)])
+
+    saved = db.save_listings_bulk([make_listing(2), make_listing(3), make_listing(3)])
+
+    assert saved == 1
+    assert db.get_statistics()["total"] == 3
+
+
+def test_get_listings_filters_by_whitelisted_columns(db):
+    db.save_listings_bulk([
+        make_listing(1, size=12, rent=350),
+        make_listing(2, size=20, rent=450),
+        make_listing(3, size=25, rent=600),
+        make_listing(4, size=22, rent=480, city="Hamburg"),
+    ])
+
+    rows = db.get_listings(filters={"size>=": 20, "rent<": 500, "city": "Berlin"})
+
+    assert [row["listing_id"] for row in rows] == ["2"]
+
+
+def test_get_listings_rejects_unknown_filter_column(db):
+    """Feldnamen landen im SQL und werden daher gegen _FILTER_COLUMNS geprüft"""
+    db.save_listing(make_listing(1))
+
+    with pytest.raises(ValueError, match="Unbekanntes Filterfeld"):
+        db.get_listings(filters={"1=1; DROP TABLE listings; --": 1})
+    with pytest.raises(ValueError):
+        db.get_listings(filters={"description": "Balkon"})
+
+    assert db.get_statistics()["total"] == 1
+
+
+def test_get_listings_ignores_unknown_sort_column(db):
+    db.save_listings_bulk([make_listing(1), make_listing(2)])
+
+    rows = db.get_listings(sort_by="rent; DROP TABLE listings")
+
+    assert {row["listing_id"] for row in rows} == {"1", "2"}
+    assert db.get_statistics()["total"] == 2
+
+
+def test_filters_to_sql_builds_parameterised_clause():
+    clause, params = filters_to_sql(
+        {"size>=": 20, "rent<": 500, "city": "Berlin", "rooms_free!=": 0, "district": None}
+    )
+
+    assert clause == " AND size >= ? AND rent < ? AND city = ? AND rooms_free != ?"
+    assert params == (20, 500, "Berlin", 0)
+
+
+def test_filters_to_sql_without_filters():
+    assert filters_to_sql(None) == ("", ())
+    assert filters_to_sql({}) == ("", ())
+
+
+def test_filters_to_sql_rejects_unknown_columns():
+    with pytest.raises(ValueError, match="Unbekanntes Filterfeld: features"):
+        filters_to_sql({"features": "Balkon"})
+
+
+def test_stats_cache_invalidated_after_save_and_delete(db):
+    """Gecachte Statistiken werden nach Schreibzugriffen neu berechnet"""
+    db.save_listing(make_listing(1, rent=300))
+    assert db.refresh_stats()["total"] == 1
+
+    db.save_listing(make_listing(2, rent=500))
+    statistics = db.get_cached_statistics()
+    assert statistics["total"] == 2
+    assert statistics["avg_rent"] == 400
+
+    db.save_listings_bulk([make_listing(3, rent=400)])
+    assert db.get_cached_statistics()["total"] == 3
+
+    assert db.delete_listing("1")
+    assert db.get_cached_statistics()["total"] == 2
+
+    db.clear_all()
+    assert db.get_cached_statistics()["total"] == 0
+
+
+def test_cached_statistics_match_fresh_statistics(db):
+    db.save_listings_bulk([
+        make_listing(1, rent=300, size=10),
+        make_listing(2, rent=500, size=20, city="Hamburg"),
+    ])
+
+    assert db.get_cached_statistics() == db.get_statistics()
+
+
+def test_cached_statistics_on_read_only_database(db):
+    """Ohne Schreibrecht werden die Statistiken nur berechnet, nicht gecacht"""
+    db.save_listing(make_listing(1))
+    db._get_connection().execute("PRAGMA query_only=1")
+
+    assert db.get_cached_statistics()["total"] == 1
+
+
+def test_transaction_rollback_leaves_no_rows(db):
+    """Eine Exception im transaction()-Block verwirft alle Schreibzugriffe"""
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.save_listing(make_listing(1))
+            db.save_listings_bulk([make_listing(2), make_listing(3)])
+            raise RuntimeError("Abbruch")
+
+    assert db.get_listing("1") is None
+    assert db.get_statistics()["total"] == 0
+
+
+def test_nested_transaction_rolls_back_with_outer(db):
+    """Verschachtelte Blöcke laufen in der äußeren Transaktion"""
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction():
+                db.save_listing(make_listing(1))
+            assert db.get_listing("1") is not None
+            raise RuntimeError("Abbruch")
+
+    assert db.get_listing("1") is None
+
+
+def test_transaction_commits_on_success(db):
+    with db.transaction():
+        db.save_listing(make_listing(1))
+        db.save_listing(make_listing(2))
+
+    assert db.get_statistics()["total"] == 2
+
+
+def test_save_listing_reports_duplicates(db):
+    assert db.save_listing(make_listing(1))
+    assert not db.save_listing(make_listing(1))
+    assert db.get_statistics()["total"] == 1
+
+
+def test_computed_sort_is_stable(db):
+    """Gleicher Preis pro m² wird nach id sortiert, Anzeigen ohne Wert stehen am Ende"""
+    db.save_listings_bulk([
+        make_listing(1, rent=300, size=10),
+        make_listing(2, rent=300, size=None),
+        make_listing(3, rent=300, size=20),
+        make_listing(4, rent=300, size=10),
+    ])
+
+    def order(sort_order):
+        rows = db.get_listings(
+            sort_by="price_per_sqm", sort_order=sort_order, computed_columns=["price_per_sqm"]
+        )
+        return [row["listing_id"] for row in rows]
+
+    assert order("ASC") == ["3", "1", "4", "2"]
+    assert order("DESC") == ["4", "1", "3", "2"]
+
+
+def test_computed_column_filter_runs_in_sql(db):
+    db.save_listings_bulk([
+        make_listing(1, rent=450, size=15),
+        make_listing(2, rent=400, size=20),
+        make_listing(3, rent=700, size=10),
+    ])
+
+    rows = db.get_listings(
+        limit=1, filters={"price_per_sqm<": 50}, sort_by="price_per_sqm",
+        sort_order="DESC", computed_columns=["price_per_sqm"],
+    )
+
+    # Filter und Sortierung vor dem LIMIT
+    assert [(row["listing_id"], row["price_per_sqm"]) for row in rows] == [("1", 30.0)]
+
+
+def test_filters_to_sql_inlines_computed_columns():
+    clause, params = filters_to_sql({"price_per_sqm<=": 15})
+
+    assert clause == " AND (ROUND(CAST(rent AS REAL) / NULLIF(size, 0), 2)) <= ?"
+    assert params == (15,)
+
+
+def test_keyset_pagination_returns_every_row_once(db):
+    """Blättern per Cursor liefert alle Zeilen genau einmal, auch bei gleichem scraped_at"""
+    scraped_at = datetime(2026, 1, 1, 12, 0)
+    db.save_listings_bulk([make_listing(i, scraped_at=scraped_at) for i in range(7)])
+
+    pages = []
+    cursor = None
+    while True:
+        rows, cursor = db.get_listings_page(limit=3, after=cursor)
+        pages.append([row["listing_id"] for row in rows])
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    paged_ids = [listing_id for page in pages for listing_id in page]
+    assert paged_ids == [row["listing_id"] for row in db.get_listings(limit=10)]
+    assert len(set(paged_ids)) == 7
+
+
+def test_keyset_pagination_respects_filters(db):
+    db.save_listings_bulk(
+        [make_listing(i, city="Berlin" if i % 2 else "Hamburg") for i in range(6)]
+    )
+
+    rows, cursor = db.get_listings_page(limit=2, filters={"city": "Berlin"})
+    rest, next_cursor = db.get_listings_page(limit=2, filters={"city": "Berlin"}, after=cursor)
+
+    assert {row["city"] for row in rows + rest} == {"Berlin"}
+    assert len(rows + rest) == 3
+    assert next_cursor is None
+
+
+def test_iter_listings_after_matches_offset(db):
+    db.save_listings_bulk([make_listing(i) for i in range(5)])
+    first = db.get_listings(limit=2)
+
+    after = (first[-1]["scraped_at"], first[-1]["id"])
+
+    assert db.get_listings(limit=2, after=after) == db.get_listings(limit=2, offset=2)
+
+
+def test_after_requires_default_sort(db):
+    with pytest.raises(ValueError):
+        db.get_listings(sort_by="rent", after=("2026-01-01T00:00:00", 1))
+
+
+def add_failing_trigger(db, listing_id):
+    """Lässt das Einfügen einer bestimmten listing_id mit einem Fehler abbrechen"""
+    db._get_connection().execute(f"""
+        CREATE TRIGGER fail_insert BEFORE INSERT ON listings
+        WHEN NEW.listing_id = '{listing_id}'
+        BEGIN SELECT RAISE(ABORT, 'Testfehler'); END
+    """)
+
+
+def test_save_listings_bulk_skips_failed_batch(db):
+    """Ohne äußere Transaktion wird nur der fehlerhafte Block verworfen"""
+    add_failing_trigger(db, "3")
+
+    saved = db.save_listings_bulk([make_listing(i) for i in range(6)], batch_size=2)
+
+    assert saved == 4
+    assert db.get_listing("2") is None and db.get_listing("4") is not None
+
+
+def test_save_listings_bulk_reraises_inside_transaction(db):
+    """In einer äußeren Transaktion wird nichts teilweise committet"""
+    add_failing_trigger(db, "3")
+
+    with pytest.raises(sqlite3.DatabaseError, match="Testfehler"):
+        with db.transaction():
+            db.save_listings_bulk([make_listing(i) for i in range(6)], batch_size=2)
+
+    assert db.get_statistics()["total"] == 0
+
+
+def test_save_listing_reraises_inside_transaction(db):
+    add_failing_trigger(db, "2")
+    assert not db.save_listing(make_listing(2))
+
+    with pytest.raises(sqlite3.DatabaseError):
+        with db.transaction():
+            db.save_listing(make_listing(1))
+            db.save_listing(make_listing(2))
+
+    assert db.get_listing("1") is None
+
+
+def test_init_db_on_current_schema_takes_no_write_lock(tmp_path):
+    """Eine von einem anderen Schreiber gesperrte Datenbank lässt sich trotzdem öffnen"""
+    path = tmp_path / "locked.db"
+    with Database(path) as db:
+        db.init_db()
+        db.save_listing(make_listing(1))
+
+    writer = sqlite3.connect(path, timeout=0, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        db = Database(path)
+        db._get_connection().execute("PRAGMA busy_timeout=0")
+        db.init_db()
+        assert db.get_listing("1") is not None
+        db.close()
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_init_db_upgrades_legacy_indexes(db):
+    with db.transaction() as conn:
+        conn.execute("DROP INDEX idx_city_rent_size")
+        conn.execute("CREATE INDEX idx_city_rent ON listings(city, rent)")
+
+    db.init_db()
+
+    names = {row[0] for row in db._get_connection().execute("SELECT name FROM sqlite_master")}
+    assert "idx_city_rent_size" in names
+    assert "idx_city_rent" not in names
+
+
+def test_planner_statistics_refreshed_by_bulk_save_not_init(tmp_path):
+    with Database(tmp_path / "stats.db") as db:
+        db.init_db()
+        conn = db._get_connection()
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None
+
+        db.save_listings_bulk([make_listing(i) for i in range(3)])
+
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'listings'").fetchone()[0] > 0
@@ -0,0 +1,176 @@
+import re
+
+import pytest
+import requests
+
+from wg_scraper import scraper as scraper_module
+from wg_scraper.models import WGListing
+from wg_scraper.scraper import RateLimiter, WGScraper
+
+__author__ = "Jonas"
+__copyright__ = "Jonas"
+__license__ = "MIT"
+
+NOW = 1_000_000_000.0
+
+START_URL = "https://www.wg-gesucht.de/wg-zimmer-in-Berlin.8.0.1.0.html"
+
+ITEM = (
+    '<div class="offer_list_item">'
+    '<h2 class="truncate_title"><a href="/wg-zimmer-in-Berlin.{id}.html">Zimmer {id}</a></h2>'
+    '</div>'
+)
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.content = body.encode()
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Fehler")
+
+
+def fake_search_pages(requested, last_page=2):
+    """Liefert zwei Listings pro Suchseite bis einschließlich last_page, danach leere Seiten"""
+    def get(url, timeout=None):
+        requested.append(url)
+        page = int(re.search(r"\.(\d+)\.html", url).group(1))
+        if page > last_page:
+            return FakeResponse("<html></html>")
+        items = "".join(ITEM.format(id=page * 100 + i) for i in range(2))
+        return FakeResponse(f"<html>{items}</html>")
+    return get
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+def test_scrape_search_results_stops_at_first_empty_page(concurrency):
+    """Listings kommen in Seitenreihenfolge, die erste leere Seite beendet das Scraping"""
+    requested = []
+    scraper = WGScraper(delay=0)
+    scraper.session.get = fake_search_pages(requested)
+
+    listings = list(scraper.scrape_search_results(START_URL, concurrency=concurrency))
+
+    assert [listing.listing_id for listing in listings] == [
+        "0", "1", "100", "101", "200", "201"
+    ]
+    assert listings[0].title == "Zimmer 0"
+    # Höchstens die angebrochene Welle wird zusätzlich abgerufen
+    assert 4 <= len(requested) <= 3 + concurrency
+
+
+def test_scrape_search_results_concurrent_respects_max_pages():
+    requested = []
+    scraper = WGScraper(delay=0)
+    scraper.session.get = fake_search_pages(requested, last_page=10)
+
+    listings = list(scraper.scrape_search_results(START_URL, max_pages=3, concurrency=2))
+
+    assert len(requested) == 3
+    assert [listing.listing_id for listing in listings][-1] == "201"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Friert die Uhr ein und zeichnet Wartezeiten auf, statt zu schlafen"""
+    recorded = []
+    monkeypatch.setattr(scraper_module.time, "time", lambda: NOW)
+    monkeypatch.setattr(scraper_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_rate_limiter_uses_default_delay_without_headers(sleeps):
+    limiter = RateLimiter(default_delay=1.5)
+    limiter.update({})
+    limiter.acquire()
+    limiter.acquire()
+
+    assert not limiter.has_server_limits
+    assert limiter.idle_delay() == 1.5
+    assert sleeps == []
+
+
+def test_rate_limiter_spreads_remaining_quota(sleeps):
+    """Verbleibendes Kontingent wird gleichmäßig bis zum Reset verteilt"""
+    limiter = RateLimiter(default_delay=1.0)
+    limiter.update({"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": "8"})
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+
+    assert limiter.has_server_limits
+    assert limiter.idle_delay() == 0.0
+    assert sleeps == [2.0, 4.0]
+
+
+def test_rate_limiter_waits_for_reset_when_exhausted(sleeps):
+    """Absoluter Reset-Zeitstempel bei erschöpftem Kontingent"""
+    limiter = RateLimiter()
+    limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(NOW + 30)})
+
+    limiter.acquire()
+
+    assert sleeps == [30.0]
+
+
+def test_rate_limiter_honours_retry_after(sleeps):
+    limiter = RateLimiter()
+    limiter.update({"Retry-After": "5"})
+
+    limiter.acquire()
+
+    assert sleeps == [5.0]
+    # Retry-After allein ersetzt die feste Verzögerung nicht
+    assert not limiter.has_server_limits
+
+
+def test_rate_limiter_ignores_invalid_headers(sleeps):
+    limiter = RateLimiter(default_delay=1.0)
+    limiter.update({
+        "Retry-After": "irgendwann",
+        "X-RateLimit-Remaining": "viele",
+        "X-RateLimit-Reset": "10",
+    })
+
+    limiter.acquire()
+
+    assert not limiter.has_server_limits
+    assert sleeps == []
+
+
+DETAIL_PAGE = '<html><div class="freitext_0"><p>Beschreibung {id}</p></div></html>'
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_scrape_listings_details_keeps_input_order(concurrency):
+    """Detailseiten werden in Wellen geladen, die Reihenfolge bleibt erhalten"""
+    requested = []
+
+    def fake_get(url, timeout=None):
+        requested.append(url)
+        listing_id = int(re.search(r"\.(\d+)\.html", url).group(1))
+        if listing_id == 3:
+            return FakeResponse("", status_code=404)
+        return FakeResponse(DETAIL_PAGE.format(id=listing_id))
+
+    scraper = WGScraper(delay=0)
+    scraper.session.get = fake_get
+    listings = [
+        WGListing(
+            listing_id=str(i), url=f"https://www.wg-gesucht.de/wg-zimmer-in-Berlin.{i}.html",
+            title=f"Zimmer {i}",
+        )
+        for i in range(1, 8)
+    ]
+
+    detailed = list(scraper.scrape_listings_details(iter(listings), concurrency=concurrency))
+
+    assert [listing.listing_id for listing in detailed] == [str(i) for i in range(1, 8)]
+    assert detailed[0].description == "Beschreibung 1"
+    # Nicht abrufbare Detailseite: Listing bleibt ohne Beschreibung erhalten
+    assert detailed[2].description is None
+    assert len(requested) == 7